@@ -1,62 +1,89 @@
+import logging
+import os
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from src.alert_service.backend.concurrency import address_locks
 from src.alert_service.backend.database.db import SessionLocal
-from src.alert_service.backend.database.operations import get_entry_by_symbol, add_new_entry, update_entry
+from src.alert_service.backend.database.operations import get_entry_by_address, add_new_entry, update_entry
 from src.alert_service.backend.alerts.refresh import refresh_entry
-from termcolor import cprint
+from src.alert_service.backend.alerts.derived import apply_price_tick
 from src.alert_service.backend.alerts.alert_models import Alert
+from src.alert_service.backend.push.broadcaster import broadcaster, entry_delta
+from src.alert_service.backend.notify.dispatcher import alert_event, dispatcher
+from src.alert_service.backend.database.enums import Channel
+from src.alert_service.backend.metrics import ALERT_ENTRIES_TOTAL, ALERT_WRITE_CONFLICTS_TOTAL, stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Times an alert is re-applied after another process changed its entry first.
+ALERT_WRITE_RETRIES = int(os.environ.get("ALERT_WRITE_RETRIES", "3"))
 
 def process_alert(alert: Alert):
     """
     Process a new alert by checking if the entry exists in the database.
     If it exists, update it; otherwise, create a new entry.
     Afterward, refresh the entry's additional data.
+
+    Alerts for the same address are applied one at a time within a process
+    (see concurrency.address_locks). Across processes the entry's version
+    column detects interleaved writes; the losing alert is re-read and
+    re-applied up to ALERT_WRITE_RETRIES times.
     
-    :param alert: A dict or Pydantic model with keys: symbol, price, sm_buy_count, etc.
+    :param alert: The validated Alert model.
     """
+    with address_locks.hold(alert.address):
+        for attempt in range(ALERT_WRITE_RETRIES + 1):
+            try:
+                return _apply_alert(alert)
+            except (StaleDataError, IntegrityError) as e:
+                # A stale version, or a concurrent insert of the same address
+                if attempt == ALERT_WRITE_RETRIES:
+                    raise
+                ALERT_WRITE_CONFLICTS_TOTAL.inc()
+                logger.info("Write conflict on %s (%s); retrying.", alert.address, type(e).__name__)
+
+def _apply_alert(alert: Alert):
+    # Imported here so NumPy stays off the startup path (see refresh.get_indicator_engine)
+    from src.alert_service.backend.alerts.rules import get_rule_set
+
     db = SessionLocal()
     try:
-        # Assume 'alert' has attribute 'symbol'. Adjust according to your model.
-        existing_entry = get_entry_by_symbol(db, alert.info.symbol)
+        # Entries are keyed by token address; symbols are not unique.
+        with stage_timer("db_lookup"):
+            existing_entry = get_entry_by_address(db, alert.address)
         if existing_entry:
             # Update the existing entry (this updates alert count, last alert time, price, alert count)
-            updated_entry = update_entry(db, existing_entry, alert.lastPrice.price, alert.strategyAlertCount)
-            entry = updated_entry
-            cprint(f"Updated entry for {alert.info.symbol} with price {alert.lastPrice.price} and alert count {alert.strategyAlertCount}.", "green")
+            entry = update_entry(db, existing_entry, alert.lastPrice.price, alert.strategyAlertCount, commit=False)
         else:
             # Create a new entry with the provided data
-            entry = add_new_entry(db, alert.info.symbol, alert.lastPrice.price, alert.strategyAlertCount, alert.address)
-            cprint(f"Created new entry for {alert.info.symbol} with price {alert.lastPrice.price} and alert count {alert.strategyAlertCount}.", "green")
+            entry = add_new_entry(db, alert.info.symbol, alert.lastPrice.price, alert.strategyAlertCount, alert.address, commit=False)
+        # Fold the alert price into the running ATH/multipliers.
+        with stage_timer("derived"):
+            apply_price_tick(entry, alert.lastPrice.price)
         # After updating/adding the entry, refresh additional data synchronously.
-        refreshed_entry = refresh_entry(db, entry)
-        return refreshed_entry
+        with stage_timer("refresh"):
+            refresh_entry(db, entry, commit=False)
+        # Route the entry to its channels and watchlist status from the refreshed fields.
+        flags_before = entry.channel_flags or 0
+        with stage_timer("rules"):
+            matched = get_rule_set().apply(entry)
+        # One commit per alert: a refresh can never land on top of a newer alert's write,
+        # and a version conflict retries the alert as a whole.
+        with stage_timer("db_write"):
+            db.commit()
+            db.refresh(entry)
+        if existing_entry:
+            ALERT_ENTRIES_TOTAL.labels("updated").inc()
+            logger.debug("Updated entry for %s with price %s and alert count %s.", alert.info.symbol, alert.lastPrice.price, alert.strategyAlertCount)
+        else:
+            ALERT_ENTRIES_TOTAL.labels("new").inc()
+            logger.debug("Created new entry for %s with price %s and alert count %s.", alert.info.symbol, alert.lastPrice.price, alert.strategyAlertCount)
+        # Queue the change for the next coalesced push to dashboards.
+        broadcaster.publish(entry_delta(entry))
+        # Traders are notified of new tokens and of tokens joining a channel.
+        joined = Channel(entry.channel_flags & ~flags_before)
+        if dispatcher.enabled and (not existing_entry or joined):
+            dispatcher.notify(alert_event(entry, not existing_entry, [c.name for c in Channel if c in joined], matched))
+        return entry
     finally:
         db.close()
-
-def validate_alert(alert: Alert) -> None:
-    """
-    Validates that the given alert contains all the expected fields.
-    Raises ValueError with an appropriate message if any required field is missing or invalid.
-    """
-    # Check required primitive fields
-    if not alert.address:
-        raise ValueError("Missing 'address' in alert.")
-    if alert.price is None:
-        raise ValueError("Missing 'price' in alert.")
-    if alert.lastTouched is None:
-        raise ValueError("Missing 'lastTouched' in alert.")
-    if alert.strategyAlertCount is None:
-        raise ValueError("Missing 'strategyAlertCount' in alert.")
-
-    # Validate TokenInfo if provided
-    if alert.info is not None:
-        # Check that name, symbol, description and websites are present
-        if not alert.info.name:
-            raise ValueError("Missing 'name' in alert info.")
-        if not alert.info.symbol:
-            raise ValueError("Missing 'symbol' in alert info.")
-
-    # Validate PriceInfo if provided
-    if alert.lastPrice is not None:
-        if not alert.lastPrice.price:
-            raise ValueError("Missing 'price' in alert lastPrice.")
-        if not alert.lastPrice.fdv:
-            raise ValueError("Missing 'fdv' in alert lastPrice.")
\ No newline at end of file
@@ -1,10 +1,12 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime, timezone
-# Define Pydantic models for the additional data
+# Define Pydantic models for the additional data.
+# Required fields and value checks live on the models so a request is
+# validated in the same pass that parses it.
 
 class TokenInfo(BaseModel):
-    name: str
-    symbol: str
+    name: str = Field(min_length=1)
+    symbol: str = Field(min_length=1)
     imageUrl: str | None = None
     twitterHandle: str | None = None
     telegramHandle: str | None = None
@@ -13,16 +15,23 @@ class TokenInfo(BaseModel):
     websites: list[str]
 
 class PriceInfo(BaseModel):
-    price: str
-    fdv: str
+    # The feed sends these as decimal strings; they are parsed to floats once here.
+    price: float = Field(gt=0)
+    fdv: float = Field(gt=0)
 
 # Updated Alert model including the new fields.
 class Alert(BaseModel):
-    address: str
+    address: str = Field(min_length=1)
     price: float
-    timestamp: datetime = None  # Optional; will be set to current time if not provided
+    timestamp: datetime | None = Field(default=None, validate_default=True)  # Set to the current time if not provided
     purchaseSize: float | None = None
     lastTouched: int
-    info: TokenInfo | None = None
-    lastPrice: PriceInfo | None = None
-    strategyAlertCount: int | None = None
\ No newline at end of file
+    # Required: new entries take their symbol from info and every alert its price from lastPrice
+    info: TokenInfo
+    lastPrice: PriceInfo
+    strategyAlertCount: int
+
+    @field_validator("timestamp")
+    @classmethod
+    def default_timestamp(cls, value):
+        return value if value is not None else datetime.now(timezone.utc).replace(tzinfo=None)
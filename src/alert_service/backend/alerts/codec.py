@@ -0,0 +1,35 @@
+from src.alert_service.backend.alerts.alert_models import Alert
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+class UnsupportedMediaType(ValueError):
+    """
+    Raised when a request body uses an encoding the codec cannot decode.
+    """
+
+def is_msgpack(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";", 1)[0].strip().lower() in MSGPACK_CONTENT_TYPES
+
+def decode_alert(body: bytes, content_type: str | None = None) -> Alert:
+    """
+    Parses and validates a raw request body into an Alert in one pass.
+
+    JSON bodies are handed straight to pydantic-core, which parses and
+    validates without building an intermediate dict. msgpack bodies are
+    accepted when the msgpack package is installed.
+
+    Raises pydantic.ValidationError for malformed or incomplete alerts and
+    UnsupportedMediaType for msgpack bodies without msgpack installed.
+    """
+    if is_msgpack(content_type):
+        if msgpack is None:
+            raise UnsupportedMediaType("msgpack bodies require the msgpack package.")
+        return Alert.model_validate(msgpack.unpackb(body))
+    return Alert.model_validate_json(body)
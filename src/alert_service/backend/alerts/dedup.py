@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.alert_service.backend.alerts.alert_models import Alert
+from src.alert_service.backend.metrics import DEDUP_CACHE_ENTRIES
+
+# How long a delivered alert is remembered, and a hard cap on remembered keys.
+# 100k keys is a few tens of MB and covers several minutes of a full replay burst.
+DEDUP_TTL_SECONDS = float(os.environ.get("DEDUP_TTL_SECONDS", "300"))
+DEDUP_MAX_ENTRIES = int(os.environ.get("DEDUP_MAX_ENTRIES", "100000"))
+
+class DedupCache:
+    """
+    Remembers recently seen alert keys for `ttl` seconds.
+
+    Every key gets the same TTL from the moment it is first seen, so insertion
+    order is also expiry order and eviction only ever pops from the front.
+    When more than `max_entries` keys are live the oldest are evicted early.
+    """
+
+    def __init__(self, ttl: float = DEDUP_TTL_SECONDS, max_entries: int = DEDUP_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._expiry = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def _evict(self, now: float) -> None:
+        while self._expiry and next(iter(self._expiry.values())) <= now:
+            self._expiry.popitem(last=False)
+
+    def seen(self, key) -> bool:
+        """
+        Records `key` and returns True if it was already recorded within the
+        TTL window, i.e. the caller is looking at a duplicate.
+        """
+        now = self._clock()
+        with self._lock:
+            self._evict(now)
+            if key in self._expiry:
+                return True
+            self._expiry[key] = now + self.ttl
+            if len(self._expiry) > self.max_entries:
+                self._expiry.popitem(last=False)
+            return False
+
+    def discard(self, key) -> None:
+        """
+        Forgets `key` so a retry is processed again, e.g. after the first
+        attempt failed.
+        """
+        with self._lock:
+            self._expiry.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+
+def alert_key(alert: Alert, idempotency_key: str | None = None):
+    """
+    Identifies a delivery. An explicit idempotency key from the sender wins;
+    otherwise an upstream retry repeats address, lastTouched and
+    strategyAlertCount exactly.
+    """
+    if idempotency_key:
+        return ("key", idempotency_key)
+    return (alert.address, alert.lastTouched, alert.strategyAlertCount)
+
+# Shared cache used by the ingestion endpoint
+dedup_cache = DedupCache()
+DEDUP_CACHE_ENTRIES.set_function(dedup_cache.__len__)
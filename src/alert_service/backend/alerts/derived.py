@@ -0,0 +1,68 @@
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import text
+from src.alert_service.backend.database.models import AlertEntry
+
+logger = logging.getLogger(__name__)
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored in UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def apply_price_tick(entry: AlertEntry, price: float, now: datetime = None) -> AlertEntry:
+    """
+    Applies a new price to the entry and updates its derived metrics in O(1):
+    curr_multiplier is price over the first alert price, ath_multiplier keeps
+    the running maximum of that ratio (stamped with ath_time when raised) and
+    token_age is the number of seconds since the first alert. No price
+    history is needed.
+
+    The caller commits the session.
+    """
+    now = now or datetime.now(timezone.utc)
+    entry.current_price = price
+    if entry.first_alert_price:
+        multiplier = price / entry.first_alert_price
+        entry.curr_multiplier = multiplier
+        if multiplier > (entry.ath_multiplier or 1.0):
+            entry.ath_multiplier = multiplier
+            entry.ath_time = now
+        elif entry.ath_multiplier is None:
+            entry.ath_multiplier = 1.0
+    if entry.first_alert_time is not None:
+        entry.token_age = (now - _as_utc(entry.first_alert_time)).total_seconds()
+    return entry
+
+# The first alert price is the initial ATH, hence the floor of 1.0. SET expressions
+# see the old row, so ath_time moves only when this UPDATE raises ath_multiplier. The
+# version bump and last_update_time match an ORM update, so a session holding one of
+# these rows gets a StaleDataError instead of overwriting the backfilled values.
+BACKFILL_SQL = text("""
+UPDATE alert_entries SET
+    curr_multiplier = current_price / first_alert_price,
+    ath_multiplier = MAX(COALESCE(ath_multiplier, 1.0), current_price / first_alert_price),
+    ath_time = CASE WHEN current_price / first_alert_price > COALESCE(ath_multiplier, 1.0)
+                    THEN CURRENT_TIMESTAMP ELSE ath_time END,
+    token_age = (julianday('now') - julianday(first_alert_time)) * 86400.0,
+    last_update_time = CURRENT_TIMESTAMP,
+    version = version + 1
+WHERE first_alert_price > 0
+""")
+
+def backfill_derived_metrics(engine) -> int:
+    """
+    Recomputes the derived metrics for the whole table with one set-based
+    UPDATE. Only the current price is known, so a stored ath_multiplier is
+    kept if it is higher than the current multiplier.
+
+    Returns the number of updated rows.
+    """
+    with engine.begin() as conn:
+        updated = conn.execute(BACKFILL_SQL).rowcount
+    logger.info("Backfilled derived metrics for %d entries.", updated)
+    return updated
+
+if __name__ == "__main__":
+    from src.alert_service.backend.database.db import engine, init_db
+    init_db()
+    print(f"Backfilled derived metrics for {backfill_derived_metrics(engine)} entries.")
@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from src.alert_service.backend.database.enums import MacdSignal
+
+# Ticks kept per token; must cover the longest volume window at the expected tick rate.
+RING_SIZE = int(os.environ.get("INDICATOR_RING_SIZE", "256"))
+# A token with no tick for this many seconds loses its row (its MACD restarts from the
+# next tick); checked at most every INDICATOR_SWEEP_S on the update path of each process.
+INDICATOR_IDLE_TTL_S = float(os.environ.get("INDICATOR_IDLE_TTL_S", "86400"))
+INDICATOR_SWEEP_S = float(os.environ.get("INDICATOR_SWEEP_S", "600"))
+
+# (fast, slow, signal) EMA spans for each MACD column.
+MACD_SPANS = {
+    "macd_short": (5, 13, 5),
+    "macd_line": (12, 26, 9),
+    "macd_long": (19, 39, 9),
+}
+# Rolling volume windows in seconds.
+VOLUME_WINDOWS = {
+    "volume_5min": 300,
+    "volume_1hr": 3600,
+}
+
+def _alphas(spans):
+    return 2.0 / (np.asarray(spans, dtype=np.float64) + 1.0)
+
+class IndicatorEngine:
+    """
+    Per-token technical indicators kept in fixed-size NumPy state.
+
+    Every token owns one row: a ring buffer of (timestamp, price, volume)
+    ticks, EMA state for each MACD configuration and, per volume window, a
+    running sum with a tail pointer into the ring. A tick updates the EMAs
+    with one multiply-add and the windowed volumes by adding the new volume
+    and subtracting the ticks that fell out of the window, so nothing is
+    recomputed from history.
+
+    update_batch applies one tick to many tokens with array operations over
+    the touched rows; update is the single-token form. State is in memory
+    only and rebuilds from live ticks after a restart.
+
+    Rows of purged tokens (evict) and of tokens idle for `idle_ttl` seconds
+    are freed and reused by new tokens, so the arrays track the live tokens
+    rather than every token ever seen.
+    """
+
+    def __init__(self, ring_size: int = RING_SIZE, macd_spans=MACD_SPANS, volume_windows=VOLUME_WINDOWS, capacity: int = 1024,
+                 idle_ttl: float = INDICATOR_IDLE_TTL_S, sweep_interval: float = INDICATOR_SWEEP_S):
+        self.ring_size = ring_size
+        self.macd_columns = tuple(macd_spans)
+        self.volume_columns = tuple(volume_windows)
+        spans = np.array(list(macd_spans.values()), dtype=np.float64)
+        self._alpha_fast = _alphas(spans[:, 0])
+        self._alpha_slow = _alphas(spans[:, 1])
+        self._alpha_signal = _alphas(spans[:, 2])
+        self._windows = np.array(list(volume_windows.values()), dtype=np.float64)
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self._slots = {}
+        self._free = []  # rows released by evict, reused before new ones
+        self._used = 0  # rows ever handed out; the high-water mark
+        self._last_sweep = None
+        self._lock = threading.Lock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        configs, windows = len(self.macd_columns), len(self.volume_columns)
+        self.capacity = capacity
+        self.ts = np.zeros((capacity, self.ring_size))
+        self.prices = np.zeros((capacity, self.ring_size), dtype=np.float32)
+        self.volumes = np.zeros((capacity, self.ring_size))
+        self.head = np.zeros(capacity, dtype=np.int64)
+        self.ticks = np.zeros(capacity, dtype=np.int64)
+        self.ema_fast = np.zeros((capacity, configs))
+        self.ema_slow = np.zeros((capacity, configs))
+        self.ema_signal = np.zeros((capacity, configs))
+        self.tail = np.zeros((capacity, windows), dtype=np.int64)
+        self.count = np.zeros((capacity, windows), dtype=np.int64)
+        self.sums = np.zeros((capacity, windows))
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = {name: getattr(self, name) for name in (
+            "ts", "prices", "volumes", "head", "ticks", "ema_fast", "ema_slow",
+            "ema_signal", "tail", "count", "sums")}
+        self._allocate(capacity)
+        for name, array in old.items():
+            getattr(self, name)[:len(array)] = array
+
+    def __len__(self):
+        return len(self._slots)
+
+    def slots_for(self, addresses) -> np.ndarray:
+        """
+        Returns the row index of each address, assigning rows to new tokens.
+        """
+        slots = np.empty(len(addresses), dtype=np.int64)
+        for i, address in enumerate(addresses):
+            slot = self._slots.get(address)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    slot = self._used
+                    self._used += 1
+                self._slots[address] = slot
+            slots[i] = slot
+        if self._used > self.capacity:
+            self._grow(self._used)
+        return slots
+
+    def _release(self, slots):
+        # Zeroed rows look like new tokens: the next tick seeds the EMAs again
+        for name in ("head", "ticks", "ema_fast", "ema_slow", "ema_signal", "tail", "count", "sums"):
+            getattr(self, name)[slots] = 0
+        self._free.extend(int(slot) for slot in slots)
+
+    def evict(self, addresses) -> int:
+        """
+        Frees the rows of `addresses` (e.g. entries removed by retention) for
+        reuse. Unknown addresses are ignored. Returns the number evicted.
+        """
+        with self._lock:
+            slots = [self._slots.pop(address) for address in addresses if address in self._slots]
+            self._release(np.array(slots, dtype=np.int64))
+            return len(slots)
+
+    def evict_idle(self, now: float = None) -> int:
+        """
+        Frees the rows of tokens whose last tick is older than idle_ttl.
+        Returns the number evicted.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._evict_idle(now)
+
+    def _evict_idle(self, now):
+        self._last_sweep = now
+        if not self._slots:
+            return 0
+        addresses = list(self._slots)
+        slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(addresses))
+        last_tick = self.ts[slots, (self.head[slots] - 1) % self.ring_size]
+        idle = np.nonzero(last_tick < now - self.idle_ttl)[0]
+        for i in idle:
+            del self._slots[addresses[i]]
+        self._release(slots[idle])
+        return len(idle)
+
+    def update(self, address, price: float, volume: float = 0.0, ts: float = None) -> dict:
+        """
+        Applies one tick for a token and returns its indicator values, keyed
+        by AlertEntry column name (MACD columns as MacdSignal codes).
+        """
+        return self.update_batch([address], [price], [volume], ts)[0]
+
+    def update_batch(self, addresses, prices, volumes=None, ts=None) -> list[dict]:
+        """
+        Applies one tick per element across many tokens in a vectorised pass
+        and returns the indicator values for each element, in input order.
+        An address may repeat; its ticks are applied in input order.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.zeros_like(prices) if volumes is None else np.asarray(volumes, dtype=np.float64)
+        now = time.time() if ts is None else ts
+        ts = np.broadcast_to(np.asarray(now, dtype=np.float64), prices.shape)
+        with self._lock:
+            latest = float(ts.max()) if len(ts) else now
+            if self._last_sweep is None:
+                self._last_sweep = latest
+            elif latest - self._last_sweep >= self.sweep_interval:
+                self._evict_idle(latest)
+            slots = self.slots_for(addresses)
+            rank = _occurrence_rank(slots)
+            for r in range(int(rank.max()) + 1 if len(rank) else 0):
+                step = rank == r
+                self._apply(slots[step], prices[step], volumes[step], ts[step])
+            return self._values(slots)
+
+    def _apply(self, slots, prices, volumes, ts):
+        # MACD: the first tick seeds every EMA with the price (adjust=False semantics).
+        first = self.ticks[slots] == 0
+        p = prices[:, None]
+        fast = np.where(first[:, None], p, self.ema_fast[slots] + self._alpha_fast * (p - self.ema_fast[slots]))
+        slow = np.where(first[:, None], p, self.ema_slow[slots] + self._alpha_slow * (p - self.ema_slow[slots]))
+        macd = fast - slow
+        signal = np.where(first[:, None], macd, self.ema_signal[slots] + self._alpha_signal * (macd - self.ema_signal[slots]))
+        self.ema_fast[slots], self.ema_slow[slots], self.ema_signal[slots] = fast, slow, signal
+
+        # Volume: a full window would lose its oldest tick to the overwrite below.
+        head = self.head[slots]
+        full = self.count[slots] == self.ring_size
+        if full.any():
+            rows, windows = np.nonzero(full)
+            self._pop_tail(slots[rows], windows)
+        self.ts[slots, head] = ts
+        self.prices[slots, head] = prices
+        self.volumes[slots, head] = volumes
+        self.head[slots] = (head + 1) % self.ring_size
+        self.ticks[slots] += 1
+        self.sums[slots] += volumes[:, None]
+        self.count[slots] += 1
+        self._expire(slots, ts)
+
+    def _pop_tail(self, slots, windows):
+        tail = self.tail[slots, windows]
+        self.sums[slots, windows] -= self.volumes[slots, tail]
+        self.tail[slots, windows] = (tail + 1) % self.ring_size
+        self.count[slots, windows] -= 1
+
+    def _expire(self, slots, now):
+        cutoff = now[:, None] - self._windows
+        while True:
+            expired = (self.count[slots] > 0) & (self.ts[slots[:, None], self.tail[slots]] <= cutoff)
+            if not expired.any():
+                return
+            rows, windows = np.nonzero(expired)
+            self._pop_tail(slots[rows], windows)
+
+    def _values(self, slots) -> list[dict]:
+        codes = np.where(self.ema_fast[slots] - self.ema_slow[slots] >= self.ema_signal[slots],
+                         int(MacdSignal.ABOVE_SIGNAL), int(MacdSignal.BELOW_SIGNAL))
+        sums = np.maximum(self.sums[slots], 0.0)  # guards float drift below zero
+        return [
+            {**dict(zip(self.macd_columns, code_row)), **dict(zip(self.volume_columns, sum_row))}
+            for code_row, sum_row in zip(codes.tolist(), sums.tolist())
+        ]
+
+    def macd(self, address) -> dict:
+        """
+        Returns the raw (macd, signal) values per MACD column for a token.
+        """
+        slot = self._slots[address]
+        macd = self.ema_fast[slot] - self.ema_slow[slot]
+        return {column: (macd[i], self.ema_signal[slot, i]) for i, column in enumerate(self.macd_columns)}
+
+    def snapshot(self, addresses) -> list[dict]:
+        """
+        Returns the current indicator values for known addresses.
+        """
+        with self._lock:
+            return self._values(np.array([self._slots[a] for a in addresses], dtype=np.int64))
+
+def _occurrence_rank(slots):
+    """
+    For each element, how many earlier elements share its slot. Ticks with the
+    same rank touch distinct rows and can be applied in one vectorised step.
+    """
+    if not len(slots):
+        return slots
+    order = np.argsort(slots, kind="stable")
+    ordered = slots[order]
+    positions = np.arange(len(slots))
+    starts = np.r_[True, ordered[1:] != ordered[:-1]]
+    group_start = np.maximum.accumulate(np.where(starts, positions, 0))
+    rank = np.empty_like(slots)
+    rank[order] = positions - group_start
+    return rank
+
+# Shared engine fed by refresh_entry
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,107 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+
+from src.alert_service.backend.cluster import WORKER_COUNT, WORKER_INDEX
+
+logger = logging.getLogger(__name__)
+
+# gzip JSONL file receiving every accepted alert; unset disables recording.
+# With several workers each one writes its own file (see worker_path).
+ALERT_RECORD_PATH = os.environ.get("ALERT_RECORD_PATH")
+# Seconds between writes; each write is one complete gzip member, so a killed
+# process loses at most this much and never leaves a cut-off member behind.
+ALERT_RECORD_FLUSH_S = float(os.environ.get("ALERT_RECORD_FLUSH_S", "2"))
+
+def worker_path(path: str, index: int = WORKER_INDEX, count: int = WORKER_COUNT) -> str:
+    """
+    The recording file of worker `index`: `path` itself for a single worker,
+    otherwise e.g. alerts.w1.jsonl.gz for alerts.jsonl.gz.
+    """
+    if count <= 1:
+        return path
+    head, dot, tail = os.path.basename(path).partition(".")
+    return os.path.join(os.path.dirname(path), f"{head}.w{index}{dot}{tail}")
+
+class AlertRecorder:
+    """
+    Appends accepted alerts to a gzip-compressed JSON lines file, one
+    {"t": <epoch seconds received>, "alert": <payload>} object per line, for
+    benchmarks/replay.py to re-drive later.
+
+    record() only queues the alert. A writer thread serialises what was
+    queued and appends it as one gzip member every ALERT_RECORD_FLUSH_S, so
+    the event loop never waits on compression or disk. A file made of
+    several members still reads as a single stream.
+    """
+
+    def __init__(self, path: str, flush_interval: float = ALERT_RECORD_FLUSH_S):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._queue = queue.SimpleQueue()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, alert, received: float = None):
+        self._queue.put((time.time() if received is None else received, alert))
+
+    def flush(self) -> int:
+        """
+        Writes everything queued as one gzip member; returns the number of alerts.
+        """
+        lines = []
+        while True:
+            try:
+                received, alert = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            # Fields the sender left out stay out, so replays send the same shape of payload
+            payload = alert.model_dump_json(exclude_unset=True)
+            lines.append(f'{{"t":{received},"alert":{payload}}}\n')
+        if lines:
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.writelines(lines)
+            self.count += len(lines)
+        return len(lines)
+
+    def _run(self):
+        while not self._stopping.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing the alert recording failed")
+
+    def close(self):
+        self._stopping.set()
+        self._thread.join()
+        self.flush()
+        logger.info("Recorded %d alerts to %s.", self.count, self.path)
+
+def read_recording(*paths: str) -> list[tuple[float, dict]]:
+    """
+    Returns the (received time, payload) pairs of one or more recordings
+    (e.g. every worker's file), oldest first. A file whose tail was cut off
+    (a process killed mid-write) yields the records before the damage.
+    """
+    records = []
+    for path in paths:
+        before = len(records)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+            except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError) as e:
+                logger.warning("Recording %s is truncated (%s); kept the %d records before it.", path, e,
+                               len(records) - before)
+    return sorted(((record["t"], record["alert"]) for record in records), key=lambda record: record[0])
+
+# Process-wide recorder used by the /alert endpoint, if enabled.
+recorder = AlertRecorder(worker_path(ALERT_RECORD_PATH)) if ALERT_RECORD_PATH else None
@@ -1,67 +1,87 @@
+import os
 import random
 from datetime import datetime, timezone
 from src.alert_service.backend.database.models import AlertEntry
+from src.alert_service.backend.alerts.derived import apply_price_tick
+
+# Seed for the provider stubs. When set, refreshes produce the same values for the
+# same sequence of alerts, which replays rely on to be comparable between runs.
+PROVIDER_SEED = os.environ.get("PROVIDER_SEED")
+
+# Random source shared by the provider stubs below.
+_rng = random.Random(int(PROVIDER_SEED)) if PROVIDER_SEED else random.Random()
+
+def seed_providers(seed: int | None):
+    """
+    Makes the provider stubs deterministic from `seed` (None restores unseeded values).
+    """
+    global _rng
+    _rng = random.Random(seed)
 
 def fetch_price(symbol):
     """
-    Dummy function to simulate fetching updated price data from CoinGecko.
-    In real implementation, this would call the actual API.
+    Latest price from a market-data provider (e.g. CoinGecko), or None when
+    no provider is configured. None is the only case today: the alert's own
+    price then stands, and a made-up price must never be folded into the
+    ATH, multipliers and indicators.
     """
-    # Simulate a slight price fluctuation
-    return round(random.uniform(0.9, 1.1) * 1.0, 4)
+    return None
 
 def fetch_twitter_sentiment(symbol):
     """
     Dummy function for Twitter sentiment analysis.
     """
     sentiments = ["Positive", "Neutral", "Negative"]
-    return random.choice(sentiments)
+    return _rng.choice(sentiments)
 
 def fetch_rug_bundle_check(symbol):
     """
     Dummy function for rug bundle check.
     """
     statuses = ["Safe", "Warning", "Critical"]
-    return random.choice(statuses)
+    return _rng.choice(statuses)
 
-def fetch_macd(symbol):
+def fetch_trade_volume(symbol):
     """
-    Dummy function to simulate MACD indicator.
+    Dummy function to simulate fetching the volume traded since the last refresh.
     """
-    return random.choice(["Above Signal", "Below Signal"])
+    return round(_rng.uniform(100, 1000), 2)
 
-def fetch_volume_data(symbol):
+def get_indicator_engine():
     """
-    Dummy function to simulate fetching volume data.
-    Returns a tuple: (volume_5min, volume_1hr)
+    Returns the shared indicator engine. Imported on first use so NumPy is not
+    loaded until alerts arrive (or the startup warm-up runs).
     """
-    return (round(random.uniform(1000, 5000), 2), round(random.uniform(10000, 50000), 2))
+    from src.alert_service.backend.alerts.indicators import indicator_engine
+    return indicator_engine
 
-def refresh_entry(db, entry: AlertEntry):
+def refresh_entry(db, entry: AlertEntry, commit: bool = True):
     """
     Refreshes the given entry with updated data from various sources.
     
     :param db: The SQLAlchemy session.
     :param entry: The AlertEntry instance to be refreshed.
+    :param commit: Commit the session; False leaves the changes to the caller.
     :return: The updated entry.
     """
-    # Fetch new data for the given symbol
+    # Fetch new data for the given symbol; without a price provider the entry keeps the alert's price
     new_price = fetch_price(entry.symbol)
     new_twitter_sentiment = fetch_twitter_sentiment(entry.symbol)
     new_rug_bundle_check = fetch_rug_bundle_check(entry.symbol)
-    new_macd = fetch_macd(entry.symbol)
-    volume_5min, volume_1hr = fetch_volume_data(entry.symbol)
+    trade_volume = fetch_trade_volume(entry.symbol)
     
-    # Update the entry fields
-    entry.price = new_price
+    # Update the entry fields; the price tick also maintains the derived metrics
+    if new_price is not None:
+        apply_price_tick(entry, new_price)
     entry.twitter_sentiment = new_twitter_sentiment
     entry.rug_bundle_check = new_rug_bundle_check
-    entry.macd = new_macd
-    entry.volume_5min = volume_5min
-    entry.volume_1hr = volume_1hr
+    # MACD signals and rolling volumes come from the token's tick history
+    for column, value in get_indicator_engine().update(entry.address, entry.current_price, trade_volume).items():
+        setattr(entry, column, value)
     entry.last_update_time = datetime.now(timezone.utc)
 
     # Commit changes to the database.
-    db.commit()
-    db.refresh(entry)
+    if commit:
+        db.commit()
+        db.refresh(entry)
     return entry
\ No newline at end of file
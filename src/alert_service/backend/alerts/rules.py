@@ -0,0 +1,283 @@
+import logging
+import operator
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import Boolean, Float, Integer, and_, case, false, func, not_, or_, select, true, update
+
+from src.alert_service.backend.database.enums import CHANNEL_COLUMNS, CODED_COLUMNS, Channel
+from src.alert_service.backend.database.models import AlertEntry
+from src.alert_service.backend.metrics import RULE_EVALUATION_SECONDS, RULE_HITS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Optional YAML/JSON file replacing DEFAULT_RULES.
+ALERT_RULES = os.environ.get("ALERT_RULES")
+
+# Rules decide channel membership and watchlist status. Each rule has
+#   name:   reported in hit counts
+#   target: a channel (Channel member or legacy channel_* column name) or "active_watchlist"
+#   when:   a condition over AlertEntry fields:
+#             {field, op, value} with op one of == != > >= < <= in not_in
+#             {all: [...]}, {any: [...]} or {not: {...}}
+# A channel bit is set when any rule targeting it matches. An entry is active
+# when any active_watchlist rule matches. Fields with no value never match.
+DEFAULT_RULES = [
+    {"name": "min_price", "target": "active_watchlist",
+     "when": {"field": "current_price", "op": ">", "value": 0.05}},
+    {"name": "high_conviction", "target": "HighConviction",
+     "when": {"all": [{"field": "alert_count", "op": ">=", "value": 5},
+                      {"field": "rug_bundle_check", "op": "==", "value": "Safe"},
+                      {"field": "macd_line", "op": "==", "value": "Above Signal"}]}},
+    {"name": "early_alpha", "target": "EarlyAlpha",
+     "when": {"all": [{"field": "token_age", "op": "<", "value": 3600},
+                      {"field": "alert_count", "op": ">=", "value": 2}]}},
+    {"name": "smart_money_wallets", "target": "FiveXSMWallet",
+     "when": {"field": "sm_buy_count", "op": ">=", "value": 5}},
+    {"name": "smart_followers", "target": "SmartFollowers",
+     "when": {"all": [{"field": "twitter_sentiment", "op": "==", "value": "Positive"},
+                      {"field": "volume_1hr", "op": ">=", "value": 10000}]}},
+    {"name": "kimchi_test", "target": "KimchiTest",
+     "when": {"all": [{"field": "curr_multiplier", "op": ">=", "value": 2},
+                      {"field": "rug_bundle_check", "op": "!=", "value": "Critical"}]}},
+]
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+ACTIVE_TARGET = "active_watchlist"
+
+def load_rule_config(path: str | None = ALERT_RULES) -> list[dict]:
+    """
+    Returns the rules from `path` (a YAML or JSON list of rule dicts, or a
+    mapping with a "rules" key), or DEFAULT_RULES if no path is given.
+    """
+    if not path:
+        return DEFAULT_RULES
+    import yaml  # JSON is a subset of YAML
+    with open(path) as f:
+        config = yaml.safe_load(f)
+    return config["rules"] if isinstance(config, dict) else config
+
+def _resolve_field(field: str, value):
+    """
+    Maps a rule field to its column, translating legacy categorical names
+    (rug_bundle_check == "Safe") to their code columns and codes.
+    """
+    if field in CODED_COLUMNS:
+        column, enum_cls = CODED_COLUMNS[field]
+        coerce = lambda v: int(enum_cls.coerce(v))
+        value = [coerce(v) for v in value] if isinstance(value, (list, tuple)) else coerce(value)
+        return column, value
+    column = AlertEntry.__table__.columns.get(field)
+    if column is None or not isinstance(column.type, (Integer, Float, Boolean)):
+        raise ValueError(f"Rules can only test numeric, boolean or categorical fields; got {field!r}.")
+    return field, value
+
+def _valid(values: np.ndarray) -> np.ndarray:
+    # Missing values are NaN in the float columns handed to the mask functions
+    return ~np.isnan(values) if values.dtype.kind == "f" else np.ones(values.shape, dtype=bool)
+
+def _leaf(spec: dict, negate: bool = False):
+    # A missing value matches neither a test nor its negation, so `negate` inverts
+    # only the comparison and the IS NOT NULL guard stays outside it.
+    op = spec["op"]
+    column, value = _resolve_field(spec["field"], spec.get("value"))
+    sql_column = getattr(AlertEntry, column)
+    if op in ("in", "not_in"):
+        values = list(value)
+        members = frozenset(values)
+        negate = negate != (op == "not_in")
+        predicate = lambda entry: (v := getattr(entry, column)) is not None and (v in members) != negate
+        mask = lambda cols: _valid(cols[column]) & (np.isin(cols[column], values) != negate)
+        clause = and_(sql_column.is_not(None), sql_column.not_in(values) if negate else sql_column.in_(values))
+    elif op in OPERATORS:
+        compare = OPERATORS[op]
+        predicate = lambda entry: (v := getattr(entry, column)) is not None and compare(v, value) != negate
+        mask = lambda cols: _valid(cols[column]) & (compare(cols[column], value) != negate)
+        test = compare(sql_column, value)
+        clause = and_(sql_column.is_not(None), not_(test) if negate else test)
+    else:
+        raise ValueError(f"Unknown rule operator {op!r}.")
+    return predicate, mask, clause, {column}
+
+def compile_condition(spec: dict, negate: bool = False):
+    """
+    Compiles a rule condition into three equivalent forms:
+      predicate(entry) -> bool            for one AlertEntry
+      mask(columns) -> np.ndarray[bool]   for dict of column arrays
+      clause                              SQLAlchemy expression for the database
+    and returns them with the set of columns the condition reads.
+
+    "not" is pushed down to the leaves (De Morgan for all/any), so a token
+    whose field is missing matches neither {"field": f, ...} nor its "not".
+    """
+    if "not" in spec:
+        return compile_condition(spec["not"], not negate)
+    reducers = (("all", all, np.logical_and, and_), ("any", any, np.logical_or, or_))
+    for i, (key, _, _, _) in enumerate(reducers):
+        if key in spec:
+            # not all(...) == any(not ...), and the other way round
+            _, reduce_py, reduce_np, reduce_sql = reducers[i ^ negate]
+            parts = [compile_condition(part, negate) for part in spec[key]]
+            if not parts:
+                raise ValueError(f"'{key}' needs at least one condition.")
+            predicates, masks, clauses, fields = zip(*parts)
+            return (
+                lambda entry: reduce_py(p(entry) for p in predicates),
+                lambda cols: reduce_np.reduce([m(cols) for m in masks]),
+                reduce_sql(*clauses),
+                set().union(*fields),
+            )
+    return _leaf(spec, negate)
+
+def _channel_bit(target: str) -> int:
+    if target in CHANNEL_COLUMNS:
+        return int(CHANNEL_COLUMNS[target])
+    try:
+        return int(Channel[target])
+    except KeyError:
+        raise ValueError(f"Unknown rule target {target!r}; expected a channel or {ACTIVE_TARGET!r}.") from None
+
+class Rule:
+    def __init__(self, name: str, target: str, when: dict):
+        self.name = name
+        self.target = target
+        self.bit = None if target == ACTIVE_TARGET else _channel_bit(target)
+        self.predicate, self.mask, self.clause, self.fields = compile_condition(when)
+
+class RuleSet:
+    """
+    Compiled routing rules. apply() evaluates one entry as its alert is
+    processed; evaluate_arrays() and apply_bulk() re-evaluate every entry at
+    once, as NumPy masks over column arrays or as one SQL UPDATE.
+
+    Channel bits that no rule targets are left untouched, as is
+    active_watchlist when no rule targets it.
+    """
+
+    def __init__(self, rules: list[dict]):
+        self.rules = [Rule(rule["name"], rule["target"], rule["when"]) for rule in rules]
+        self.channel_mask = 0
+        for rule in self.rules:
+            self.channel_mask |= rule.bit or 0
+        self.sets_active = any(rule.bit is None for rule in self.rules)
+        self.fields = sorted(set().union(*(rule.fields for rule in self.rules)) | {"channel_flags", "active_watchlist"})
+        self.hits = Counter()
+        self.last_bulk = None
+        self._lock = threading.Lock()
+
+    def apply(self, entry) -> list[str]:
+        """
+        Sets channel_flags and active_watchlist on one entry from the rules.
+        Returns the names of the matched rules.
+        """
+        matched = [rule for rule in self.rules if rule.predicate(entry)]
+        flags = (entry.channel_flags or 0) & ~self.channel_mask
+        for rule in matched:
+            flags |= rule.bit or 0
+        entry.channel_flags = flags
+        if self.sets_active:
+            entry.active_watchlist = any(rule.bit is None for rule in matched)
+        with self._lock:
+            self.hits.update(rule.name for rule in matched)
+        for rule in matched:
+            RULE_HITS_TOTAL.labels(rule.name, "entry").inc()
+        return [rule.name for rule in matched]
+
+    def evaluate_arrays(self, columns: dict) -> dict:
+        """
+        Evaluates all rules over column arrays (numeric, missing values as
+        NaN) and returns the new channel_flags and active_watchlist arrays
+        with per-rule hit counts.
+        """
+        flags = np.asarray(columns["channel_flags"]).astype(np.int64) & ~self.channel_mask
+        active = np.zeros(len(flags), dtype=bool) if self.sets_active else np.asarray(columns["active_watchlist"], dtype=bool)
+        hits = {}
+        for rule in self.rules:
+            mask = rule.mask(columns)
+            hits[rule.name] = hits.get(rule.name, 0) + int(mask.sum())
+            if rule.bit is None:
+                active |= mask
+            else:
+                flags |= np.where(mask, rule.bit, 0)
+        return {"channel_flags": flags, "active_watchlist": active, "hits": hits}
+
+    def _flags_expression(self):
+        flags = AlertEntry.channel_flags.op("&")(~self.channel_mask)
+        for rule in self.rules:
+            if rule.bit is not None:
+                flags = flags.op("|")(case((rule.clause, rule.bit), else_=0))
+        return flags
+
+    def apply_bulk(self, engine) -> dict:
+        """
+        Re-evaluates every entry in the database with one UPDATE, writing only
+        the rows whose flags or status change (and bumping their version and
+        last_update_time, so incremental exports pick them up).
+
+        Returns a report with rows, changed, hits (per rule) and seconds.
+        """
+        started = time.perf_counter()
+        flags = self._flags_expression()
+        values = {"channel_flags": flags, "version": AlertEntry.version + 1,
+                  "last_update_time": datetime.now(timezone.utc)}
+        changed = AlertEntry.channel_flags != flags
+        if self.sets_active:
+            active = case((or_(*(rule.clause for rule in self.rules if rule.bit is None)), true()), else_=false())
+            values["active_watchlist"] = active
+            changed = or_(changed, AlertEntry.active_watchlist != active)
+        counts = [func.coalesce(func.sum(case((rule.clause, 1), else_=0)), 0) for rule in self.rules]
+        with engine.begin() as conn:
+            # Hit counts and the update read the same snapshot inside one write transaction
+            total, *hit_counts = conn.execute(select(func.count(), *counts).select_from(AlertEntry)).one()
+            updated = conn.execute(update(AlertEntry).where(changed).values(values)).rowcount
+        hits = Counter()
+        for rule, count in zip(self.rules, hit_counts):
+            hits[rule.name] += count
+            RULE_HITS_TOTAL.labels(rule.name, "bulk").inc(count)
+        seconds = time.perf_counter() - started
+        RULE_EVALUATION_SECONDS.observe(seconds)
+        self.last_bulk = {"rows": total, "changed": updated, "hits": dict(hits), "seconds": seconds}
+        return self.last_bulk
+
+    def stats(self) -> dict:
+        """
+        Returns per-rule hits from per-alert evaluation and the last bulk report.
+        """
+        with self._lock:
+            return {"entry_hits": dict(self.hits), "last_bulk": self.last_bulk}
+
+def load_columns(engine, fields) -> dict:
+    """
+    Reads the given AlertEntry columns into float arrays (NULL as NaN) for
+    RuleSet.evaluate_arrays.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(select(*(getattr(AlertEntry, field) for field in fields))).all()
+    values = zip(*rows) if rows else ([] for _ in fields)
+    return {field: np.array(column, dtype=np.float64) for field, column in zip(fields, values)}
+
+_rule_set = None
+_rule_set_lock = threading.Lock()
+
+def get_rule_set() -> RuleSet:
+    """
+    Returns the process-wide rule set, compiled from ALERT_RULES on first use.
+    """
+    global _rule_set
+    if _rule_set is None:
+        with _rule_set_lock:
+            if _rule_set is None:
+                _rule_set = RuleSet(load_rule_config())
+                logger.info("Compiled %d routing rules.", len(_rule_set.rules))
+    return _rule_set
@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, DateTime, Float, Integer, func, select
+
+from src.alert_service.backend.database.models import AlertEntry
+from src.alert_service.backend.scheduler.retention import RETENTION_ARCHIVE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Root of the exported Parquet dataset (alert_entries/first_alert_date=YYYY-MM-DD/*.parquet).
+ANALYTICS_DIR = os.environ.get("ANALYTICS_DIR", "analytics")
+# Rows read from the database per batch.
+ANALYTICS_CHUNK_ROWS = int(os.environ.get("ANALYTICS_CHUNK_ROWS", "100000"))
+
+TABLE = "alert_entries"
+PARTITION = "first_alert_date"
+STATE_FILE = "_export_state.json"
+
+def arrow_type(column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+# One fixed schema for every file, so all-NULL batches do not change column types.
+SCHEMA = pa.schema([pa.field(column.name, arrow_type(column)) for column in AlertEntry.__table__.columns])
+
+def read_state(directory: str) -> dict:
+    path = Path(directory) / STATE_FILE
+    if not path.exists():
+        return {"last_update_time": None, "archives": []}
+    return json.loads(path.read_text())
+
+def dataset_version(directory: str = ANALYTICS_DIR) -> str:
+    """
+    Changes whenever an export merges new rows or archives, so query results
+    can be revalidated without running the query.
+    """
+    state = read_state(directory)
+    return f"{state['last_update_time']}/{len(state['archives'])}"
+
+def write_state(directory: str, state: dict):
+    path = Path(directory) / STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path)
+
+def split_partitions(table: pa.Table) -> dict[str, pa.Table]:
+    """
+    Splits a batch by first alert day; entries without one go to "unknown".
+    """
+    keys = pc.fill_null(pc.strftime(table["first_alert_time"], format="%Y-%m-%d"), "unknown")
+    return {key: table.filter(pc.equal(keys, key)) for key in pc.unique(keys).to_pylist()}
+
+def merge_partition(con, partition: Path, incoming: pa.Table, stamp: str) -> int:
+    """
+    Rewrites a partition as one file: its current rows minus the addresses in
+    `incoming`, plus `incoming`. Each address therefore appears once across
+    the dataset and queries need no deduplication. The new file is complete
+    before the old ones are removed, so a concurrent reader sees at worst a
+    few rows twice, never missing ones.
+
+    Returns the number of rows in the partition.
+    """
+    partition.mkdir(parents=True, exist_ok=True)
+    existing = sorted(partition.glob("*.parquet"))
+    target = partition / f"part-{stamp}.parquet"
+    if not existing:
+        pq.write_table(incoming, target, compression="zstd")
+        return incoming.num_rows
+    con.register("incoming", incoming)
+    try:
+        con.execute(
+            "COPY (SELECT * FROM read_parquet($files, union_by_name = true) "
+            "WHERE address NOT IN (SELECT address FROM incoming) "
+            "UNION ALL BY NAME SELECT * FROM incoming) "
+            f"TO '{target.as_posix()}' (FORMAT parquet, COMPRESSION zstd)",
+            {"files": [f.as_posix() for f in existing]},
+        )
+        rows = con.execute("SELECT count(*) FROM read_parquet($target)", {"target": target.as_posix()}).fetchone()[0]
+    finally:
+        con.unregister("incoming")
+    for f in existing:
+        if f != target:
+            f.unlink()
+    return rows
+
+def read_archive(path: Path) -> pa.Table:
+    """
+    Reads a retention archive file into the export schema.
+    """
+    table = pq.read_table(path)
+    return pa.table([table[name].cast(field.type) if name in table.column_names else pa.nulls(table.num_rows, field.type)
+                     for name, field in zip(SCHEMA.names, SCHEMA)], schema=SCHEMA)
+
+def export_entries(engine=None, directory: str = ANALYTICS_DIR, archive_dir: str = RETENTION_ARCHIVE_DIR,
+                   chunk_rows: int = ANALYTICS_CHUNK_ROWS) -> dict:
+    """
+    Merges entries changed since the last export into a Parquet dataset
+    partitioned by first alert day. Only rows whose last_update_time is at or past
+    the stored watermark are read, in first-alert order so each batch touches
+    few partitions, and only the partitions they fall in are rewritten.
+    Retention archive files not seen before are merged the same way, so
+    purged entries stay in the dataset.
+
+    Returns a report with rows, archived_rows, partitions and seconds.
+    """
+    if engine is None:
+        from src.alert_service.backend.database.db import engine
+    started = time.perf_counter()
+    root = Path(directory) / TABLE
+    state = read_state(directory)
+    stamp = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}"
+    report = {"rows": 0, "archived_rows": 0, "partitions": 0}
+    con = duckdb.connect()
+
+    def merge(table: pa.Table):
+        for key, part in split_partitions(table).items():
+            merge_partition(con, root / f"{PARTITION}={key}", part, f"{stamp}-{report['partitions']:05d}")
+            report["partitions"] += 1
+
+    try:
+        if archive_dir and Path(archive_dir).is_dir():
+            for path in sorted(Path(archive_dir).glob("*.parquet")):
+                if path.name not in state["archives"]:
+                    table = read_archive(path)
+                    merge(table)
+                    report["archived_rows"] += table.num_rows
+                    state["archives"].append(path.name)
+
+        watermark = datetime.fromisoformat(state["last_update_time"]) if state["last_update_time"] else None
+        # Inclusive: last_update_time can have one-second resolution, so rows written in the watermark's
+        # second after the last run are read again; merging is idempotent per address.
+        changed = AlertEntry.last_update_time >= watermark if watermark is not None else True
+        with engine.connect() as conn, conn.begin():
+            # Upper bound read in the same snapshot, so rows written during the export wait for the next run
+            high = conn.execute(select(func.max(AlertEntry.last_update_time)).where(changed)).scalar()
+            if high is not None:
+                result = conn.execute(select(AlertEntry.__table__).where(changed, AlertEntry.last_update_time <= high)
+                                      .order_by(AlertEntry.first_alert_time))
+                while rows := result.fetchmany(chunk_rows):
+                    merge(pa.table([pa.array(values, type=field.type) for values, field in zip(zip(*rows), SCHEMA)],
+                                   schema=SCHEMA))
+                    report["rows"] += len(rows)
+                state["last_update_time"] = high.isoformat()
+    finally:
+        con.close()
+    write_state(directory, state)
+    report["seconds"] = time.perf_counter() - started
+    logger.info("Exported %d entries (%d from archives) into %d partition writes in %.2fs.",
+                report["rows"], report["archived_rows"], report["partitions"], report["seconds"])
+    return report
+
+def run_export() -> dict:
+    """
+    Scheduler job: incremental export of alert_entries.
+    """
+    return export_entries()
+
+if __name__ == "__main__":
+    from src.alert_service.backend.database.db import init_db
+    init_db()
+    print(export_entries())
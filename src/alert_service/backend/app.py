@@ -1,63 +1,213 @@
-from fastapi import FastAPI, HTTPException
-from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
+import logging
+import os
+import threading
+import time
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
 
+from src.alert_service.backend.log import SAMPLED, configure_logging
+from src.alert_service.backend.concurrency import AsyncStripedLock
 from src.alert_service.backend.database.db import init_db
-from src.alert_service.backend.alerts.alert_handler import process_alert, validate_alert
-from src.alert_service.backend.scheduler.watchlist import filter_watchlist
-from termcolor import cprint
-from src.alert_service.backend.alerts.alert_models import Alert, TokenInfo, PriceInfo
+from src.alert_service.backend.alerts.alert_handler import process_alert
+from src.alert_service.backend.alerts.codec import UnsupportedMediaType, decode_alert
+from src.alert_service.backend.alerts.dedup import alert_key, dedup_cache
+from src.alert_service.backend.alerts.recorder import recorder
+from src.alert_service.backend.push.broadcaster import broadcaster
+from src.alert_service.backend.notify.dispatcher import dispatcher
+from src.alert_service.backend.metrics import (
+    ALERT_DUPLICATES_TOTAL, ALERT_FAILURES_TOTAL, ALERTS_RECEIVED_TOTAL, render_metrics, stage_timer,
+)
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Seconds after startup before background jobs start; keeps cold start and rolling restarts light.
+SCHEDULER_START_DELAY = float(os.environ.get("SCHEDULER_START_DELAY", "5"))
 
 # Create FastAPI app instance
 app = FastAPI(title="Alert Reception API", version="1.0")
+app.state.ready = False
 
 @app.on_event("startup")
 def startup_event():
-    # Initialize the database (creates tables if they don't exist)
+    # Initialize the database (skipped when the stored schema version is current)
     init_db()
-    cprint("[INFO] Database initialized.", "green")
-    
-    # Initialize the scheduler and add the watchlist filtering job
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(filter_watchlist, 'interval', minutes=10)
+    logger.info("Database initialized.")
+
+    # Outbound notifications are delivered by their own thread (no-op unless NOTIFY_SINKS is set)
+    dispatcher.start()
+
+    # Warm-up and the scheduler are not needed to serve alerts; start them off the critical path
+    app.state.warmup = threading.Timer(SCHEDULER_START_DELAY, start_background_work)
+    app.state.warmup.daemon = True
+    app.state.warmup.start()
+
+def start_background_work():
+    from src.alert_service.backend.alerts.refresh import get_indicator_engine
+    from src.alert_service.backend.alerts.rules import get_rule_set
+    from src.alert_service.backend.scheduler.runner import create_scheduler
+
+    get_indicator_engine()
+    get_rule_set()
+    if not app.state.ready:
+        return  # shutting down
+    # Every worker schedules the configured jobs; DB leases make each run happen once
+    scheduler = create_scheduler()
     scheduler.start()
     app.state.scheduler = scheduler
-    cprint("[INFO] Scheduler started for watchlist filtering (every 10 minutes).", "green")
+    logger.info("Scheduler started with jobs: %s.", ", ".join(job.id for job in scheduler.get_jobs()))
+
+@app.on_event("startup")
+async def start_push_channel():
+    # Orders alerts per address on this loop; created here so the locks bind to the serving loop
+    app.state.address_locks = AsyncStripedLock()
+    # Flush coalesced entry deltas to connected dashboards once per window
+    broadcaster.start()
+    logger.info("Push channel started (coalescing window %.0f ms).", broadcaster.window * 1000)
+    app.state.ready = True
 
 @app.on_event("shutdown")
 def shutdown_event():
+    app.state.ready = False
+    if hasattr(app.state, "warmup"):
+        app.state.warmup.cancel()
     if hasattr(app.state, "scheduler"):
         app.state.scheduler.shutdown()
-        cprint("[INFO] Scheduler shutdown.", "yellow")
+        logger.info("Scheduler shutdown.")
+    dispatcher.stop()
+    if recorder is not None:
+        recorder.close()
+
+@app.on_event("shutdown")
+async def stop_push_channel():
+    await broadcaster.stop()
+
+@app.websocket("/ws")
+async def push_channel(websocket: WebSocket):
+    # Dashboards only listen; incoming frames are read to detect disconnects.
+    await websocket.accept()
+    broadcaster.register(websocket)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broadcaster.unregister(websocket)
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus scrape endpoint
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/healthz")
+def healthz():
+    # Liveness: the process is up and serving requests
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    # Readiness: the database is initialized and the push channel is running
+    if not app.state.ready:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return {"status": "ready"}
+
+@app.get("/scheduler")
+def scheduler_stats():
+    # Per-job runs, skips and last duration on this worker
+    from src.alert_service.backend.scheduler.runner import job_stats
+    return job_stats()
+
+@app.get("/rules")
+def rule_stats():
+    # Per-rule hits on this worker and the last bulk re-evaluation
+    from src.alert_service.backend.alerts.rules import get_rule_set
+    return get_rule_set().stats()
+
+@app.get("/analytics/{query}")
+def analytics(query: str, request: Request, threshold: float | None = None):
+    # Aggregates over the exported Parquet dataset (hit_rate, multipliers, time_to_ath)
+    from src.alert_service.backend.analytics.export import dataset_version
+    from src.alert_service.backend.analytics.queries import QUERIES
+    if query not in QUERIES:
+        raise HTTPException(status_code=404, detail=f"Unknown analytics query {query!r}; expected one of {sorted(QUERIES)}.")
+    kwargs = {"threshold": threshold} if threshold is not None and query == "hit_rate" else {}
+    # Results only change with the dataset, so a matching If-None-Match skips the query
+    etag = f'"{query}:{kwargs.get("threshold", "")}:{dataset_version()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(QUERIES[query](**kwargs), headers={"ETag": etag})
 
 @app.post("/alert", status_code=201)
-async def receive_alert(alert: Alert):
-    # If no timestamp provided, set the current time
-    if alert.timestamp is None:
-        alert.timestamp = datetime.utcnow()
-    
-    # Log the received alert with colored output
-    cprint(f"[INFO] Received alert for ticker: {alert.info.symbol}", "blue")
-    cprint(f"Details: {alert.dict()}", "blue")
-
-    # Validate the alert before processing
+async def receive_alert(request: Request):
+    # The body is decoded by the alert codec rather than FastAPI's model binding,
+    # so each request is parsed and validated exactly once.
+    body = await request.body()
+    received = time.time()
+    with stage_timer("total"):
+        idempotency_key = request.headers.get("idempotency-key")
+        alert = decode_request(body, request.headers.get("content-type"))
+        key = alert_key(alert, idempotency_key)
+        if is_duplicate(alert, key, idempotency_key):
+            return JSONResponse({"status": "duplicate", "address": alert.address}, status_code=200)
+        # Database work runs on the threadpool; alerts for one address wait their turn,
+        # alerts for other addresses do not.
+        async with app.state.address_locks.hold(alert.address):
+            applied = await run_in_threadpool(apply_alert, alert, key)
+        if not applied:
+            raise HTTPException(status_code=500, detail="Alert processing failed.")
+        # Capture accepted traffic for replays (ALERT_RECORD_PATH); only queued here
+        if recorder is not None:
+            recorder.record(alert, received)
+        # Acknowledge without echoing the payload back
+        return {"status": "success", "address": alert.address}
+
+def decode_request(body: bytes, content_type: str | None = None):
+    # Parse and validate the alert in a single pass
     try:
-        validate_alert(alert)
-    except ValueError as ve:
-        cprint(f"[ERROR] Validation failed: {ve}", "red")
-        raise HTTPException(status_code=400, detail=str(ve))
-    
+        with stage_timer("validation"):
+            return decode_alert(body, content_type)
+    except UnsupportedMediaType as e:
+        ALERT_FAILURES_TOTAL.labels("validation").inc()
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValidationError as ve:
+        ALERT_FAILURES_TOTAL.labels("validation").inc()
+        logger.warning("Rejected alert: %d validation error(s)", ve.error_count())
+        raise HTTPException(status_code=422, detail=ve.errors(include_url=False, include_context=False))
+
+def is_duplicate(alert, key, idempotency_key: str | None = None) -> bool:
+    # Upstream retries replay the same alert; acknowledge them without touching the DB
+    ALERTS_RECEIVED_TOTAL.inc()
+    if dedup_cache.seen(key):
+        ALERT_DUPLICATES_TOTAL.labels("key" if idempotency_key else "fields").inc()
+        logger.info("Skipped duplicate alert for %s", alert.address, extra=SAMPLED)
+        return True
+    return False
+
+def apply_alert(alert, key) -> bool:
+    """
+    Processes one alert; returns False if that failed, after forgetting its
+    dedup key so a retry of the same alert is processed rather than skipped.
+    """
+    # Full payloads are only serialised when DEBUG logging is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received alert for %s", alert.address, extra={"alert": alert.model_dump(mode="json")})
+
     # Process the alert (this will update the database and trigger refresh functions)
     try:
-        processed_entry = process_alert(alert)
-        cprint(f"[INFO] Processed alert for ticker: {alert.info.symbol}", "green")
-    except Exception as e:
-        cprint(f"[ERROR] Failed to process alert: {e}", "red")
-        raise HTTPException(status_code=500, detail="Alert processing failed.")
-    
-    # Return a confirmation response
-    return {"status": "success", "message": "Alert received and processed", "data": alert.dict()}
+        process_alert(alert)
+        logger.info("Processed alert for %s", alert.address, extra=SAMPLED)
+        return True
+    except Exception:
+        # Let the upstream retry go through
+        dedup_cache.discard(key)
+        ALERT_FAILURES_TOTAL.labels("processing").inc()
+        logger.exception("Failed to process alert for %s", alert.address)
+        return False
 
 if __name__ == "__main__":
     import uvicorn
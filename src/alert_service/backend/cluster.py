@@ -0,0 +1,75 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import zlib
+
+# Position of this process in a cluster started by main(); 0 of 1 for a single worker.
+WORKER_INDEX = int(os.environ.get("WORKER_INDEX", "0"))
+WORKER_COUNT = int(os.environ.get("WORKER_COUNT", "1"))
+
+def shard_for(address: str, shards: int = WORKER_COUNT) -> int:
+    """
+    Stable shard of a token address. Senders must route every alert for an
+    address to the same worker so its updates never contend across processes
+    and its replays hit the same dedup cache. The workers do not check or
+    enforce this: a mis-routed alert is still applied correctly (the entry's
+    version column retries conflicting writes), but per-address ordering and
+    duplicate detection then only hold within each worker.
+    """
+    return zlib.crc32(address.encode()) % shards
+
+def route_url(address: str, urls: list[str]) -> str:
+    """
+    Picks the worker URL responsible for `address`.
+    """
+    return urls[shard_for(address, len(urls))]
+
+def worker_urls(host: str, base_port: int, workers: int) -> list[str]:
+    return [f"http://{host}:{base_port + i}" for i in range(workers)]
+
+def start_workers(workers: int, host: str = "127.0.0.1", base_port: int = 8000, env: dict = None,
+                  log_level: str = "info") -> list[subprocess.Popen]:
+    """
+    Starts one uvicorn process per worker on consecutive ports. Workers share
+    the database and exchange push deltas through the SQLite pub/sub bus;
+    nothing else is shared between them.
+    """
+    env = dict(os.environ if env is None else env)
+    env.setdefault("PUSH_PUBSUB", "sqlite")
+    processes = []
+    for index in range(workers):
+        worker_env = dict(env, WORKER_INDEX=str(index), WORKER_COUNT=str(workers))
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.alert_service.backend.app:app",
+             "--host", host, "--port", str(base_port + index), "--log-level", log_level],
+            env=worker_env,
+        ))
+    return processes
+
+def stop_workers(processes: list[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the alert backend as several worker processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--base-port", type=int, default=8000, help="Worker i listens on base-port + i.")
+    args = parser.parse_args()
+
+    processes = start_workers(args.workers, args.host, args.base_port)
+    print(f"Started {args.workers} workers on ports {args.base_port}-{args.base_port + args.workers - 1}. "
+          f"Senders must route alerts with route_url(address, urls); the workers do not enforce it.")
+    signal.signal(signal.SIGTERM, lambda *_: stop_workers(processes))
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        stop_workers(processes)
+
+if __name__ == "__main__":
+    main()
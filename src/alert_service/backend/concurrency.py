@@ -0,0 +1,53 @@
+import asyncio
+import os
+import threading
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+
+# Locks per striped lock set. Addresses hash onto stripes, so two tokens only
+# wait for each other when they share a stripe.
+LOCK_STRIPES = int(os.environ.get("ALERT_LOCK_STRIPES", "256"))
+
+def stripe_for(key: str, stripes: int) -> int:
+    return zlib.crc32(key.encode()) % stripes
+
+class StripedLock:
+    """
+    A fixed set of thread locks indexed by key hash. Writes for one key are
+    serialised while writes for other keys proceed in parallel, with memory
+    bounded by the stripe count rather than the number of keys.
+    """
+
+    def __init__(self, stripes: int = LOCK_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def lock_for(self, key: str) -> threading.Lock:
+        return self._locks[stripe_for(key, len(self._locks))]
+
+    @contextmanager
+    def hold(self, key: str):
+        with self.lock_for(key):
+            yield
+
+class AsyncStripedLock:
+    """
+    The asyncio counterpart of StripedLock, for ordering work per key on the
+    event loop without tying up worker threads while waiting.
+
+    asyncio locks belong to the loop they are first used on; create one per
+    application startup rather than at import time.
+    """
+
+    def __init__(self, stripes: int = LOCK_STRIPES):
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+
+    def lock_for(self, key: str) -> asyncio.Lock:
+        return self._locks[stripe_for(key, len(self._locks))]
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        async with self.lock_for(key):
+            yield
+
+# Serialises read-modify-write cycles on one AlertEntry within a process.
+address_locks = StripedLock()
@@ -1,14 +1,74 @@
-from sqlalchemy import create_engine
+import fcntl
+import logging
+import os
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from .models import Base
-from termcolor import cprint
+from .migrations import SCHEMA_VERSION, add_missing_columns, migrate_compact_schema
 
-DATABASE_URL = "sqlite:////Users/bosungkim/bosungkim/src/github/shared/data/alerts.db"  # SQLite database file
+logger = logging.getLogger(__name__)
+
+# SQLite database file; override via the DATABASE_URL environment variable.
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:////Users/bosungkim/bosungkim/src/github/shared/data/alerts.db")
+
+# How long a writer waits for another process's write lock before failing.
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
 # The connect_args are needed for SQLite
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    # WAL lets readers proceed during writes, which matters once several worker processes share the file.
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    # Only takes effect on a new file (before its first table): free pages can then be returned
+    # with incremental vacuum, never needing a blocking full VACUUM (see scheduler/retention.py).
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    if not DATABASE_URL.endswith(":memory:"):
+        cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
-    cprint("DB initialization successful!", "green")
+def schema_version() -> int:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+@contextmanager
+def schema_lock():
+    """
+    Serialises schema work between worker processes starting at the same time,
+    using an exclusive lock on a file next to the SQLite database.
+    """
+    path = engine.url.database
+    if not path or path == ":memory:":
+        yield
+        return
+    with open(f"{path}.init.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def init_db() -> bool:
+    """
+    Creates and migrates the schema unless the database already records the
+    current SCHEMA_VERSION, in which case startup skips the inspection work.
+    Returns True if the schema was checked.
+    """
+    if schema_version() == SCHEMA_VERSION:
+        logger.info("DB schema version %d is current.", SCHEMA_VERSION)
+        return False
+    with schema_lock():
+        # Another worker may have finished the upgrade while we waited for the lock.
+        if schema_version() == SCHEMA_VERSION:
+            return False
+        Base.metadata.create_all(bind=engine)
+        migrate_compact_schema(engine)
+        add_missing_columns(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    logger.info("DB initialization successful (schema version %d).", SCHEMA_VERSION)
+    return True
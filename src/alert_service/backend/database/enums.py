@@ -0,0 +1,64 @@
+from enum import IntEnum, IntFlag
+
+class CodedEnum(IntEnum):
+    """
+    Small-integer enum stored in the database. Each member maps to the display
+    label used by the data providers and the dashboard (ABOVE_SIGNAL <-> "Above Signal").
+    """
+
+    @property
+    def label(self) -> str:
+        return self.name.replace("_", " ").title()
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Converts a label, code or member to a member; None stays None.
+        """
+        if value is None or isinstance(value, cls):
+            return value
+        if isinstance(value, int):
+            return cls(value)
+        return cls[str(value).strip().upper().replace(" ", "_")]
+
+class Sentiment(CodedEnum):
+    POSITIVE = 1
+    NEUTRAL = 2
+    NEGATIVE = 3
+
+class RugCheck(CodedEnum):
+    SAFE = 1
+    WARNING = 2
+    CRITICAL = 3
+
+class MacdSignal(CodedEnum):
+    ABOVE_SIGNAL = 1
+    BELOW_SIGNAL = 2
+
+class Channel(IntFlag):
+    """
+    Bits of AlertEntry.channel_flags. Names match the legacy channel_* columns.
+    """
+    HighConviction = 1
+    EarlyAlpha = 2
+    FiveXSMWallet = 4
+    SmartFollowers = 8
+    KimchiTest = 16
+
+# Legacy Boolean column name -> channel bit.
+CHANNEL_COLUMNS = {
+    "channel_HighConviction": Channel.HighConviction,
+    "channel_EarlyAlpha": Channel.EarlyAlpha,
+    "channel_5xSMWallet": Channel.FiveXSMWallet,
+    "channel_SmartFollowers": Channel.SmartFollowers,
+    "channel_KimchiTest": Channel.KimchiTest,
+}
+
+# Legacy string column name -> (compact code column, enum).
+CODED_COLUMNS = {
+    "twitter_sentiment": ("twitter_sentiment_code", Sentiment),
+    "rug_bundle_check": ("rug_bundle_check_code", RugCheck),
+    "macd_line": ("macd_line_code", MacdSignal),
+    "macd_short": ("macd_short_code", MacdSignal),
+    "macd_long": ("macd_long_code", MacdSignal),
+}
@@ -0,0 +1,140 @@
+import logging
+from sqlalchemy import inspect, text
+from .enums import CHANNEL_COLUMNS, CODED_COLUMNS
+from .models import AlertEntry
+
+logger = logging.getLogger(__name__)
+
+# Stored in PRAGMA user_version once init_db has brought a database up to date.
+# Bump it whenever the models or migrations change so existing files are rechecked.
+SCHEMA_VERSION = 5
+
+# The alert_entries table before categorical fields and channel flags were
+# compacted. Kept for the migration test and the storage benchmark.
+LEGACY_ALERT_ENTRIES_DDL = """
+CREATE TABLE alert_entries (
+    address VARCHAR NOT NULL PRIMARY KEY,
+    symbol VARCHAR NOT NULL,
+    first_alert_price FLOAT NOT NULL,
+    current_price FLOAT NOT NULL,
+    ath_multiplier FLOAT,
+    token_age FLOAT,
+    first_alert_time DATETIME,
+    alert_count INTEGER NOT NULL,
+    last_alert_time DATETIME,
+    last_update_time DATETIME,
+    dexscreener_link VARCHAR,
+    twitter_sentiment VARCHAR,
+    rug_bundle_check VARCHAR,
+    macd_line VARCHAR,
+    macd_short VARCHAR,
+    macd_long VARCHAR,
+    volume_5min FLOAT,
+    volume_1hr FLOAT,
+    active_watchlist BOOLEAN NOT NULL,
+    sm_buy_count INTEGER,
+    summary VARCHAR,
+    twitter VARCHAR,
+    website VARCHAR,
+    channel_HighConviction BOOLEAN NOT NULL,
+    channel_EarlyAlpha BOOLEAN NOT NULL,
+    channel_5xSMWallet BOOLEAN NOT NULL,
+    channel_SmartFollowers BOOLEAN NOT NULL,
+    channel_KimchiTest BOOLEAN NOT NULL
+)
+"""
+
+def needs_compact_migration(engine) -> bool:
+    """
+    True if alert_entries still has the legacy string/Boolean columns.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(AlertEntry.__tablename__):
+        return False
+    columns = {column["name"] for column in inspector.get_columns(AlertEntry.__tablename__)}
+    return "channel_flags" not in columns
+
+def _code_case(column, enum_cls):
+    whens = " ".join(f"WHEN '{member.label}' THEN {int(member)}" for member in enum_cls)
+    return f"CASE {column} {whens} ELSE NULL END"
+
+def migrate_compact_schema(engine) -> int:
+    """
+    Rebuilds a legacy alert_entries table with the compact schema: categorical
+    strings become small-integer codes and the channel_* Booleans are folded
+    into channel_flags. SQLite cannot change column types in place, so the
+    table is recreated and the rows copied with one INSERT ... SELECT inside
+    a single transaction.
+
+    Returns the number of migrated rows (0 if nothing had to be done).
+    """
+    if not needs_compact_migration(engine):
+        return 0
+    table = AlertEntry.__tablename__
+    legacy = f"{table}_legacy"
+    with engine.begin() as conn:
+        legacy_columns = [column["name"] for column in inspect(conn).get_columns(table)]
+        conn.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+        # Index names are not renamed with the table; drop them so the new table can reuse them.
+        index_names = conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t AND sql IS NOT NULL"
+        ), {"t": legacy}).scalars().all()
+        for index_name in index_names:
+            conn.execute(text(f'DROP INDEX "{index_name}"'))
+        AlertEntry.__table__.create(conn)
+
+        targets, sources = [], []
+        new_columns = set(AlertEntry.__table__.columns.keys())
+        for column in legacy_columns:
+            if column in new_columns:
+                targets.append(column)
+                sources.append(f'"{column}"')
+        for legacy_column, (code_column, enum_cls) in CODED_COLUMNS.items():
+            if legacy_column in legacy_columns:
+                targets.append(code_column)
+                sources.append(_code_case(f'"{legacy_column}"', enum_cls))
+        flags = [f'(CASE WHEN "{c}" THEN {int(bit)} ELSE 0 END)' for c, bit in CHANNEL_COLUMNS.items() if c in legacy_columns]
+        targets.append("channel_flags")
+        sources.append(" | ".join(flags) if flags else "0")
+
+        result = conn.execute(text(
+            f"INSERT INTO {table} ({', '.join(targets)}) SELECT {', '.join(sources)} FROM {legacy}"
+        ))
+        conn.execute(text(f"DROP TABLE {legacy}"))
+    logger.info("Migrated %d alert entries to the compact schema.", result.rowcount)
+    return result.rowcount
+
+def add_missing_columns(engine) -> list[str]:
+    """
+    Adds columns that exist on AlertEntry but not yet in the table.
+    create_all never alters existing tables, so new columns that are
+    nullable or have a server default are added here with ALTER TABLE ...
+    ADD COLUMN.
+
+    Returns the names of the added columns.
+    """
+    table = AlertEntry.__tablename__
+    inspector = inspect(engine)
+    if not inspector.has_table(table):
+        return []
+    existing = {column["name"] for column in inspector.get_columns(table)}
+    added = []
+    with engine.begin() as conn:
+        for column in AlertEntry.__table__.columns:
+            if column.name in existing or not (column.nullable or column.server_default is not None):
+                continue
+            ddl = f'ALTER TABLE {table} ADD COLUMN "{column.name}" {column.type.compile(dialect=engine.dialect)}'
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            conn.execute(text(ddl))
+            added.append(column.name)
+    if added:
+        logger.info("Added columns to %s: %s", table, ", ".join(added))
+    return added
+
+if __name__ == "__main__":
+    from .db import engine
+    print(f"Migrated {migrate_compact_schema(engine)} rows.")
+    print(f"Added columns: {add_missing_columns(engine) or 'none'}")
@@ -1,8 +1,44 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, Boolean, DateTime, func
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
+from .enums import CHANNEL_COLUMNS, CODED_COLUMNS
 
 Base = declarative_base()
 
+def _coded_property(code_column, enum_cls):
+    """
+    Compatibility accessor exposing a small-integer code column under its legacy
+    string name: reads return the label, writes accept a label, code or member.
+    """
+    def getter(self):
+        code = getattr(self, code_column)
+        return enum_cls(code).label if code is not None else None
+
+    def setter(self, value):
+        member = enum_cls.coerce(value)
+        setattr(self, code_column, int(member) if member is not None else None)
+
+    def expression(cls):
+        return getattr(cls, code_column)
+
+    return hybrid_property(getter, setter, expr=expression)
+
+def _channel_property(flag):
+    """
+    Compatibility accessor exposing one bit of channel_flags as a Boolean.
+    """
+    def getter(self):
+        return bool((self.channel_flags or 0) & flag)
+
+    def setter(self, value):
+        flags = self.channel_flags or 0
+        self.channel_flags = flags | flag if value else flags & ~flag
+
+    def expression(cls):
+        return cls.channel_flags.op("&")(int(flag)) != 0
+
+    return hybrid_property(getter, setter, expr=expression)
+
 class AlertEntry(Base):
     __tablename__ = "alert_entries"
     
@@ -11,17 +47,20 @@ class AlertEntry(Base):
     first_alert_price = Column(Float, nullable=False)
     current_price = Column(Float, nullable=False)
     ath_multiplier = Column(Float, nullable=True) # ATH multiplier from first alert price
-    token_age = Column(Float, nullable=True)
+    ath_time = Column(DateTime, nullable=True) # When ath_multiplier was last raised; None while the first alert is the ATH
+    curr_multiplier = Column(Float, nullable=True) # Current price over first alert price
+    token_age = Column(Float, nullable=True) # Seconds since the first alert
     first_alert_time = Column(DateTime, default=func.now())
     alert_count = Column(Integer, nullable=False)
     last_alert_time = Column(DateTime, default=func.now())
     last_update_time = Column(DateTime, default=func.now(), onupdate=func.now())
     dexscreener_link = Column(String, nullable=True)
-    twitter_sentiment = Column(String, nullable=True)
-    rug_bundle_check = Column(String, nullable=True)
-    macd_line = Column(String, nullable=True)
-    macd_short = Column(String, nullable=True)
-    macd_long = Column(String, nullable=True)
+    # Categorical fields are stored as small-integer codes (see enums.py)
+    twitter_sentiment_code = Column(SmallInteger, nullable=True)
+    rug_bundle_check_code = Column(SmallInteger, nullable=True)
+    macd_line_code = Column(SmallInteger, nullable=True)
+    macd_short_code = Column(SmallInteger, nullable=True)
+    macd_long_code = Column(SmallInteger, nullable=True)
     volume_5min = Column(Float, nullable=True)
     volume_1hr = Column(Float, nullable=True)
     active_watchlist = Column(Boolean, default=True, nullable=False)
@@ -29,8 +68,37 @@ class AlertEntry(Base):
     summary = Column(String, nullable=True)
     twitter = Column(String, nullable=True)
     website = Column(String, nullable=True)
-    channel_HighConviction = Column(Boolean, default=False, nullable=False)
-    channel_EarlyAlpha = Column(Boolean, default=False, nullable=False)
-    channel_5xSMWallet = Column(Boolean, default=False, nullable=False)
-    channel_SmartFollowers = Column(Boolean, default=False, nullable=False)
-    channel_KimchiTest = Column(Boolean, default=False, nullable=False)
+    # Channel membership bitmask (see enums.Channel)
+    channel_flags = Column(Integer, default=0, nullable=False)
+    # Row version for optimistic concurrency: every ORM UPDATE checks and bumps it,
+    # so a write based on a stale read fails with StaleDataError instead of
+    # silently overwriting another process's change.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    # Legacy accessors so existing readers keep working
+    twitter_sentiment = _coded_property(*CODED_COLUMNS["twitter_sentiment"])
+    rug_bundle_check = _coded_property(*CODED_COLUMNS["rug_bundle_check"])
+    macd_line = _coded_property(*CODED_COLUMNS["macd_line"])
+    macd_short = _coded_property(*CODED_COLUMNS["macd_short"])
+    macd_long = _coded_property(*CODED_COLUMNS["macd_long"])
+    channel_HighConviction = _channel_property(CHANNEL_COLUMNS["channel_HighConviction"])
+    channel_EarlyAlpha = _channel_property(CHANNEL_COLUMNS["channel_EarlyAlpha"])
+    channel_5xSMWallet = _channel_property(CHANNEL_COLUMNS["channel_5xSMWallet"])
+    channel_SmartFollowers = _channel_property(CHANNEL_COLUMNS["channel_SmartFollowers"])
+    channel_KimchiTest = _channel_property(CHANNEL_COLUMNS["channel_KimchiTest"])
+
+class JobLease(Base):
+    """
+    Cross-process claim on scheduled job runs (see scheduler/runner.py).
+    Times are epoch seconds.
+    """
+    __tablename__ = "job_leases"
+
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=True)
+    running_until = Column(Float, nullable=True) # Lease expiry while a run is in progress
+    last_started = Column(Float, nullable=True)
+    last_finished = Column(Float, nullable=True)
+    last_duration = Column(Float, nullable=True)
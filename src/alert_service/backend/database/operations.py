@@ -1,7 +1,9 @@
+import logging
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 from .models import AlertEntry
-from termcolor import cprint
+
+logger = logging.getLogger(__name__)
 
 def get_entry_by_symbol(db: Session, symbol: str) -> AlertEntry:
     """
@@ -9,45 +11,83 @@ def get_entry_by_symbol(db: Session, symbol: str) -> AlertEntry:
     """
     return db.query(AlertEntry).filter(AlertEntry.symbol == symbol).first()
 
+def get_entry_by_address(db: Session, address: str) -> AlertEntry:
+    """
+    Returns the entry for a given token address, or None if not found.
+    """
+    return db.get(AlertEntry, address)
+
 def add_new_entry(db: Session, symbol: str, price: float, alert_count: int, 
-                  address: str) -> AlertEntry:
+                  address: str, commit: bool = True) -> AlertEntry:
     """
-    Creates a new AlertEntry in the database.
+    Creates a new AlertEntry in the database. With commit=False the entry is
+    only added to the session, for callers that commit several changes at once.
     """
     new_entry = AlertEntry(
+        address=address,
         symbol=symbol,
-        price=price,
+        first_alert_price=price,
+        current_price=price,
         dexscreener_link=f'https://dexscreener.com/solana/{address}',
         first_alert_time=datetime.now(timezone.utc),
         last_alert_time=datetime.now(timezone.utc),
         last_update_time=datetime.now(timezone.utc),
         alert_count=alert_count,
-        active=True  # Default to active
+        active_watchlist=True  # Default to active
     )
     db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
+    if commit:
+        db.commit()
+        db.refresh(new_entry)
     return new_entry
 
-def update_entry(db: Session, entry: AlertEntry, price: float, alert_count: int) -> AlertEntry:
+def update_entry(db: Session, entry: AlertEntry, price: float, alert_count: int, commit: bool = True) -> AlertEntry:
     """
-    Updates an existing AlertEntry with a new alert. Increments the alert count and updates price and sm_buy_count.
+    Updates an existing AlertEntry with a new alert. Updates the alert count and current price.
     """
-    entry.price = price
+    entry.current_price = price
     entry.alert_count = alert_count
     entry.last_alert_time = datetime.now(timezone.utc)
     entry.last_update_time = datetime.now(timezone.utc)
     # Optionally update other fields if necessary
-    db.commit()
-    db.refresh(entry)
+    if commit:
+        db.commit()
+        db.refresh(entry)
     return entry
 
-def cleanup_old_entries(db: Session, older_than_days: int = 7):
+def select_expired_addresses(db: Session, cutoff: datetime, limit: int) -> list[str]:
     """
-    Deletes entries older than a specified number of days.
+    Returns up to `limit` addresses whose first alert is older than `cutoff`, oldest first.
     """
-    cutoff_time = datetime.now(timezone.utc) - timedelta(days=older_than_days)
-    deleted = db.query(AlertEntry).filter(AlertEntry.first_alert_time < cutoff_time).delete()
+    rows = (
+        db.query(AlertEntry.address)
+        .filter(AlertEntry.first_alert_time < cutoff)
+        .order_by(AlertEntry.first_alert_time)
+        .limit(limit)
+        .all()
+    )
+    return [address for (address,) in rows]
+
+def delete_entries(db: Session, addresses: list[str]) -> int:
+    """
+    Deletes the entries for the given addresses and commits.
+    """
+    deleted = db.query(AlertEntry).filter(AlertEntry.address.in_(addresses)).delete(synchronize_session=False)
     db.commit()
-    cprint(f"Deleted {deleted} entries older than {older_than_days} days.", "yellow")
-    return deleted
\ No newline at end of file
+    return deleted
+
+def cleanup_old_entries(db: Session, older_than_days: int = 7, chunk_size: int = 500):
+    """
+    Deletes entries older than a specified number of days, `chunk_size` rows
+    per transaction so writers are never locked out for long.
+    """
+    cutoff_time = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    deleted = 0
+    while True:
+        addresses = select_expired_addresses(db, cutoff_time, chunk_size)
+        if not addresses:
+            break
+        deleted += delete_entries(db, addresses)
+    db.expire_all()
+    logger.info("Deleted %d entries older than %d days.", deleted, older_than_days)
+    return deleted
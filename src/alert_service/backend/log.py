@@ -0,0 +1,157 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+# Logging settings; override via environment variables.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# "json" writes JSON lines; "console" is the colourised dev output.
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+# JSON lines destination; stderr when unset.
+LOG_FILE = os.environ.get("LOG_FILE")
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+# Records logged with extra=SAMPLED are limited to this many per second per message.
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "5"))
+
+# Loggers under this namespace are routed through the queue handler.
+PACKAGE_LOGGER = __name__.rsplit(".backend", 1)[0]
+
+# Pass as `extra=` on high-rate messages to subject them to sampling.
+SAMPLED = {"sampled": True}
+
+# LogRecord attributes that are not user-supplied structured fields.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line. Fields passed through
+    `extra=` are included as top-level keys.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class ConsoleFormatter(logging.Formatter):
+    """
+    Colourised single-line output for local development.
+    """
+
+    COLOURS = {"DEBUG": "blue", "INFO": "green", "WARNING": "yellow", "ERROR": "red", "CRITICAL": "red"}
+
+    def __init__(self):
+        super().__init__("[%(levelname)s] %(message)s")
+
+    def format(self, record):
+        from termcolor import colored
+        return colored(super().format(record), self.COLOURS.get(record.levelname))
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits records flagged with extra=SAMPLED to `per_second` records per
+    message template. The number of suppressed records is attached to the next
+    record that gets through as `suppressed`.
+    """
+
+    def __init__(self, per_second: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.per_second = per_second
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, "sampled", False):
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._buckets.get(key, (self.per_second, now, 0))
+            tokens = min(self.per_second, tokens + (now - last) * self.per_second)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[key] = (tokens - 1, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background listener without formatting them and
+    without ever blocking the caller. Records are dropped (and counted) when
+    the queue is full.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener = None
+_queue_handler = None
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, path: str | None = LOG_FILE):
+    """
+    Routes the package's loggers through a bounded queue to a background
+    thread that writes JSON lines (or colourised console output when
+    fmt="console"). Safe to call more than once; later calls reconfigure.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    if path:
+        sink = logging.FileHandler(path)
+    else:
+        sink = logging.StreamHandler(sys.stderr)
+    sink.setFormatter(ConsoleFormatter() if fmt == "console" else JsonFormatter())
+
+    _queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(SamplingFilter())
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, sink, respect_handler_level=True)
+    _listener.start()
+
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    logger.handlers = [_queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+def shutdown_logging():
+    """
+    Flushes queued records and stops the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,186 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from src.alert_service.backend.database.db import engine
+
+# Latency buckets in seconds, from sub-millisecond lookups to slow provider calls.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+ALERT_STAGE_SECONDS = Histogram(
+    "alert_stage_seconds",
+    "Time spent in each alert ingestion stage (validation, db_lookup, db_write, derived, refresh, rules, total).",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+ALERT_ENTRIES_TOTAL = Counter(
+    "alert_entries_total",
+    "Processed alerts by outcome (new or updated entry).",
+    ["outcome"],
+)
+ALERT_FAILURES_TOTAL = Counter(
+    "alert_failures_total",
+    "Rejected or failed alerts by reason.",
+    ["reason"],
+)
+ALERTS_RECEIVED_TOTAL = Counter(
+    "alerts_received_total",
+    "Alerts that passed validation, including duplicates.",
+)
+ALERT_DUPLICATES_TOTAL = Counter(
+    "alert_duplicates_total",
+    "Replayed alerts short-circuited by the dedup window, by how they were matched (key or fields).",
+    ["match"],
+)
+ALERT_WRITE_CONFLICTS_TOTAL = Counter(
+    "alert_write_conflicts_total",
+    "Alert writes retried because another process updated the entry first (version check) or inserted it concurrently.",
+)
+DEDUP_CACHE_ENTRIES = Gauge(
+    "dedup_cache_entries",
+    "Alert keys currently held in the dedup window.",
+)
+SCHEDULER_JOB_SECONDS = Histogram(
+    "scheduler_job_seconds",
+    "Duration of scheduled background jobs.",
+    ["job"],
+    buckets=LATENCY_BUCKETS + (10.0, 30.0, 60.0),
+)
+SCHEDULER_JOB_FAILURES_TOTAL = Counter(
+    "scheduler_job_failures_total",
+    "Scheduled job runs that raised an exception.",
+    ["job"],
+)
+SCHEDULER_JOB_SKIPPED_TOTAL = Counter(
+    "scheduler_job_skipped_total",
+    "Scheduled runs not executed on this worker, by reason (lease: another worker ran it, "
+    "overlap: previous run still going, missed: fired too late).",
+    ["job", "reason"],
+)
+SCHEDULER_JOB_RUNNING = Gauge(
+    "scheduler_job_running",
+    "Runs of each job currently in progress on this worker.",
+    ["job"],
+)
+RETENTION_ROWS_REMOVED_TOTAL = Counter(
+    "retention_rows_removed_total",
+    "Expired alert entries deleted by the retention job.",
+)
+RETENTION_BYTES_RECLAIMED_TOTAL = Counter(
+    "retention_bytes_reclaimed_total",
+    "Bytes returned to the filesystem by vacuuming.",
+)
+RULE_HITS_TOTAL = Counter(
+    "rule_hits_total",
+    "Entries matched by each routing rule, by evaluation mode (entry: per alert, bulk: re-evaluation job).",
+    ["rule", "mode"],
+)
+RULE_EVALUATION_SECONDS = Histogram(
+    "rule_evaluation_seconds",
+    "Duration of bulk rule re-evaluation over all entries (per-alert evaluation is the 'rules' stage).",
+    buckets=LATENCY_BUCKETS + (10.0, 30.0),
+)
+NOTIFY_SENT_TOTAL = Counter(
+    "notify_sent_total",
+    "Notification messages delivered, by sink and kind (single or digest).",
+    ["sink", "kind"],
+)
+NOTIFY_FAILURES_TOTAL = Counter(
+    "notify_failures_total",
+    "Notification sends that failed and were queued for retry.",
+    ["sink"],
+)
+NOTIFY_DROPPED_TOTAL = Counter(
+    "notify_dropped_total",
+    "Notification events dropped, by sink and reason (queue_full: dispatcher backlog, max_attempts: retries exhausted).",
+    ["sink", "reason"],
+)
+NOTIFY_DELIVERY_SECONDS = Histogram(
+    "notify_delivery_seconds",
+    "Time from an alert event to its delivery, per sink (including rate-limit waits and retries).",
+    ["sink"],
+    buckets=LATENCY_BUCKETS + (10.0, 30.0, 60.0, 300.0),
+)
+NOTIFY_RETRY_QUEUE = Gauge(
+    "notify_retry_queue",
+    "Notification messages waiting in the retry queue.",
+)
+PUSH_CLIENTS = Gauge(
+    "push_clients",
+    "Dashboards currently connected to the push channel.",
+)
+PUSH_FRAMES_TOTAL = Counter(
+    "push_frames_total",
+    "Batch frames broadcast on the push channel.",
+)
+PUSH_DELTAS_TOTAL = Counter(
+    "push_deltas_total",
+    "Entry deltas broadcast on the push channel (after coalescing).",
+)
+PUSH_FANOUT = Histogram(
+    "push_broadcast_fanout",
+    "Number of clients each push frame was sent to.",
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250),
+)
+PUSH_SEND_FAILURES_TOTAL = Counter(
+    "push_send_failures_total",
+    "Push sends that failed and dropped the client.",
+)
+
+class DBPoolCollector:
+    """
+    Reports SQLAlchemy connection pool statistics at scrape time.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        for name, attr, doc in (
+            ("db_pool_size", "size", "Configured connection pool size."),
+            ("db_pool_checked_out", "checkedout", "Connections currently checked out."),
+            ("db_pool_checked_in", "checkedin", "Idle connections in the pool."),
+            ("db_pool_overflow", "overflow", "Connections opened beyond the pool size."),
+        ):
+            method = getattr(pool, attr, None)
+            if method is not None:
+                yield GaugeMetricFamily(name, doc, value=method())
+
+REGISTRY.register(DBPoolCollector(engine))
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Records the duration of the enclosed block under alert_stage_seconds{stage}.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ALERT_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+def timed_job(name: str, func):
+    """
+    Wraps a scheduler job so its duration and failures are recorded.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            SCHEDULER_JOB_FAILURES_TOTAL.labels(name).inc()
+            raise
+        finally:
+            SCHEDULER_JOB_SECONDS.labels(name).observe(time.perf_counter() - start)
+    return wrapper
+
+def render_metrics():
+    """
+    Returns (body, content_type) for the /metrics endpoint.
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,277 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from src.alert_service.backend.cluster import WORKER_COUNT
+from src.alert_service.backend.metrics import (
+    NOTIFY_DELIVERY_SECONDS, NOTIFY_DROPPED_TOTAL, NOTIFY_FAILURES_TOTAL, NOTIFY_RETRY_QUEUE, NOTIFY_SENT_TOTAL,
+)
+from src.alert_service.backend.notify.sinks import parse_sinks
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated sinks, e.g. "file:notifications.jsonl,webhook:https://hooks.example/alerts".
+# Empty disables notifications.
+NOTIFY_SINKS = os.environ.get("NOTIFY_SINKS", "")
+# Per-sink token bucket: sustained messages per minute and burst size, for the whole
+# cluster; each of WORKER_COUNT workers gets an equal share.
+NOTIFY_RATE_PER_MIN = float(os.environ.get("NOTIFY_RATE_PER_MIN", "30"))
+NOTIFY_BURST = int(os.environ.get("NOTIFY_BURST", "10"))
+# How often the dispatcher thread delivers.
+NOTIFY_INTERVAL_MS = int(os.environ.get("NOTIFY_INTERVAL_MS", "500"))
+# Events waiting for delivery; beyond this, new events are dropped rather than blocking ingestion.
+NOTIFY_QUEUE_SIZE = int(os.environ.get("NOTIFY_QUEUE_SIZE", "10000"))
+# Failed messages are kept here and retried with exponential backoff. Workers share the
+# file; a worker claims due rows before resending them.
+NOTIFY_RETRY_PATH = os.environ.get("NOTIFY_RETRY_PATH", "notify_retry.db")
+# Seconds a claimed retry stays hidden from other workers; a worker that dies mid-send
+# leaves its rows to be claimed again after this.
+NOTIFY_CLAIM_S = float(os.environ.get("NOTIFY_CLAIM_S", "60"))
+NOTIFY_MAX_ATTEMPTS = int(os.environ.get("NOTIFY_MAX_ATTEMPTS", "8"))
+NOTIFY_BACKOFF_S = float(os.environ.get("NOTIFY_BACKOFF_S", "2"))
+NOTIFY_BACKOFF_MAX_S = float(os.environ.get("NOTIFY_BACKOFF_MAX_S", "600"))
+
+class TokenBucket:
+    """
+    Allows `burst` messages at once, refilled at `rate` messages per second.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float = None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic() if now is None else now
+
+    def available(self, now: float) -> int:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def take(self, now: float) -> bool:
+        if self.available(now) < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+def message_events(message: dict) -> list:
+    return message["events"] if message.get("type") == "digest" else [message]
+
+class RetryQueue:
+    """
+    Failed messages per sink in a local SQLite file, so they survive restarts.
+    The file may be shared by several workers: due() claims the rows it
+    returns, so each retry is resent by one worker only.
+    """
+
+    def __init__(self, path: str = NOTIFY_RETRY_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS notify_retry (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "sink TEXT NOT NULL, payload TEXT NOT NULL, attempts INTEGER NOT NULL, next_attempt REAL NOT NULL)"
+            )
+
+    def add(self, sink: str, message: dict, attempts: int, next_attempt: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO notify_retry (sink, payload, attempts, next_attempt) VALUES (?, ?, ?, ?)",
+                (sink, json.dumps(message), attempts, next_attempt),
+            )
+
+    def due(self, sink: str, now: float, limit: int, claim: float = NOTIFY_CLAIM_S) -> list:
+        """
+        Claims up to `limit` due messages for `sink` by pushing their
+        next_attempt `claim` seconds ahead in one statement, and returns them
+        oldest first. The caller then removes or reschedules each one.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE notify_retry SET next_attempt = ? WHERE id IN (SELECT id FROM notify_retry "
+                "WHERE sink = ? AND next_attempt <= ? ORDER BY id LIMIT ?) RETURNING id, payload, attempts",
+                (now + claim, sink, now, limit),
+            ).fetchall()
+        return [(row_id, json.loads(payload), attempts) for row_id, payload, attempts in sorted(rows)]
+
+    def reschedule(self, row_id: int, attempts: int, next_attempt: float):
+        with self._lock:
+            self._conn.execute("UPDATE notify_retry SET attempts = ?, next_attempt = ? WHERE id = ?",
+                               (attempts, next_attempt, row_id))
+
+    def remove(self, row_id: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM notify_retry WHERE id = ?", (row_id,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notify_retry").fetchone()[0]
+
+class NotificationDispatcher:
+    """
+    Delivers alert events to the configured sinks off the ingestion path.
+
+    notify() only enqueues. A background thread hands every event to every
+    sink, each behind its own token bucket: while the bucket covers the
+    pending events they go out one by one; when they outnumber the tokens
+    (a burst) they are merged into a single "digest" message. Failed sends
+    go to the retry queue and are retried with exponential backoff until
+    NOTIFY_MAX_ATTEMPTS, after which they are dropped and counted.
+    """
+
+    def __init__(self, sinks: list, rate_per_min: float = NOTIFY_RATE_PER_MIN, burst: int = NOTIFY_BURST,
+                 interval_ms: int = NOTIFY_INTERVAL_MS, queue_size: int = NOTIFY_QUEUE_SIZE,
+                 retry_path: str = NOTIFY_RETRY_PATH, max_attempts: int = NOTIFY_MAX_ATTEMPTS,
+                 backoff: float = NOTIFY_BACKOFF_S, backoff_max: float = NOTIFY_BACKOFF_MAX_S,
+                 clock=time.monotonic):
+        self.sinks = list(sinks)
+        self.interval = interval_ms / 1000
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self._inbox = queue.Queue(maxsize=queue_size)
+        self._pending = {sink.name: deque() for sink in self.sinks}
+        self._buckets = {sink.name: TokenBucket(rate_per_min / 60, burst, clock()) for sink in self.sinks}
+        self._retries = RetryQueue(retry_path) if self.sinks else None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def notify(self, event: dict):
+        """
+        Queues an event for every sink without blocking. The event gets a
+        "created" epoch timestamp used for delivery latency.
+        """
+        if not self.sinks:
+            return
+        event.setdefault("created", time.time())
+        try:
+            self._inbox.put_nowait(event)
+        except queue.Full:
+            NOTIFY_DROPPED_TOTAL.labels("all", "queue_full").inc()
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.backoff * 2 ** (attempts - 1), self.backoff_max)
+
+    def _send(self, sink, message: dict) -> bool:
+        try:
+            sink.send(message)
+        except Exception as e:
+            NOTIFY_FAILURES_TOTAL.labels(sink.name).inc()
+            logger.warning("Notification to %s failed: %s", sink.name, e)
+            return False
+        NOTIFY_SENT_TOTAL.labels(sink.name, "digest" if message.get("type") == "digest" else "single").inc()
+        delivered = time.time()
+        for event in message_events(message):
+            NOTIFY_DELIVERY_SECONDS.labels(sink.name).observe(max(delivered - event["created"], 0.0))
+        return True
+
+    def _retry_due(self, sink, now: float):
+        bucket = self._buckets[sink.name]
+        for row_id, message, attempts in self._retries.due(sink.name, time.time(), bucket.available(now)):
+            if not bucket.take(now):
+                # Release the claim so the row is retried on the next round
+                self._retries.reschedule(row_id, attempts, time.time())
+                continue
+            if self._send(sink, message):
+                self._retries.remove(row_id)
+            elif attempts + 1 >= self.max_attempts:
+                self._retries.remove(row_id)
+                NOTIFY_DROPPED_TOTAL.labels(sink.name, "max_attempts").inc(len(message_events(message)))
+            else:
+                self._retries.reschedule(row_id, attempts + 1, time.time() + self._backoff(attempts + 1))
+
+    def _deliver_pending(self, sink, now: float):
+        pending = self._pending[sink.name]
+        if not pending:
+            return
+        bucket = self._buckets[sink.name]
+        available = bucket.available(now)
+        if len(pending) <= available:
+            messages = list(pending)
+        elif available >= 1:
+            messages = [{"type": "digest", "count": len(pending), "events": list(pending)}]
+        else:
+            return  # rate limited; events wait for the next token
+        pending.clear()
+        for message in messages:
+            bucket.take(now)
+            if not self._send(sink, message):
+                self._retries.add(sink.name, message, 1, time.time() + self._backoff(1))
+
+    def run_once(self) -> None:
+        """
+        One delivery round: hand queued events to the sinks, resend due
+        retries, then deliver what the rate limits allow.
+        """
+        while True:
+            try:
+                event = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            for pending in self._pending.values():
+                pending.append(event)
+        now = self.clock()
+        for sink in self.sinks:
+            self._retry_due(sink, now)
+            self._deliver_pending(sink, now)
+        if self._retries is not None:
+            NOTIFY_RETRY_QUEUE.set(len(self._retries))
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Notification dispatch failed")
+
+    def start(self):
+        if self.sinks and self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="notify", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the thread after a last delivery round. Events still held back
+        by rate limits are moved to the retry queue so a restart sends them.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        self.run_once()
+        for sink in self.sinks:
+            pending = self._pending[sink.name]
+            if pending:
+                self._retries.add(sink.name, {"type": "digest", "count": len(pending), "events": list(pending)}, 0, time.time())
+                pending.clear()
+
+def alert_event(entry, created: bool, channels: list[str], rules: list[str]) -> dict:
+    """
+    The notification for an entry that was just created or joined channels.
+    """
+    return {
+        "type": "new_entry" if created else "channels",
+        "address": entry.address,
+        "symbol": entry.symbol,
+        "price": entry.current_price,
+        "alert_count": entry.alert_count,
+        "channels": channels,
+        "rules": rules,
+        "link": entry.dexscreener_link,
+    }
+
+# Process-wide dispatcher fed by the alert handler; disabled unless NOTIFY_SINKS is set.
+# Token buckets are per process, so each worker sends its share of the configured rate.
+dispatcher = NotificationDispatcher(parse_sinks(NOTIFY_SINKS), rate_per_min=NOTIFY_RATE_PER_MIN / WORKER_COUNT,
+                                    burst=max(1, NOTIFY_BURST // WORKER_COUNT))
@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+
+class FileSink:
+    """
+    Appends each message as a JSON line to a local file. Useful for tests
+    and for tailing notifications during development.
+    """
+
+    def __init__(self, path: str, name: str = None):
+        self.path = path
+        self.name = name or f"file:{path}"
+        self._lock = threading.Lock()
+
+    def send(self, message: dict):
+        line = json.dumps(message, separators=(",", ":"))
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+class WebhookSink:
+    """
+    POSTs each message as JSON to a URL; any non-2xx response is a failure
+    and goes to the retry queue.
+    """
+
+    def __init__(self, url: str, name: str = None, timeout: float = 5.0, client=None):
+        import httpx
+
+        self.url = url
+        self.name = name or f"webhook:{url}"
+        self._client = client or httpx.Client(timeout=timeout)
+
+    def send(self, message: dict):
+        self._client.post(self.url, json=message).raise_for_status()
+
+def parse_sinks(spec: str) -> list:
+    """
+    Builds sinks from a comma-separated list of "file:<path>" and
+    "webhook:<url>" entries (the NOTIFY_SINKS format).
+    """
+    sinks = []
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        kind, _, target = item.partition(":")
+        if kind == "file":
+            sinks.append(FileSink(os.path.expanduser(target)))
+        elif kind == "webhook":
+            sinks.append(WebhookSink(target))
+        else:
+            raise ValueError(f"Unknown notification sink {item!r}; expected file:<path> or webhook:<url>.")
+    return sinks
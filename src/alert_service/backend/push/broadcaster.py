@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from src.alert_service.backend.metrics import (
+    PUSH_CLIENTS, PUSH_DELTAS_TOTAL, PUSH_FANOUT, PUSH_FRAMES_TOTAL, PUSH_SEND_FAILURES_TOTAL,
+)
+from src.alert_service.backend.push.pubsub import InProcessPubSub, create_pubsub
+
+try:
+    import orjson
+
+    def encode_message(message: dict) -> str:
+        return orjson.dumps(message).decode()
+except ImportError:
+    import json
+
+    def encode_message(message: dict) -> str:
+        return json.dumps(message, separators=(",", ":"))
+
+logger = logging.getLogger(__name__)
+
+# Deltas for the same address published within this window are merged into one.
+COALESCE_WINDOW_MS = int(os.environ.get("PUSH_COALESCE_WINDOW_MS", "250"))
+
+# AlertEntry fields pushed to dashboards after an alert has been processed.
+DELTA_FIELDS = (
+    "symbol",
+    "current_price",
+    "alert_count",
+    "ath_multiplier",
+    "curr_multiplier",
+    "first_alert_time",
+    "last_alert_time",
+    "last_update_time",
+    "volume_5min",
+    "volume_1hr",
+    "channel_flags",
+)
+# Categorical fields are sent as their small-integer codes under the legacy
+# field name; the dashboard maps them back to labels.
+CODED_DELTA_FIELDS = {
+    "twitter_sentiment": "twitter_sentiment_code",
+    "rug_bundle_check": "rug_bundle_check_code",
+    "macd_line": "macd_line_code",
+}
+
+def entry_delta(entry) -> dict:
+    """
+    Builds the field-level delta for an AlertEntry. Datetimes are sent as
+    epoch seconds and categorical fields as integer codes, which is what the
+    dashboard expects.
+    """
+    delta = {"address": entry.address}
+    for field in DELTA_FIELDS:
+        value = getattr(entry, field, None)
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            value = value.timestamp()
+        delta[field] = value
+    for field, code_column in CODED_DELTA_FIELDS.items():
+        delta[field] = getattr(entry, code_column, None)
+    return delta
+
+class DeltaBroadcaster:
+    """
+    Coalesces entry deltas per address and pushes them to connected
+    dashboards as a single "alertsBatch" frame once per window.
+
+    publish() is thread-safe and may be called from request worker threads;
+    the flush loop runs on the application's event loop.
+
+    Batches go out through a pub/sub so that, with several worker processes,
+    every worker's dashboards see every worker's deltas: each flush publishes
+    the local batch and sends whatever batches arrived from the bus.
+    """
+
+    def __init__(self, window_ms: int = COALESCE_WINDOW_MS, pubsub=None):
+        self.window = window_ms / 1000
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._task = None
+        self._inbox = deque()
+        self.pubsub = pubsub if pubsub is not None else InProcessPubSub()
+        self.pubsub.subscribe(self._inbox.append)
+
+    def publish(self, delta: dict):
+        """
+        Queues a delta for the next batch, merging it with any pending delta
+        for the same address (later values win).
+        """
+        address = delta["address"]
+        with self._lock:
+            pending = self._pending.get(address)
+            if pending is None:
+                self._pending[address] = dict(delta)
+            else:
+                pending.update(delta)
+
+    def drain(self) -> list:
+        """
+        Returns and clears the pending deltas, one per address.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.values())
+
+    def register(self, websocket):
+        self._clients.add(websocket)
+        PUSH_CLIENTS.set(len(self._clients))
+
+    def unregister(self, websocket):
+        self._clients.discard(websocket)
+        PUSH_CLIENTS.set(len(self._clients))
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def flush(self):
+        """
+        Publishes the pending deltas as one batch, then sends every batch
+        received from the pub/sub to each client as an "alertsBatch" frame.
+        Returns the number of deltas sent.
+        """
+        batch = self.drain()
+        if batch:
+            self.pubsub.publish(batch)
+        sent = 0
+        while self._inbox:
+            sent += await self.deliver(self._inbox.popleft())
+        return sent
+
+    async def deliver(self, batch: list) -> int:
+        if not batch or not self._clients:
+            return 0
+        message = encode_message({"type": "alertsBatch", "payload": batch})
+        clients = list(self._clients)
+        results = await asyncio.gather(*(ws.send_text(message) for ws in clients), return_exceptions=True)
+        PUSH_FRAMES_TOTAL.inc()
+        PUSH_DELTAS_TOTAL.inc(len(batch))
+        PUSH_FANOUT.observe(len(clients))
+        for ws, result in zip(clients, results):
+            if isinstance(result, Exception):
+                PUSH_SEND_FAILURES_TOTAL.inc()
+                logger.warning("Dropping push client after send failure: %s", result)
+                self.unregister(ws)
+        return len(batch)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.window)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Push flush failed")
+
+    def start(self):
+        """
+        Starts the flush loop on the running event loop.
+        """
+        if self._task is None:
+            self.pubsub.start()
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self.pubsub.stop()
+
+# Process-wide broadcaster used by the alert handler and the /ws endpoint.
+broadcaster = DeltaBroadcaster(pubsub=create_pubsub())
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# "inprocess" for a single worker, "sqlite" to share deltas between worker processes.
+PUSH_PUBSUB = os.environ.get("PUSH_PUBSUB", "inprocess")
+# Bus file for the sqlite pub/sub; every worker of a deployment must use the same path.
+PUSH_BUS_PATH = os.environ.get("PUSH_BUS_PATH", "push_bus.db")
+PUSH_BUS_POLL_MS = int(os.environ.get("PUSH_BUS_POLL_MS", "50"))
+# Published batches are kept this long so slow pollers can catch up.
+PUSH_BUS_RETENTION_S = float(os.environ.get("PUSH_BUS_RETENTION_S", "60"))
+
+class InProcessPubSub:
+    """
+    Delivers published batches to local subscribers synchronously. Used when
+    the backend runs as a single process.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def publish(self, batch: list):
+        for callback in self._subscribers:
+            callback(batch)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+class SQLitePubSub:
+    """
+    Cross-process pub/sub over a shared SQLite file in WAL mode, so workers on
+    one host can fan out deltas without an external broker.
+
+    publish() only queues the batch, so the broadcaster's flush never waits
+    on the SQLite write lock. A poller thread in every process writes the
+    queued batches (one row each), then reads rows newer than the last one it
+    saw, including its own, and hands them to the local subscribers. Old
+    rows are pruned by the same thread.
+    """
+
+    def __init__(self, path: str = PUSH_BUS_PATH, poll_ms: int = PUSH_BUS_POLL_MS,
+                 retention_s: float = PUSH_BUS_RETENTION_S):
+        self.path = path
+        self.poll = poll_ms / 1000
+        self.retention = retention_s
+        self._subscribers = []
+        self._thread = None
+        self._stopping = threading.Event()
+        self._local = threading.local()
+        self._last_prune = 0.0
+        self._outbox = deque()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS push_events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+        self._last_id = self._max_id()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def _conn(self):
+        # One connection per thread; sqlite3 connections are not shared across threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _max_id(self) -> int:
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM push_events").fetchone()[0]
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def publish(self, batch: list):
+        self._outbox.append(batch)
+
+    def write_pending(self) -> int:
+        """
+        Writes the batches queued by publish() in one transaction and prunes
+        old rows. Returns how many batches were written. If the write fails
+        (e.g. the bus is locked past the busy timeout) the batches go back to
+        the front of the queue for the next poll and the error is raised.
+        """
+        batches = []
+        while self._outbox:
+            batches.append(self._outbox.popleft())
+        now = time.time()
+        conn = self._conn()
+        if batches:
+            try:
+                with conn:
+                    conn.execute("BEGIN")
+                    conn.executemany("INSERT INTO push_events (created, payload) VALUES (?, ?)",
+                                     [(now, json.dumps(batch)) for batch in batches])
+            except Exception:
+                # Ahead of anything published meanwhile, so the order is kept
+                self._outbox.extendleft(reversed(batches))
+                raise
+        if now - self._last_prune > self.retention:
+            self._last_prune = now
+            conn.execute("DELETE FROM push_events WHERE created < ?", (now - self.retention,))
+        return len(batches)
+
+    def poll_once(self) -> int:
+        """
+        Writes this process's queued batches, then delivers the batches
+        published since the last poll. Returns how many were delivered.
+        """
+        self.write_pending()
+        rows = self._conn().execute(
+            "SELECT id, payload FROM push_events WHERE id > ? ORDER BY id", (self._last_id,)
+        ).fetchall()
+        for event_id, payload in rows:
+            self._last_id = event_id
+            batch = json.loads(payload)
+            for callback in self._subscribers:
+                callback(batch)
+        return len(rows)
+
+    def _run(self):
+        while not self._stopping.wait(self.poll):
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Push bus poll failed")
+
+    def start(self):
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="push-bus", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+            # Batches published after the last poll still reach the other workers
+            self.write_pending()
+
+def create_pubsub(kind: str = PUSH_PUBSUB):
+    """
+    Returns the pub/sub implementation named by PUSH_PUBSUB.
+    """
+    if kind == "inprocess":
+        return InProcessPubSub()
+    if kind == "sqlite":
+        return SQLitePubSub()
+    raise ValueError(f"Unknown PUSH_PUBSUB {kind!r}; expected 'inprocess' or 'sqlite'.")
@@ -0,0 +1,209 @@
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.sqlite import insert
+
+from src.alert_service.backend.database.db import SessionLocal, engine
+from src.alert_service.backend.database.models import AlertEntry, JobLease
+from src.alert_service.backend.database.operations import delete_entries, select_expired_addresses
+from src.alert_service.backend.metrics import RETENTION_BYTES_RECLAIMED_TOTAL, RETENTION_ROWS_REMOVED_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Retention settings; override via environment variables.
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "7"))
+RETENTION_CHUNK_SIZE = int(os.environ.get("RETENTION_CHUNK_SIZE", "500"))
+# Pause between chunks so queued writers get the database lock.
+RETENTION_CHUNK_PAUSE = float(os.environ.get("RETENTION_CHUNK_PAUSE", "0.05"))
+# Removed rows are written here as Parquet first; set to "" to delete without archiving.
+RETENTION_ARCHIVE_DIR = os.environ.get("RETENTION_ARCHIVE_DIR", "alert_archive")
+# Free pages returned to the filesystem per idle maintenance run.
+VACUUM_MAX_PAGES = int(os.environ.get("VACUUM_MAX_PAGES", "2000"))
+# Maintenance only runs once no worker has applied an alert for this many seconds.
+MAINTENANCE_IDLE_SECONDS = float(os.environ.get("MAINTENANCE_IDLE_SECONDS", "120"))
+
+# Any worker may win the retention lease and a different one idle_maintenance, so the
+# ANALYZE owed after a purge is kept in job_leases: last_started is when it was
+# requested, last_finished when the last ANALYZE started.
+ANALYZE_MARKER = "analyze_pending"
+
+# Set once the non-incremental auto_vacuum warning has been logged, so idle runs
+# on an older database file do not repeat it every time.
+_vacuum_mode_warned = False
+
+def parquet_available() -> bool:
+    for engine_name in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine_name)
+            return True
+        except ImportError:
+            continue
+    return False
+
+def archive_entries(db, addresses: list[str], archive_dir: str, chunk: int) -> Path:
+    """
+    Writes the given entries to a zstd-compressed Parquet file and returns its path.
+    """
+    columns = [column.name for column in AlertEntry.__table__.columns]
+    entries = db.query(AlertEntry).filter(AlertEntry.address.in_(addresses)).all()
+    frame = pd.DataFrame([{name: getattr(entry, name) for name in columns} for entry in entries], columns=columns)
+    directory = Path(archive_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"alert_entries-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{chunk:04d}.parquet"
+    frame.to_parquet(path, compression="zstd", index=False)
+    return path
+
+def purge_expired_entries(older_than_days: int = RETENTION_DAYS, chunk_size: int = RETENTION_CHUNK_SIZE,
+                          archive_dir: str = RETENTION_ARCHIVE_DIR, pause: float = RETENTION_CHUNK_PAUSE) -> dict:
+    """
+    Deletes entries whose first alert is older than `older_than_days`, at most
+    `chunk_size` rows per transaction. Each chunk is archived before it is
+    deleted; if archiving fails the chunk is kept and the purge stops.
+
+    Deleted tokens are also evicted from this process's indicator engine;
+    other workers drop them once they go idle (INDICATOR_IDLE_TTL_S).
+
+    Returns a report with rows_removed, chunks and archived_files.
+    """
+    # Imported here so NumPy stays off the startup path (see refresh.get_indicator_engine)
+    from src.alert_service.backend.alerts.refresh import get_indicator_engine
+    if archive_dir and not parquet_available():
+        raise RuntimeError("Archiving requires pyarrow or fastparquet; set RETENTION_ARCHIVE_DIR='' to purge without it.")
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    report = {"rows_removed": 0, "chunks": 0, "archived_files": []}
+    db = SessionLocal()
+    try:
+        while True:
+            addresses = select_expired_addresses(db, cutoff, chunk_size)
+            if not addresses:
+                break
+            if archive_dir:
+                report["archived_files"].append(str(archive_entries(db, addresses, archive_dir, report["chunks"])))
+            report["rows_removed"] += delete_entries(db, addresses)
+            get_indicator_engine().evict(addresses)
+            report["chunks"] += 1
+            db.expunge_all()
+            if pause:
+                time.sleep(pause)
+    finally:
+        db.close()
+    return report
+
+def compact_database(max_pages: int = VACUUM_MAX_PAGES, analyze: bool = True, full: bool = False) -> dict:
+    """
+    Returns free pages to the filesystem and refreshes planner statistics.
+
+    Databases created by this service use auto_vacuum=INCREMENTAL, and each
+    run frees at most `max_pages` pages. An older file still in another
+    mode needs one full VACUUM to switch, which rebuilds the file and blocks
+    every writer; that only happens with `full=True` (run this module during
+    a maintenance window), otherwise no pages are freed.
+
+    Returns a report with bytes_reclaimed, free_pages_left and analyzed.
+    """
+    global _vacuum_mode_warned
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        page_size = conn.execute(text("PRAGMA page_size")).scalar()
+        before = conn.execute(text("PRAGMA page_count")).scalar()
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+            conn.execute(text(f"PRAGMA incremental_vacuum({int(max_pages)})"))
+        elif full:
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            conn.execute(text("VACUUM"))
+        elif not _vacuum_mode_warned:
+            _vacuum_mode_warned = True
+            logger.warning("Database is not in incremental auto_vacuum mode; free pages are kept until "
+                           "`python -m src.alert_service.backend.scheduler.retention` runs a full VACUUM.")
+        after = conn.execute(text("PRAGMA page_count")).scalar()
+        if analyze:
+            conn.execute(text("ANALYZE"))
+        free_pages = conn.execute(text("PRAGMA freelist_count")).scalar()
+    reclaimed = max(before - after, 0) * page_size
+    RETENTION_BYTES_RECLAIMED_TOTAL.inc(reclaimed)
+    return {"bytes_reclaimed": reclaimed, "free_pages_left": free_pages, "analyzed": analyze}
+
+def free_pages() -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA freelist_count")).scalar()
+
+def is_idle(quiet_seconds: float = MAINTENANCE_IDLE_SECONDS, now: datetime = None) -> bool:
+    """
+    True if no worker applied an alert in the last `quiet_seconds`, judged
+    from the newest last_alert_time in the shared database.
+    """
+    with engine.connect() as conn:
+        newest = conn.execute(select(func.max(AlertEntry.last_alert_time))).scalar()
+    if newest is None:
+        return True
+    if isinstance(newest, str):
+        newest = datetime.fromisoformat(newest)
+    if newest.tzinfo is None:
+        newest = newest.replace(tzinfo=timezone.utc)
+    return (now or datetime.now(timezone.utc)) - newest >= timedelta(seconds=quiet_seconds)
+
+def request_analyze(now: float = None):
+    with engine.begin() as conn:
+        conn.execute(insert(JobLease.__table__).values(name=ANALYZE_MARKER).on_conflict_do_nothing())
+        conn.execute(update(JobLease.__table__).where(JobLease.name == ANALYZE_MARKER)
+                     .values(last_started=time.time() if now is None else now))
+
+def analyze_requested_at() -> float | None:
+    """
+    When the pending ANALYZE was requested, or None if none is pending.
+    """
+    with engine.connect() as conn:
+        row = conn.execute(select(JobLease.last_started, JobLease.last_finished)
+                           .where(JobLease.name == ANALYZE_MARKER)).first()
+    if row is None or row.last_started is None:
+        return None
+    return row.last_started if row.last_finished is None or row.last_finished < row.last_started else None
+
+def analyze_done(started: float):
+    # A purge requested while ANALYZE ran is later than `started` and stays pending
+    with engine.begin() as conn:
+        conn.execute(update(JobLease.__table__).where(JobLease.name == ANALYZE_MARKER)
+                     .values(last_finished=started))
+
+def run_retention() -> dict:
+    """
+    Scheduler job: purges expired entries and logs what was removed.
+    Compaction is left to run_idle_maintenance.
+    """
+    report = purge_expired_entries()
+    if report["rows_removed"]:
+        request_analyze()
+        RETENTION_ROWS_REMOVED_TOTAL.inc(report["rows_removed"])
+    logger.info("Retention removed %d entries in %d chunks (%d archive files).",
+                report["rows_removed"], report["chunks"], len(report["archived_files"]))
+    return report
+
+def run_idle_maintenance() -> dict | None:
+    """
+    Scheduler job: vacuums and analyzes only when no worker has applied an
+    alert for MAINTENANCE_IDLE_SECONDS and there is something to do.
+    """
+    if not is_idle():
+        logger.debug("Skipping idle maintenance; alerts are arriving.")
+        return None
+    analyze = analyze_requested_at() is not None
+    if not analyze and not free_pages():
+        return None
+    started = time.time()
+    report = compact_database(analyze=analyze)
+    if analyze:
+        analyze_done(started)
+    logger.info("Idle maintenance reclaimed %d bytes (%d free pages left, analyzed=%s).",
+                report["bytes_reclaimed"], report["free_pages_left"], report["analyzed"])
+    return report
+
+if __name__ == "__main__":
+    from src.alert_service.backend.database.db import init_db
+    init_db()
+    print(run_retention())
+    # Run by hand, e.g. in a maintenance window: switches older files to incremental vacuum
+    print(compact_database(full=True))
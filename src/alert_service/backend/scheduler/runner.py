@@ -0,0 +1,162 @@
+import importlib
+import logging
+import os
+import socket
+import threading
+import time
+
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert
+
+from src.alert_service.backend.database.db import engine
+from src.alert_service.backend.database.models import JobLease
+from src.alert_service.backend.metrics import SCHEDULER_JOB_RUNNING, SCHEDULER_JOB_SKIPPED_TOTAL, timed_job
+
+logger = logging.getLogger(__name__)
+
+# Optional YAML/JSON file replacing DEFAULT_JOBS.
+SCHEDULER_CONFIG = os.environ.get("SCHEDULER_CONFIG")
+# Identifies this process in job_leases.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Jobs registered on every worker; each run happens on one worker only.
+#   func:    "module:function"
+#   seconds: interval between runs across all workers
+#   jitter:  random start delay so workers do not hit the lease row at once
+#   lease:   seconds a crashed run blocks the next one (defaults to the interval)
+DEFAULT_JOBS = [
+    {"name": "filter_watchlist", "func": "src.alert_service.backend.scheduler.watchlist:filter_watchlist",
+     "seconds": 600, "jitter": 15},
+    {"name": "retention", "func": "src.alert_service.backend.scheduler.retention:run_retention",
+     "seconds": 3600, "jitter": 60},
+    {"name": "idle_maintenance", "func": "src.alert_service.backend.scheduler.retention:run_idle_maintenance",
+     "seconds": 300, "jitter": 15},
+    {"name": "analytics_export", "func": "src.alert_service.backend.analytics.export:run_export",
+     "seconds": 600, "jitter": 30},
+]
+
+# Per-job counters exposed through job_stats().
+_stats = {}
+_stats_lock = threading.Lock()
+
+def load_job_config(path: str | None = SCHEDULER_CONFIG) -> list[dict]:
+    """
+    Returns the job list from `path` (a YAML or JSON list of job dicts, or a
+    mapping with a "jobs" key), or DEFAULT_JOBS if no path is given.
+    """
+    if not path:
+        return DEFAULT_JOBS
+    import yaml  # JSON is a subset of YAML
+    with open(path) as f:
+        config = yaml.safe_load(f)
+    return config["jobs"] if isinstance(config, dict) else config
+
+def resolve(func_ref: str):
+    module_name, _, attr = func_ref.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+_COUNTERS = ("runs", "failures", "skipped_lease", "skipped_overlap", "missed")
+
+def _record(name: str, **changes):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {**dict.fromkeys(_COUNTERS, 0), "last_started": None, "last_duration": None})
+        for key, value in changes.items():
+            stats[key] = stats[key] + value if key in _COUNTERS else value
+
+def job_stats() -> dict:
+    """
+    Returns per-job counters: runs, failures, runs skipped because another
+    worker held the lease or a previous run was still going, missed runs and
+    the last run's start and duration.
+    """
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+def claim_run(name: str, min_gap: float, lease_seconds: float, owner: str = WORKER_ID, now: float = None) -> bool:
+    """
+    Atomically claims a run of job `name`. Fails if any worker started a run
+    less than `min_gap` seconds ago or a run is still holding the lease.
+    """
+    now = time.time() if now is None else now
+    with engine.begin() as conn:
+        conn.execute(insert(JobLease.__table__).values(name=name).on_conflict_do_nothing())
+        claimed = conn.execute(
+            update(JobLease.__table__)
+            .where(JobLease.name == name,
+                   or_(JobLease.last_started.is_(None), JobLease.last_started <= now - min_gap),
+                   or_(JobLease.running_until.is_(None), JobLease.running_until < now))
+            .values(owner=owner, running_until=now + lease_seconds, last_started=now)
+        ).rowcount
+    return claimed == 1
+
+def release_run(name: str, started: float, owner: str = WORKER_ID) -> None:
+    finished = time.time()
+    with engine.begin() as conn:
+        conn.execute(
+            update(JobLease.__table__)
+            .where(JobLease.name == name, JobLease.owner == owner)
+            .values(running_until=None, last_finished=finished, last_duration=finished - started)
+        )
+
+def leased_job(name: str, func, interval: float, jitter: float = 0, lease_seconds: float = None):
+    """
+    Wraps a job so that, across all workers, it runs once per interval and
+    never overlaps a run that is still in progress.
+
+    Every worker fires the job each interval; the first to fire after the
+    previous run's start plus `interval - jitter - 1` seconds claims it and
+    the rest skip, so the run keeps its cadence whichever workers are alive.
+
+    `func` may be a "module:function" reference, resolved on the first run so
+    job modules are not imported at startup.
+    """
+    timed = None
+    min_gap = max(interval - (jitter or 0) - 1.0, 0.0)
+    lease_seconds = lease_seconds or interval
+
+    def wrapper():
+        nonlocal timed
+        started = time.time()
+        if not claim_run(name, min_gap, lease_seconds):
+            SCHEDULER_JOB_SKIPPED_TOTAL.labels(name, "lease").inc()
+            _record(name, skipped_lease=1)
+            return None
+        SCHEDULER_JOB_RUNNING.labels(name).inc()
+        try:
+            if timed is None:
+                timed = timed_job(name, resolve(func) if isinstance(func, str) else func)
+            return timed()
+        finally:
+            SCHEDULER_JOB_RUNNING.labels(name).dec()
+            release_run(name, started)
+            _record(name, runs=1, last_started=started, last_duration=time.time() - started)
+    wrapper.__name__ = name
+    return wrapper
+
+def _on_event(event):
+    if event.code == EVENT_JOB_MISSED:
+        SCHEDULER_JOB_SKIPPED_TOTAL.labels(event.job_id, "missed").inc()
+        _record(event.job_id, missed=1)
+    elif event.code == EVENT_JOB_MAX_INSTANCES:
+        SCHEDULER_JOB_SKIPPED_TOTAL.labels(event.job_id, "overlap").inc()
+        _record(event.job_id, skipped_overlap=1)
+    elif event.code == EVENT_JOB_ERROR:
+        _record(event.job_id, failures=1)
+
+def create_scheduler(jobs: list[dict] = None) -> BackgroundScheduler:
+    """
+    Builds a BackgroundScheduler with the configured jobs. Within a process
+    a job never runs twice at once (max_instances=1) and runs missed while
+    the process was busy are coalesced into one.
+    """
+    scheduler = BackgroundScheduler(job_defaults={"max_instances": 1, "coalesce": True, "misfire_grace_time": 60})
+    for job in jobs if jobs is not None else load_job_config():
+        interval = float(job["seconds"])
+        scheduler.add_job(
+            leased_job(job["name"], job["func"], interval, job.get("jitter"), job.get("lease")),
+            "interval", seconds=interval, jitter=job.get("jitter"), id=job["name"], name=job["name"],
+        )
+    scheduler.add_listener(_on_event, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_ERROR)
+    return scheduler
@@ -1,33 +1,17 @@
-from datetime import datetime, timezone
-from src.alert_service.backend.database.db import SessionLocal
-from src.alert_service.backend.database.operations import get_entry_by_symbol  # If needed for lookup or similar
-from src.alert_service.backend.database.models import AlertEntry
-from termcolor import cprint
+import logging
+from src.alert_service.backend.database.db import engine
+from src.alert_service.backend.alerts.rules import get_rule_set
+
+logger = logging.getLogger(__name__)
 
 def filter_watchlist():
     """
-    This function iterates through the watchlist and marks entries as active/inactive
-    based on a filter criteria (e.g., market cap > 40k). For now, we'll assume the market cap
-    is represented by the `price` field or a dummy field. You can adjust this logic as needed.
+    Re-evaluates the routing rules (alerts/rules.py) over every entry, so
+    channel flags and watchlist status follow rule changes and fields that
+    moved since the entry's last alert. Returns the rule engine's report.
     """
-    print(f"[{datetime.now(timezone.utc)}] Running watchlist filter...")
-    db = SessionLocal()
-    try:
-        # Retrieve all entries (for a production system, you might only want active ones)
-        entries = db.query(AlertEntry).all()
-        for entry in entries:
-            # For demonstration, we use a dummy filter: mark active if price > 0.05, otherwise inactive.
-            # Replace this with your actual filter logic (e.g., market cap > 40k).
-            if entry.price > 0.05:
-                entry.active = True
-            else:
-                entry.active = False
-            # You could also update other fields or log information if necessary.
-
-        db.commit()
-        cprint(f"[{datetime.now(timezone.utc)}] Watchlist filter completed.", "green")
-    except Exception as e:
-        cprint(f"Error during watchlist filtering: {e}", "red")
-        db.rollback()
-    finally:
-        db.close()
\ No newline at end of file
+    logger.info("Running watchlist filter...")
+    report = get_rule_set().apply_bulk(engine)
+    logger.info("Watchlist filter evaluated %d entries in %.3fs, %d changed; hits: %s",
+                report["rows"], report["seconds"], report["changed"], report["hits"])
+    return report
@@ -0,0 +1,103 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import bindparam, create_engine, select, update
+
+from src.alert_service.backend.analytics import queries
+from src.alert_service.backend.analytics.export import PARTITION, SCHEMA, TABLE, export_entries
+from src.alert_service.backend.database.models import AlertEntry, Base
+from src.alert_service.benchmarks.rules import fill_entries
+from src.alert_service.benchmarks.results import save_results
+
+def write_synthetic_dataset(directory: str, rows: int, days: int = 30, seed: int = 0):
+    """
+    Writes `rows` synthetic entries straight to the export layout, one file
+    per first-alert day as merge_partition leaves them.
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 1)
+    per_day = rows // days
+    for day in range(days):
+        n = per_day + (rows - per_day * days if day == days - 1 else 0)
+        first_alert = np.datetime64(start + timedelta(days=day), "us") + rng.integers(0, 86_400_000_000, n).astype("timedelta64[us]")
+        rose = rng.random(n) < 0.6
+        ath = np.where(rose, 1 + rng.pareto(1.5, n), 1.0)
+        ath_time = np.where(rose, first_alert + rng.integers(60, 6 * 3600, n).astype("timedelta64[s]"), np.datetime64("NaT"))
+        columns = {
+            "address": [f"D{day:03d}{i:09d}" for i in range(n)],
+            "alert_count": rng.integers(1, 40, n),
+            "channel_flags": rng.integers(0, 32, n),
+            "ath_multiplier": ath,
+            "ath_time": ath_time,
+            "first_alert_time": first_alert,
+            "last_update_time": first_alert + np.timedelta64(1, "D"),
+        }
+        partition = os.path.join(directory, TABLE, f"{PARTITION}={start + timedelta(days=day):%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        table = pa.table({name: pa.array(values, type=SCHEMA.field(name).type) for name, values in columns.items()})
+        pq.write_table(table, os.path.join(partition, "part-0.parquet"), compression="zstd")
+
+def time_queries(directory: str, repeat: int = 3) -> dict:
+    timings = {}
+    for name, query in queries.QUERIES.items():
+        runs = [query(directory=directory)["seconds"] for _ in range(repeat)]
+        timings[name] = {"best_s": min(runs), "worst_s": max(runs)}
+    return timings
+
+def time_incremental_export(rows: int, days: int = 30, touched: float = 0.01, seed: int = 0) -> dict:
+    """
+    Exports `rows` SQLite entries first alerted over `days` days, then
+    updates a `touched` share of them, drawn from the two newest days since
+    alerts concentrate on young tokens, and exports again: the second run
+    reads only those rows and rewrites only their partitions.
+    """
+    tmp = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'analytics_bench.db')}")
+    Base.metadata.create_all(engine)
+    fill_entries(engine, rows, seed)
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        addresses = conn.execute(select(AlertEntry.address)).scalars().all()
+        first_alerts = {address: start + timedelta(seconds=rng.uniform(0, days * 86400)) for address in addresses}
+        conn.execute(update(AlertEntry).where(AlertEntry.address == bindparam("a")), [
+            {"a": address, "first_alert_time": t, "last_update_time": t} for address, t in first_alerts.items()
+        ])
+    directory = os.path.join(tmp, "analytics")
+    full = export_entries(engine, directory, archive_dir="")
+    recent = [address for address, t in first_alerts.items() if t >= start + timedelta(days=days - 2)]
+    sample = rng.sample(recent, min(len(recent), int(rows * touched)))
+    with engine.begin() as conn:
+        conn.execute(update(AlertEntry).where(AlertEntry.address.in_(sample)).values(last_update_time=datetime.now()))
+    incremental = export_entries(engine, directory, archive_dir="")
+    return {"rows": rows, "touched": len(sample), "full": full, "incremental": incremental}
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDB analytics over the exported Parquet dataset.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic entries for the query timings.")
+    parser.add_argument("--export-rows", type=int, default=100_000, help="SQLite entries for the export timing.")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    started = time.perf_counter()
+    write_synthetic_dataset(directory, args.rows)
+    print(f"Wrote {args.rows} synthetic entries in {time.perf_counter() - started:.1f}s")
+    timings = time_queries(directory)
+    for name, t in timings.items():
+        print(f"{name:12s} best {t['best_s'] * 1000:.0f} ms, worst {t['worst_s'] * 1000:.0f} ms")
+
+    export = time_incremental_export(args.export_rows)
+    print(f"Export: full {export['full']['rows']} rows in {export['full']['seconds']:.2f}s, "
+          f"incremental {export['incremental']['rows']} rows in {export['incremental']['seconds']:.2f}s")
+    print(f"Results written to {save_results('analytics', {'rows': args.rows, 'queries': timings, 'export': export}, args.out)}")
+
+if __name__ == "__main__":
+    main()
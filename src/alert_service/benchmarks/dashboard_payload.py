@@ -0,0 +1,265 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import panel as pn
+from bokeh.document import Document
+from bokeh.protocol import Protocol
+
+from src.alert_service.benchmarks.micro import make_dashboard_frame
+from src.alert_service.benchmarks.results import save_results
+from src.alert_service.frontend.deltas import TIMESTAMP_COLS, apply_deltas
+from src.alert_service.frontend.table_view import (
+    HIDDEN_KEY_COLUMNS, TIME_AGO_COLUMNS, TIME_AGO_FORMATTER, VISIBLE_COLUMNS, PagedTabulator, bind_symbol_filter,
+    sync_rows, visible_frame,
+)
+from src.alert_service.frontend.transforms import alter_data, format_timedelta, update_derived_columns
+
+# The hidden columns of the pre-pagination table, for the "local" baseline.
+LEGACY_HIDDEN = [
+    "address", "dexscreener_link", "channel_HighConviction", "channel_EarlyAlpha", "channel_5xSMWallet",
+    "channel_SmartFollowers", "channel_KimchiTest", "isMoni", "isNansen", "first_alert_time", "last_alert_time",
+    "last_update_time", "token_age", "twitter_sentiment", "rug_bundle_check", "macd_line", "macd_short", "macd_long",
+    "sm_buy_count", "purchase_size", "notes", "website", "twitter", "summary", "active_watchlist", "volume_5min",
+    "volume_1hr",
+]
+
+# The paged table's columns while "time ago" was formatted server-side.
+SERVER_AGO_COLUMNS = [f"{col}_ago" if col in TIME_AGO_COLUMNS else col for col in VISIBLE_COLUMNS]
+
+def add_time_ago(df, now=None):
+    """
+    The *_ago text columns the dashboard used to compute for every row.
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    for col in TIMESTAMP_COLS:
+        if col in df.columns:
+            df[f"{col}_ago"] = df[col].apply(lambda dt: format_timedelta(dt, now))
+    return df
+
+def make_full_frame(rows: int, seed: int = 0):
+    """
+    make_dashboard_frame plus the detail fields the REST snapshot carries
+    and the table hides (summary text, links, channel flags, indicators),
+    and the old server-side *_ago columns.
+    """
+    rng = np.random.default_rng(seed)
+    df = add_time_ago(alter_data(make_dashboard_frame(rows, seed)))
+    df["summary"] = [f"Token {i} summary: " + "lorem ipsum dolor sit amet " * 8 for i in range(rows)]
+    df["website"] = [f"https://token{i}.example" for i in range(rows)]
+    df["twitter"] = [f"https://x.com/token{i}" for i in range(rows)]
+    df["notes"] = ""
+    for col in ("channel_HighConviction", "channel_EarlyAlpha", "channel_5xSMWallet", "channel_SmartFollowers",
+                "channel_KimchiTest", "isMoni", "isNansen", "active_watchlist"):
+        df[col] = rng.random(rows) < 0.3
+    df["twitter_sentiment"] = rng.choice(["Positive", "Neutral", "Negative"], rows)
+    df["rug_bundle_check"] = rng.choice(["Safe", "Warning", "Critical"], rows)
+    df["macd_line"] = rng.choice(["Above Signal", "Below Signal"], rows)
+    for col in ("macd_short", "macd_long", "token_age", "volume_5min", "volume_1hr"):
+        df[col] = rng.uniform(0, 1e4, rows)
+    df["sm_buy_count"] = rng.integers(0, 20, rows)
+    return df
+
+def wire_bytes(events) -> int:
+    """
+    Bytes of the Bokeh PATCH-DOC message carrying `events` to the browser.
+    """
+    if not events:
+        return 0
+    msg = Protocol().create("PATCH-DOC", events)
+    return len(msg.header_json) + len(msg.metadata_json) + len(msg.content_json) + sum(
+        len(buffer.to_bytes()) for buffer in msg.buffers)
+
+def document_bytes(doc) -> int:
+    msg = Protocol().create("PULL-DOC-REPLY", "bench", doc)
+    return len(msg.content_json) + sum(len(buffer.to_bytes()) for buffer in msg.buffers)
+
+def attach(table):
+    doc = Document()
+    started = time.perf_counter()
+    doc.add_root(table.get_root(doc))
+    build = time.perf_counter() - started
+    events = []
+    doc.on_change(events.append)
+    return doc, events, build
+
+def measure_update(events, fn) -> dict:
+    events.clear()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return {"bytes": wire_bytes(events), "server_ms": elapsed * 1000}
+
+def make_batch(df, batch: int, rng):
+    picks = rng.choice(df.index, batch, replace=False)
+    return [{"address": df.at[i, "address"], "current_price": float(rng.uniform(1e-6, 1e-2)),
+             "alert_count": int(df.at[i, "alert_count"]) + 1} for i in picks]
+
+def run(rows: int, batch: int = 50, page_size: int = 30) -> dict:
+    """
+    Compares the bytes sent to the browser by the old table (all columns,
+    local pagination, whole value re-assigned per WS batch) with the paged
+    table (visible columns, one page, cell patches), plus the server-side
+    time for each. Browser render time grows with the rows and cells
+    received, which are reported alongside.
+
+    The paged table is wired as in the dashboard, with the symbol filter
+    bound and left empty; ws_batch_typed_filter is a batch while a pattern
+    is typed, when Panel re-filters and re-sends the page.
+    """
+    rng = np.random.default_rng(1)
+    full = make_full_frame(rows)
+
+    legacy_df = full.copy()
+    legacy = pn.widgets.Tabulator(legacy_df.copy(), pagination="local", page_size=page_size, show_index=False,
+                                  hidden_columns=LEGACY_HIDDEN)
+    legacy_doc, legacy_events, legacy_build = attach(legacy)
+
+    def legacy_update():
+        apply_deltas(legacy_df, make_batch(legacy_df, batch, rng))
+        legacy.value = legacy_df.copy()
+
+    paged_df = full.copy()
+    paged = PagedTabulator(visible_frame(paged_df), page_size=page_size, show_index=False,
+                           hidden_columns=HIDDEN_KEY_COLUMNS)
+    symbol_filter = pn.widgets.TextInput()
+    bind_symbol_filter(paged, symbol_filter)
+    paged_doc, paged_events, paged_build = attach(paged)
+
+    def paged_update():
+        updated, _ = apply_deltas(paged_df, make_batch(paged_df, batch, rng))
+        update_derived_columns(paged_df, updated)
+        sync_rows(paged, paged_df, updated)
+
+    def paged_page_flip():
+        paged.page += 1
+
+    # Rows on the visible page always get a patch; the rest of the batch is server-side only
+    on_page = list(paged.value.index[:page_size])
+
+    def paged_update_on_page():
+        payloads = [{"address": paged_df.at[i, "address"], "alert_count": int(paged_df.at[i, "alert_count"]) + 1}
+                    for i in on_page[:10]]
+        updated, _ = apply_deltas(paged_df, payloads)
+        sync_rows(paged, paged_df, updated)
+
+    def measure_typed_filter():
+        symbol_filter.value_input = "T1"
+        result = measure_update(paged_events, paged_update_on_page)
+        symbol_filter.value_input = ""
+        return result
+
+    return {
+        "rows": rows,
+        "batch": batch,
+        "local_all_columns": {
+            "columns_sent": len(legacy_df.columns) + 1, "rows_sent": rows,
+            "initial_bytes": document_bytes(legacy_doc), "build_ms": legacy_build * 1000,
+            "ws_batch": measure_update(legacy_events, legacy_update),
+        },
+        "remote_visible_columns": {
+            "columns_sent": len(paged.value.columns) + 1, "rows_sent": page_size,
+            "initial_bytes": document_bytes(paged_doc), "build_ms": paged_build * 1000,
+            "ws_batch": measure_update(paged_events, paged_update),
+            "ws_batch_on_page": measure_update(paged_events, paged_update_on_page),
+            "ws_batch_typed_filter": measure_typed_filter(),
+            "page_flip": measure_update(paged_events, paged_page_flip),
+        },
+    }
+
+def tick_cpu(rows: int, sessions: int, page_size: int = 30) -> dict:
+    """
+    Server CPU spent by one "time ago" refresh across `sessions` open
+    dashboards, each holding its own table of `rows` tokens (every Panel
+    session runs its own copy of the script). Timed with process_time and
+    including the PATCH-DOC serialisation:
+
+    - reassign: the original callback (copy the value, reformat every *_ago
+      cell, reassign the whole table with local pagination)
+    - server_paged: reformat every *_ago cell, patch the visible page
+    - client_side: raw timestamps plus TIME_AGO_FORMATTER; no server callback
+      runs, the browser re-renders its page on a timer
+    """
+    full = make_full_frame(rows)
+    # A tick a minute after the load, so the page's *_ago cells have moved
+    later = pd.Timestamp.now(tz="UTC") + pd.Timedelta(minutes=1)
+
+    def measure_tick(tables, tick):
+        wire = 0
+        started = time.process_time()
+        for table, events in tables:
+            events.clear()
+            tick(table)
+            wire += wire_bytes(events)
+        return {"cpu_ms": (time.process_time() - started) * 1000, "bytes": wire}
+
+    def reassign(table):
+        df = table.value.copy()
+        table.value = add_time_ago(df, later)
+
+    frames = {}
+
+    def server_paged(table):
+        df = frames[id(table)]
+        add_time_ago(df, later)
+        sync_rows(table, df, df.index)
+
+    legacy = []
+    for _ in range(sessions):
+        table = pn.widgets.Tabulator(full.copy(), pagination="local", page_size=page_size, show_index=False,
+                                     hidden_columns=LEGACY_HIDDEN)
+        legacy.append((table, attach(table)[1]))
+    paged = []
+    for _ in range(sessions):
+        table = PagedTabulator(full[SERVER_AGO_COLUMNS].copy(), page_size=page_size, show_index=False,
+                               hidden_columns=HIDDEN_KEY_COLUMNS)
+        frames[id(table)] = full.copy()
+        paged.append((table, attach(table)[1]))
+    client = PagedTabulator(visible_frame(full), page_size=page_size, show_index=False,
+                            hidden_columns=HIDDEN_KEY_COLUMNS,
+                            formatters={col: TIME_AGO_FORMATTER for col in TIME_AGO_COLUMNS})
+    client_doc = attach(client)[0]
+    server_ago_doc = attach(PagedTabulator(full[SERVER_AGO_COLUMNS].copy(), page_size=page_size, show_index=False,
+                                           hidden_columns=HIDDEN_KEY_COLUMNS))[0]
+
+    return {
+        "rows": rows,
+        "sessions": sessions,
+        "reassign": measure_tick(legacy, reassign),
+        "server_paged": measure_tick(paged, server_paged),
+        "client_side": {"cpu_ms": 0.0, "bytes": 0},
+        # The formatter travels once with the document; the raw timestamps are floats instead of strings
+        "initial_bytes": {"server_paged": document_bytes(server_ago_doc),
+                          "client_side": document_bytes(client_doc)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes the alerts table sends to the browser, old vs paged.")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=50, help="WS deltas per batch.")
+    parser.add_argument("--sessions", type=int, default=20, help="Open dashboards for the time-ago tick.")
+    parser.add_argument("--session-rows", type=int, default=10000, help="Tokens per session for the time-ago tick.")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.batch)
+    for name in ("local_all_columns", "remote_visible_columns"):
+        mode = result[name]
+        print(f"{name}: {mode['rows_sent']} rows x {mode['columns_sent']} columns, "
+              f"initial {mode['initial_bytes'] / 1e6:.2f} MB (model build {mode['build_ms']:.0f} ms)")
+        for key in ("ws_batch", "ws_batch_on_page", "ws_batch_typed_filter", "page_flip"):
+            if key in mode:
+                print(f"  {key:21s} {mode[key]['bytes'] / 1e3:10.1f} kB  {mode[key]['server_ms']:8.1f} ms server")
+    tick = tick_cpu(args.session_rows, args.sessions)
+    period = 30
+    print(f"time-ago refresh, {tick['sessions']} sessions x {tick['rows']} rows (every {period}s):")
+    for key in ("reassign", "server_paged", "client_side"):
+        print(f"  {key:16s} {tick[key]['cpu_ms']:10.1f} ms CPU per tick "
+              f"({tick[key]['cpu_ms'] / (period * 10):5.2f}% of a core)  {tick[key]['bytes'] / 1e3:10.1f} kB")
+    print(f"  initial document: {tick['initial_bytes']['server_paged'] / 1e3:.1f} kB with *_ago text, "
+          f"{tick['initial_bytes']['client_side'] / 1e3:.1f} kB with timestamps + formatter")
+    print(f"Results written to {save_results('dashboard_payload', {'payload': result, 'time_ago': tick}, args.out)}")
+
+if __name__ == "__main__":
+    main()
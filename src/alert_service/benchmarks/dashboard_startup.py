@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import requests
+
+from src.alert_service.benchmarks.dashboard_payload import make_full_frame
+from src.alert_service.benchmarks.results import percentile, save_results
+from src.alert_service.frontend.http_client import HttpClient
+from src.alert_service.frontend.snapshot import fetch_snapshot, load_snapshot, prepare_snapshot, snapshot_frame
+from src.alert_service.frontend.table_view import HIDDEN_KEY_COLUMNS, PagedTabulator, visible_frame
+
+PAGE_SIZE = 30
+
+def make_snapshot_body(rows: int) -> bytes:
+    """
+    JSON body shaped like the REST /alerts snapshot: raw entry fields only.
+    """
+    df = make_full_frame(rows)
+    derived = [col for col in df.columns if col.endswith("_ago")] + ["dexscreener_link", "favorited", "avg_purchase_size"]
+    return df.drop(columns=derived).to_json(orient="records", date_format="iso").encode()
+
+def serve(body: bytes, delay: float = 0.0):
+    """
+    Serves `body` at http://127.0.0.1:<port>/alerts from a thread, after
+    `delay` seconds, with an ETag; /alerts-plain serves it without one.
+    Returns (server, url).
+    """
+    etag = '"snapshot-1"'
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            with_etag = self.path == "/alerts"
+            if with_etag and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if with_etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/alerts"
+
+async def watch_loop(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """
+    Longest gap between event loop wake-ups, i.e. how long other sessions'
+    clicks and WS frames would have waited.
+    """
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        worst = max(worst, now - last - interval)
+        last = now
+    return worst
+
+def blocking_load(url: str) -> pd.DataFrame:
+    # The old load_data: requests.get without timeout or session, on the event loop
+    return prepare_snapshot(snapshot_frame(requests.get(url).content))
+
+def blocking_session(url: str) -> dict:
+    """
+    The old startup: fetch, prepare every row and build the table before
+    the script returns, on the server's event loop.
+    """
+    started = time.perf_counter()
+    df = blocking_load(url)
+    table = PagedTabulator(visible_frame(df), page_size=PAGE_SIZE, hidden_columns=HIDDEN_KEY_COLUMNS)
+    table.get_root()
+    elapsed = time.perf_counter() - started
+    # Nothing, not even the layout, reaches the browser before the script returns
+    return {"layout": elapsed, "first_rows": elapsed, "loaded": elapsed}
+
+async def progressive_session(url: str, chunk_rows: int, client: HttpClient) -> dict:
+    """
+    The new startup: an empty table is returned at once and initial_load's
+    steps run on the executor, showing the first page before the rest.
+    """
+    started = time.perf_counter()
+    table = PagedTabulator(pd.DataFrame(), loading=True, page_size=PAGE_SIZE, hidden_columns=HIDDEN_KEY_COLUMNS)
+    table.get_root()
+    marks = {"layout": time.perf_counter() - started}
+
+    def on_chunk(chunk, first):
+        if first:
+            table.value = visible_frame(chunk)
+            table.loading = False
+            marks["first_rows"] = time.perf_counter() - started
+        else:
+            table.stream(visible_frame(chunk), reset_index=False, follow=False)
+
+    await load_snapshot(lambda: fetch_snapshot(url, {}, client), prepare_snapshot, on_chunk, PAGE_SIZE, chunk_rows)
+    marks["loaded"] = time.perf_counter() - started
+    return marks
+
+async def run_mode(mode: str, url: str, sessions: int, chunk_rows: int) -> dict:
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    if mode == "blocking":
+        # Each session's script runs to completion on the loop before the next one starts
+        results = []
+        for _ in range(sessions):
+            session_started = time.perf_counter()
+            result = blocking_session(url)
+            offset = session_started - started
+            results.append({key: value + offset for key, value in result.items()})
+            await asyncio.sleep(0)
+    else:
+        client = HttpClient()
+        results = await asyncio.gather(*(progressive_session(url, chunk_rows, client) for _ in range(sessions)))
+        await client.aclose()
+    stop.set()
+    stall = await watcher
+
+    def summary(key):
+        values = sorted(r[key] * 1000 for r in results if key in r)
+        return {"p50_ms": percentile(values, 50), "max_ms": values[-1]} if values else None
+
+    return {
+        "layout": summary("layout"),
+        "first_rows": summary("first_rows"),
+        "loaded": summary("loaded"),
+        "max_loop_stall_ms": stall * 1000,
+    }
+
+async def time_refresh(url: str, mode: str) -> dict:
+    """
+    One refresh of an unchanged snapshot: the old blocking reload and
+    re-render, or a conditional GET that ends at the 304 (/alerts) or at
+    the identical body digest (/alerts-plain).
+    """
+    table = PagedTabulator(pd.DataFrame(), page_size=PAGE_SIZE, hidden_columns=HIDDEN_KEY_COLUMNS)
+    table.get_root()
+    client = HttpClient()
+    validators = {}
+    if mode != "blocking":
+        await fetch_snapshot(url, validators, client)  # The session's initial load
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    if mode == "blocking":
+        table.value = visible_frame(blocking_load(url))
+        rendered = True
+    else:
+        raw = await fetch_snapshot(url, validators, client)
+        rendered = raw is not None
+        if rendered:
+            table.value = visible_frame(prepare_snapshot(raw))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    stall = await watcher
+    await client.aclose()
+    return {"ms": elapsed * 1000, "re_rendered": rendered, "max_loop_stall_ms": stall * 1000}
+
+def run(rows: int, sessions: int, chunk_rows: int, delay: float = 0.0) -> dict:
+    """
+    Time from session start to the layout, to the first page of rows and to
+    the whole snapshot, for `sessions` dashboards opened together against a
+    local server returning a `rows`-token snapshot. Browser paint time comes
+    on top and is not measured here.
+    """
+    server, url = serve(make_snapshot_body(rows), delay)
+    try:
+        return {
+            "rows": rows,
+            "sessions": sessions,
+            "chunk_rows": chunk_rows,
+            "delay": delay,
+            "blocking": asyncio.run(run_mode("blocking", url, sessions, chunk_rows)),
+            "progressive": asyncio.run(run_mode("progressive", url, sessions, chunk_rows)),
+            "refresh_unchanged": {
+                "blocking": asyncio.run(time_refresh(url, "blocking")),
+                "etag": asyncio.run(time_refresh(url, "etag")),
+                "digest": asyncio.run(time_refresh(url + "-plain", "digest")),
+            },
+        }
+    finally:
+        server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard time to first rows, blocking vs background load.")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--sessions", type=int, default=4, help="Dashboards opened at the same time.")
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds the snapshot server waits before answering.")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.sessions, args.chunk_rows, args.delay)
+    print(f"{result['sessions']} sessions, {result['rows']} rows each:")
+    for mode in ("blocking", "progressive"):
+        r = result[mode]
+        parts = [f"{key} p50 {r[key]['p50_ms']:.0f} / max {r[key]['max_ms']:.0f} ms"
+                 for key in ("layout", "first_rows", "loaded") if r[key]]
+        print(f"  {mode:12s} {', '.join(parts)}; event loop stalled up to {r['max_loop_stall_ms']:.0f} ms")
+    print("refresh of an unchanged snapshot:")
+    for mode, r in result["refresh_unchanged"].items():
+        print(f"  {mode:12s} {r['ms']:7.0f} ms, re-rendered {r['re_rendered']}, "
+              f"event loop stalled up to {r['max_loop_stall_ms']:.0f} ms")
+    print(f"Results written to {save_results('dashboard_startup', result, args.out)}")
+
+if __name__ == "__main__":
+    main()
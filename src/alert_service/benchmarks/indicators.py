@@ -0,0 +1,64 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.alert_service.backend.alerts.indicators import IndicatorEngine
+from src.alert_service.benchmarks.micro import measure
+from src.alert_service.benchmarks.results import save_results
+
+def run(tokens: int, steps: int, ring_size: int) -> dict:
+    """
+    Times one vectorised step over all tokens against the same ticks applied
+    one token at a time.
+    """
+    rng = np.random.default_rng(0)
+    addresses = [f"token{i:05d}" for i in range(tokens)]
+    engine = IndicatorEngine(ring_size=ring_size, capacity=tokens)
+    clock = iter(range(10 ** 9))
+
+    def batch_step():
+        now = next(clock) * 15.0
+        engine.update_batch(addresses, rng.uniform(0.5, 2.0, tokens), rng.uniform(0, 100, tokens), now)
+
+    # Warm up past the longest EMA and fill part of the ring before timing.
+    for _ in range(50):
+        batch_step()
+    batch = measure(batch_step, steps)
+    sample = addresses[: max(1, tokens // 100)]
+
+    def single_pass():
+        now = next(clock) * 15.0
+        for address in sample:
+            engine.update(address, 1.0, 10.0, now)
+
+    single = measure(single_pass, max(1, steps // 10))
+    per_tick_us = single["median_us"] / len(sample)
+    return {
+        "tokens": tokens,
+        "ring_size": ring_size,
+        "batch_step": batch,
+        "batch_per_token_us": batch["median_us"] / tokens,
+        "single_tick_us": per_tick_us,
+        "single_all_tokens_ms": per_tick_us * tokens / 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicator engine throughput at many tokens.")
+    parser.add_argument("--tokens", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=20, help="Timed batch steps per round.")
+    parser.add_argument("--ring-size", type=int, default=256)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: benchmarks/results/).")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run(args.tokens, args.steps, args.ring_size)
+    print(f"Batch step over {args.tokens} tokens: {results['batch_step']['median_us'] / 1000:.1f} ms "
+          f"({results['batch_per_token_us']:.2f} us/token)")
+    print(f"Per-tick update: {results['single_tick_us']:.1f} us "
+          f"(~{results['single_all_tokens_ms']:.0f} ms for all tokens one by one)")
+    print(f"Results written to {save_results('indicators', results, args.out)} "
+          f"after {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
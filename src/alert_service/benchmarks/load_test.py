@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from src.alert_service.backend.cluster import route_url, start_workers, stop_workers, worker_urls
+from src.alert_service.benchmarks.payloads import AlertFeed
+from src.alert_service.benchmarks.results import percentile, save_results
+
+def sqlite_path(database_url: str | None) -> str | None:
+    if database_url and database_url.startswith("sqlite:///"):
+        return database_url[len("sqlite:///"):]
+    return None
+
+def db_size(path: str | None) -> int | None:
+    """
+    Size of a SQLite database in bytes, including its WAL file if present.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+def wait_ready(urls: list[str], processes: list[subprocess.Popen], timeout: float = 30):
+    """
+    Polls /readyz on every URL until all answer 200.
+    """
+    deadline = time.monotonic() + timeout
+    pending = list(urls)
+    while pending and time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{pending[0]}/readyz", timeout=1).status_code == 200:
+                pending.pop(0)
+                continue
+        except httpx.HTTPError:
+            pass
+        if any(process.poll() is not None for process in processes):
+            raise RuntimeError("Local backend exited during startup.")
+        time.sleep(0.2)
+    if pending:
+        stop_workers(processes)
+        raise RuntimeError(f"Local backend did not become ready within {timeout:.0f}s.")
+
+def start_local_backend(database_url: str, port: int, workers: int = 1) -> list[subprocess.Popen]:
+    """
+    Starts the backend against the given database, as `workers` uvicorn
+    processes on consecutive ports, and waits until all accept requests.
+    """
+    bus_path = os.path.join(tempfile.mkdtemp(), "push_bus.db")
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=os.getcwd(), PUSH_BUS_PATH=bus_path)
+    if workers == 1:
+        env.setdefault("PUSH_PUBSUB", "inprocess")
+    processes = start_workers(workers, "127.0.0.1", port, env, log_level="warning")
+    wait_ready(worker_urls("127.0.0.1", port, workers), processes)
+    return processes
+
+async def run_load(urls, feed: AlertFeed, rate: float, concurrency: int, duration: float) -> dict:
+    """
+    Drives POST /alert at a fixed open-loop rate from `concurrency` clients.
+    With several backend URLs each alert goes to the worker owning its
+    address (cluster.route_url).
+
+    Each request has a scheduled send time; latency is measured from that time,
+    so queueing delay caused by a slow server is included rather than hidden.
+    """
+    urls = [urls] if isinstance(urls, str) else list(urls)
+    total = int(rate * duration)
+    slots = itertools.count()
+    payloads = [feed.next_payload() for _ in range(total)]
+    latencies, statuses = [], {}
+    start = time.perf_counter() + 0.1
+
+    async def client_loop():
+        async with httpx.AsyncClient(timeout=30) as client:
+            while (i := next(slots)) < total:
+                scheduled = start + i / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    payload = payloads[i]
+                    response = await client.post(f"{route_url(payload['address'], urls)}/alert", json=payload)
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - scheduled)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 300)
+    return {
+        "workers": len(urls),
+        "target_rate": rate,
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": ok,
+        "errors": total - ok,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "elapsed_s": elapsed,
+        "alerts_per_sec": ok / elapsed if elapsed else None,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000,
+        } if latencies else {},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for POST /alert.")
+    parser.add_argument("--url", action="append", default=None,
+                        help="Backend base URL; repeat for several workers. Omit to start a local backend on a temp DB.")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the local backend (first worker).")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the local backend.")
+    parser.add_argument("--db", default=None, help="SQLite file to measure growth of (local mode uses a temp DB).")
+    parser.add_argument("--rate", type=float, default=100, help="Alerts per second to send.")
+    parser.add_argument("--concurrency", type=int, default=20, help="Number of concurrent clients.")
+    parser.add_argument("--duration", type=float, default=10, help="Test duration in seconds.")
+    parser.add_argument("--tokens", type=int, default=500, help="Distinct tokens in the generated feed.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: benchmarks/results/).")
+    args = parser.parse_args()
+
+    processes = []
+    urls, db_path = args.url, args.db
+    if urls is None:
+        db_path = db_path or os.path.join(tempfile.mkdtemp(), "alerts_load.db")
+        processes = start_local_backend(f"sqlite:///{db_path}", args.port, args.workers)
+        urls = worker_urls("127.0.0.1", args.port, args.workers)
+    try:
+        size_before = db_size(db_path)
+        result = asyncio.run(run_load(urls, AlertFeed(args.tokens, args.seed), args.rate, args.concurrency, args.duration))
+        size_after = db_size(db_path)
+    finally:
+        stop_workers(processes)
+
+    result["db_bytes_before"] = size_before
+    result["db_bytes_after"] = size_after
+    result["db_growth_bytes"] = size_after - (size_before or 0) if size_after is not None else None
+
+    latency = result["latency_ms"]
+    print(f"{result['workers']} worker(s): {result['ok']}/{result['requests']} ok, {result['alerts_per_sec']:.1f} alerts/s, "
+          f"p50 {latency.get('p50', 0):.1f} ms, p95 {latency.get('p95', 0):.1f} ms, p99 {latency.get('p99', 0):.1f} ms")
+    if result["db_growth_bytes"] is not None:
+        print(f"DB grew by {result['db_growth_bytes']} bytes")
+    print(f"Results written to {save_results('load', {'alert_ingest': result}, args.out)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+# Benchmarks run against a throwaway SQLite file unless DATABASE_URL is set.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/alerts_bench.db")
+
+import numpy as np
+import pandas as pd
+from src.alert_service.benchmarks.payloads import AlertFeed
+from src.alert_service.benchmarks.results import save_results
+
+def measure(fn, number: int, repeat: int = 5, setup=None) -> dict:
+    """
+    Calls fn() `number` times per round for `repeat` rounds and returns
+    per-call timings in microseconds. Output printed by fn is suppressed.
+    """
+    rounds = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            elapsed = time.perf_counter() - start
+        rounds.append(elapsed / number * 1e6)
+    median = statistics.median(rounds)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "best_us": min(rounds),
+        "median_us": median,
+        "mean_us": statistics.fmean(rounds),
+        "ops_per_sec": 1e6 / median if median else None,
+    }
+
+def make_dashboard_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a DataFrame shaped like the dashboard's REST snapshot after load_data
+    has parsed the timestamp columns.
+    """
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp.now(tz="UTC")
+    first_price = 10 ** rng.uniform(-6, -2, rows)
+    current_price = first_price * rng.uniform(0.2, 20, rows)
+    return pd.DataFrame({
+        "address": [f"addr{i:07d}pump" for i in range(rows)],
+        "chain": "solana",
+        "symbol": [f"T{i}" for i in range(rows)],
+        "alert_count": rng.integers(1, 50, rows),
+        "first_alert_price": first_price,
+        "current_price": current_price,
+        "ath_multiplier": current_price / first_price * rng.uniform(1, 3, rows),
+        "curr_multiplier": current_price / first_price,
+        "purchase_size": rng.uniform(50, 50000, rows),
+        "first_alert_time": now - pd.to_timedelta(rng.integers(3600, 86400 * 7, rows), unit="s"),
+        "last_alert_time": now - pd.to_timedelta(rng.integers(0, 3600, rows), unit="s"),
+        "last_update_time": now - pd.to_timedelta(rng.integers(0, 600, rows), unit="s"),
+    })
+
+def bench_process_alert(number: int) -> dict:
+    from src.alert_service.backend.database.db import init_db
+    from src.alert_service.backend.alerts.alert_handler import process_alert
+    from src.alert_service.backend.alerts.alert_models import Alert
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+    feed = iter(AlertFeed(tokens=200, seed=1))
+    return measure(lambda: process_alert(Alert(**next(feed))), number)
+
+def bench_refresh_entry(number: int) -> dict:
+    from src.alert_service.backend.database.db import SessionLocal, init_db
+    from src.alert_service.backend.database.operations import add_new_entry, get_entry_by_address
+    from src.alert_service.backend.alerts.refresh import refresh_entry
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+    db = SessionLocal()
+    try:
+        entry = get_entry_by_address(db, "refreshbenchpump") or add_new_entry(db, "RFSH", 0.001, 1, "refreshbenchpump")
+        return measure(lambda: refresh_entry(db, entry), number)
+    finally:
+        db.close()
+
+def bench_ingest(number: int) -> dict:
+    """
+    Per-request parsing cost of POST /alert. "roundtrip" reproduces the old
+    path (json.loads, Alert(**data), the hand-written checks and two .dict()
+    calls for the log line and response); "codec" is decode_alert plus the
+    minimal response.
+    """
+    import itertools
+    import json
+    from src.alert_service.backend.alerts.alert_models import Alert
+    from src.alert_service.backend.alerts.codec import decode_alert, msgpack
+
+    bodies = [json.dumps(payload).encode() for payload in itertools.islice(AlertFeed(tokens=200, seed=3), 256)]
+    index = iter(range(10 ** 9))
+
+    def roundtrip():
+        alert = Alert(**json.loads(bodies[next(index) % len(bodies)]))
+        required = (alert.address, alert.lastTouched, alert.strategyAlertCount,
+                    alert.info.name, alert.info.symbol, alert.lastPrice.price, alert.lastPrice.fdv)
+        if not all(required):
+            raise ValueError("Missing field in alert.")
+        alert.model_dump()
+        return {"status": "success", "data": alert.model_dump()}
+
+    def codec():
+        alert = decode_alert(bodies[next(index) % len(bodies)], "application/json")
+        return {"status": "success", "address": alert.address}
+
+    results = {"roundtrip": measure(roundtrip, number), "codec": measure(codec, number)}
+    if msgpack is not None:
+        packed = [msgpack.packb(json.loads(body)) for body in bodies]
+        results["codec_msgpack"] = measure(
+            lambda: decode_alert(packed[next(index) % len(packed)], "application/msgpack"), number)
+    return results
+
+def bench_alter_data(rows: int, number: int) -> dict:
+    from src.alert_service.frontend.transforms import alter_data
+
+    df = make_dashboard_frame(rows)
+    watchlist = set(df["address"].sample(min(rows, 50), random_state=0))
+    return measure(lambda: alter_data(df.copy(), watchlist), number)
+
+def bench_update_callback(rows: int, batch: int, number: int) -> dict:
+    """
+    The dashboard's update_callback work minus the table render: apply a
+    batch of WS deltas and recalculate derived columns for the touched rows.
+    """
+    from src.alert_service.frontend.transforms import alter_data, update_derived_columns
+    from src.alert_service.frontend.deltas import apply_deltas
+
+    df = alter_data(make_dashboard_frame(rows))
+    rng = np.random.default_rng(2)
+    now = time.time()
+
+    def run():
+        picks = rng.integers(0, rows, batch)
+        payloads = [
+            {"address": df.at[i, "address"], "current_price": float(rng.uniform(1e-6, 1e-2)),
+             "alert_count": int(df.at[i, "alert_count"]) + 1, "last_alert_time": now}
+            for i in picks
+        ]
+        updated, _ = apply_deltas(df, payloads)
+        if updated:
+            update_derived_columns(df, updated)
+
+    return measure(run, number)
+
+def run_all(rows: int, number: int) -> dict:
+    ingest = {f"ingest_{name}": result for name, result in bench_ingest(number * 10).items()}
+    return {
+        **ingest,
+        "process_alert": bench_process_alert(number),
+        "refresh_entry": bench_refresh_entry(number),
+        f"alter_data[{rows}]": bench_alter_data(rows, max(1, number // 50)),
+        f"update_callback[{rows}x50]": bench_update_callback(rows, 50, max(1, number // 10)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the alert pipeline.")
+    parser.add_argument("--rows", type=int, default=5000, help="Dashboard DataFrame size.")
+    parser.add_argument("--number", type=int, default=200, help="Calls per round for the backend benchmarks.")
+    parser.add_argument("--out", default=None, help="Result JSON path (default: benchmarks/results/).")
+    args = parser.parse_args()
+
+    results = run_all(args.rows, args.number)
+    for name, result in results.items():
+        print(f"{name:<28} median {result['median_us']:>12.1f} us  ({result['ops_per_sec']:.0f}/s)")
+    print(f"Results written to {save_results('micro', results, args.out)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import random
+import string
+import time
+
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+def random_address(rng: random.Random) -> str:
+    """
+    Returns a Solana-style pump.fun address (base58, ending in "pump").
+    """
+    return "".join(rng.choice(BASE58) for _ in range(40)) + "pump"
+
+def random_symbol(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 6)))
+
+class AlertFeed:
+    """
+    Local stand-in for the upstream alert feed. Produces Alert payload dicts
+    for a fixed pool of tokens, shaped like the real POST /alert body.
+
+    A small set of hot tokens receives most of the traffic, as during a launch;
+    prices follow a random walk and strategyAlertCount increments per token.
+    """
+
+    def __init__(self, tokens: int = 500, seed: int = 0, hot_fraction: float = 0.05, hot_share: float = 0.5):
+        self.rng = random.Random(seed)
+        self.tokens = [self._new_token() for _ in range(tokens)]
+        self.hot = self.tokens[:max(1, int(tokens * hot_fraction))]
+        self.hot_share = hot_share
+
+    def _new_token(self) -> dict:
+        symbol = random_symbol(self.rng)
+        return {
+            "address": random_address(self.rng),
+            "symbol": symbol,
+            "name": f"{symbol} Coin",
+            "price": 10 ** self.rng.uniform(-6, -2),
+            "supply": 1_000_000_000,
+            "alert_count": 0,
+        }
+
+    def next_payload(self) -> dict:
+        pool = self.hot if self.rng.random() < self.hot_share else self.tokens
+        token = self.rng.choice(pool)
+        token["price"] *= self.rng.uniform(0.9, 1.15)
+        token["alert_count"] += 1
+        price = token["price"]
+        return {
+            "address": token["address"],
+            "price": price,
+            "purchaseSize": round(self.rng.uniform(50, 5000), 2),
+            "lastTouched": int(time.time() * 1000),
+            "info": {
+                "name": token["name"],
+                "symbol": token["symbol"],
+                "imageUrl": f"https://cdn.example.com/{token['address']}.png",
+                "twitterHandle": token["symbol"].lower(),
+                "description": f"{token['name']} community token",
+                "websites": [f"https://{token['symbol'].lower()}.fun"],
+            },
+            "lastPrice": {"price": f"{price:.10f}", "fdv": f"{price * token['supply']:.2f}"},
+            "strategyAlertCount": token["alert_count"],
+        }
+
+    def __iter__(self):
+        while True:
+            yield self.next_payload()
@@ -0,0 +1,104 @@
+import argparse
+import time
+
+import numpy as np
+from panel.io.state import set_curdoc
+
+from src.alert_service.benchmarks.dashboard_payload import attach, wire_bytes
+from src.alert_service.benchmarks.results import save_results
+from src.alert_service.frontend.price_panel import PriceFeed, PricePanel
+
+def make_batches(tokens: int, watched: int, seconds: float, rate: float, batch: int, seed: int = 0):
+    """
+    `rate` "alertsBatch" payload lists per second for `seconds`, each with
+    `batch` price deltas spread over `tokens` addresses, the first `watched`
+    of which are on the watchlist. Returns [(time, payloads)].
+    """
+    rng = np.random.default_rng(seed)
+    prices = rng.uniform(1e-6, 1e-2, tokens)
+    batches = []
+    for i in range(int(seconds * rate)):
+        t = 1.7e9 + i / rate
+        picks = rng.choice(tokens, batch, replace=False)
+        prices[picks] *= rng.uniform(0.97, 1.03, batch)
+        batches.append((t, [{"address": f"addr{j}", "current_price": float(prices[j]), "last_update_time": t}
+                            for j in picks]))
+    return batches
+
+def replay(batches, watched: int, frame_rate, seconds: float) -> dict:
+    """
+    Feeds `batches` to a PriceFeed and a PricePanel of `watched` tiles.
+    With frame_rate None the tiles are redrawn after every batch; otherwise
+    frame_rate times per (simulated) second. Times are server CPU.
+    """
+    feed = PriceFeed()
+    panel = PricePanel(feed)
+    panel.set_tokens([{"address": f"addr{j}", "symbol": f"T{j}"} for j in range(watched)])
+    doc, events, _ = attach(panel.layout)
+
+    timeline = [(t, "batch", payloads) for t, payloads in batches]
+    if frame_rate:
+        start = batches[0][0]
+        timeline += [(start + k / frame_rate, "frame", None) for k in range(1, int(seconds * frame_rate) + 1)]
+    timeline.sort(key=lambda item: (item[0], item[1] == "frame"))
+
+    feed_cpu = render_cpu = 0.0
+    sent = messages = redraws = 0
+
+    def render():
+        nonlocal render_cpu, sent, messages, redraws
+        events.clear()
+        started = time.process_time()
+        with set_curdoc(doc):
+            doc.hold("combine")
+            redraws += panel.render_frame()
+            doc.unhold()
+        render_cpu += time.process_time() - started
+        if events:
+            sent += wire_bytes(events)
+            messages += 1
+
+    for _, kind, payloads in timeline:
+        if kind == "batch":
+            started = time.process_time()
+            feed.on_batch(payloads)
+            feed_cpu += time.process_time() - started
+            if not frame_rate:
+                render()
+        else:
+            render()
+    return {
+        "frame_rate": frame_rate, "feed_cpu_ms": feed_cpu * 1000, "render_cpu_ms": render_cpu * 1000,
+        "messages": messages, "bytes": sent, "tile_redraws": redraws,
+    }
+
+def run(tokens: int, watched: int, seconds: float, rate: float, batch: int, frame_rate: float) -> dict:
+    batches = make_batches(tokens, watched, seconds, rate, batch)
+    return {
+        "tokens": tokens, "watched": watched, "seconds": seconds, "batches_per_second": rate, "batch": batch,
+        "per_message": replay(batches, watched, None, seconds),
+        "fixed_frame": replay(batches, watched, frame_rate, seconds),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Watchlist price tiles: redraw per WS batch vs at a fixed frame rate.")
+    parser.add_argument("--tokens", type=int, default=5000, help="Addresses the deltas are spread over.")
+    parser.add_argument("--watched", type=int, default=100, help="Watchlist tokens, one tile each.")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--rate", type=float, default=20, help="Delta batches per second.")
+    parser.add_argument("--batch", type=int, default=200, help="Deltas per batch.")
+    parser.add_argument("--frame-rate", type=float, default=2)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    result = run(args.tokens, args.watched, args.seconds, args.rate, args.batch, args.frame_rate)
+    print(f"{result['watched']} tiles, {args.rate:g} batches/s of {args.batch} deltas over {args.tokens} tokens, "
+          f"{args.seconds:g} s:")
+    for mode in ("per_message", "fixed_frame"):
+        r = result[mode]
+        print(f"  {mode:12s} feed {r['feed_cpu_ms']:7.1f} ms  render {r['render_cpu_ms']:8.1f} ms CPU  "
+              f"{r['messages']:5d} messages  {r['bytes'] / 1e3:8.1f} kB  {r['tile_redraws']:6d} tile redraws")
+    print(f"Results written to {save_results('price_panel', result, args.out)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+import glob
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+
+# In-process replays write to a throwaway SQLite file unless DATABASE_URL is set.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/alerts_replay.db")
+
+import httpx
+from src.alert_service.backend.alerts.recorder import read_recording
+from src.alert_service.backend.cluster import route_url
+from src.alert_service.benchmarks.payloads import AlertFeed
+from src.alert_service.benchmarks.results import percentile, save_results
+
+def synthesize_recording(path: str, count: int, rate: float, tokens: int = 500, seed: int = 0) -> str:
+    """
+    Writes a recording of `count` AlertFeed payloads arriving as a Poisson
+    process at `rate` alerts per second, in the format of AlertRecorder.
+    For trying replays before production traffic has been captured.
+    """
+    rng = random.Random(seed)
+    feed = AlertFeed(tokens, seed)
+    t = time.time()
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for _ in range(count):
+            t += rng.expovariate(rate)
+            f.write(json.dumps({"t": t, "alert": feed.next_payload()}, separators=(",", ":")) + "\n")
+    return path
+
+def timetable(records, speed: float | None) -> list[float]:
+    """
+    Send offsets in seconds from the start of the replay: the recorded gaps
+    divided by `speed`, or all zero when replaying as fast as possible.
+    """
+    if not records:
+        return []
+    first = records[0][0]
+    return [(t - first) / speed if speed else 0.0 for t, _ in records]
+
+def summarize(records, latencies, ok, elapsed, speed, extra=None) -> dict:
+    latencies = sorted(latencies)
+    span = records[-1][0] - records[0][0] if records else 0.0
+    return {
+        "alerts": len(records),
+        "ok": ok,
+        "errors": len(records) - ok,
+        "speed": speed or "max",
+        "recorded_span_s": span,
+        "elapsed_s": elapsed,
+        "alerts_per_sec": ok / elapsed if elapsed else None,
+        "effective_speedup": span / elapsed if elapsed else None,
+        # Measured from each alert's scheduled send time, so falling behind the recording shows up here
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000,
+        } if latencies else {},
+        **(extra or {}),
+    }
+
+def replay_in_process(records, speed: float | None = None, seed: int = 0) -> dict:
+    """
+    Feeds the recorded payloads to process_alert on this thread, with the
+    provider stubs seeded so runs are comparable. Dashboard pushes are
+    drained once per coalescing window to report the frames a connected
+    dashboard would have received.
+    """
+    from src.alert_service.backend.alerts.alert_handler import process_alert
+    from src.alert_service.backend.alerts.alert_models import Alert
+    from src.alert_service.backend.alerts.refresh import seed_providers
+    from src.alert_service.backend.database.db import init_db
+    from src.alert_service.backend.push.broadcaster import broadcaster
+
+    init_db()
+    seed_providers(seed)
+    broadcaster.drain()
+    offsets = timetable(records, speed)
+    latencies, frames, ok = [], [], 0
+    start = last_flush = time.perf_counter()
+    for offset, (_, payload) in zip(offsets, records):
+        scheduled = start + offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            scheduled = scheduled if speed else time.perf_counter()
+        try:
+            process_alert(Alert.model_validate(payload))
+            ok += 1
+        except Exception:
+            pass
+        now = time.perf_counter()
+        latencies.append(now - scheduled)
+        if now - last_flush >= broadcaster.window:
+            frames.append(len(broadcaster.drain()))
+            last_flush = now
+    elapsed = time.perf_counter() - start
+    frames.append(len(broadcaster.drain()))
+    frames = sorted(size for size in frames if size)
+    return summarize(records, latencies, ok, elapsed, speed, {
+        "push_frames": len(frames),
+        "deltas_per_frame": {"p50": percentile(frames, 50), "max": frames[-1] if frames else None},
+    })
+
+async def replay_http(records, urls: list[str], speed: float | None = None, concurrency: int = 20) -> dict:
+    """
+    POSTs the recorded payloads to /alert, each to the worker owning its
+    address, on the recorded timetable from `concurrency` clients. Start the
+    backend with PROVIDER_SEED for deterministic refreshes.
+    """
+    offsets = timetable(records, speed)
+    latencies, statuses = [], {}
+    queue = asyncio.Queue()
+    for item in zip(offsets, records):
+        queue.put_nowait(item)
+    start = time.perf_counter() + 0.1
+
+    async def client_loop():
+        async with httpx.AsyncClient(timeout=30) as client:
+            while not queue.empty():
+                offset, (_, payload) = queue.get_nowait()
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif not speed:
+                    scheduled = time.perf_counter()
+                try:
+                    response = await client.post(f"{route_url(payload['address'], urls)}/alert", json=payload)
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - scheduled)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 300)
+    return summarize(records, latencies, ok, elapsed, speed, {"statuses": {str(k): v for k, v in statuses.items()}})
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-drive a recorded alert stream (see ALERT_RECORD_PATH).")
+    parser.add_argument("recording", help="gzip JSONL recording, or a glob such as 'alerts.w*.jsonl.gz' for every "
+                                          "worker's file; created with --synthesize if it does not exist.")
+    pace = parser.add_mutually_exclusive_group()
+    pace.add_argument("--speed", type=float, default=1.0, help="Replay speed-up; 1 is real time.")
+    pace.add_argument("--max", action="store_true", help="Send as fast as possible.")
+    parser.add_argument("--url", action="append", default=None,
+                        help="Backend base URL (repeat for several workers); omit to replay in-process.")
+    parser.add_argument("--concurrency", type=int, default=20, help="HTTP clients when replaying to --url.")
+    parser.add_argument("--seed", type=int, default=0, help="Provider stub seed for in-process replays.")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N alerts.")
+    parser.add_argument("--synthesize", type=int, default=None, metavar="N",
+                        help="Write a synthetic recording of N alerts first.")
+    parser.add_argument("--rate", type=float, default=50, help="Alerts per second in a synthetic recording.")
+    parser.add_argument("--out", default=None, help="Result JSON path (default: benchmarks/results/).")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize_recording(args.recording, args.synthesize, args.rate, seed=args.seed)
+    records = read_recording(*(sorted(glob.glob(args.recording)) or [args.recording]))[:args.limit]
+    speed = None if args.max else args.speed
+    if args.url:
+        result = asyncio.run(replay_http(records, args.url, speed, args.concurrency))
+    else:
+        result = replay_in_process(records, speed, args.seed)
+
+    latency = result["latency_ms"]
+    print(f"Replayed {result['ok']}/{result['alerts']} alerts ({result['recorded_span_s']:.1f}s recorded) "
+          f"in {result['elapsed_s']:.1f}s: {result['alerts_per_sec']:.0f} alerts/s, "
+          f"{result['effective_speedup']:.1f}x real time")
+    if latency:
+        print(f"Latency from schedule: p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+              f"p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms")
+    if "push_frames" in result:
+        print(f"Dashboard frames: {result['push_frames']} "
+              f"(deltas per frame p50 {result['deltas_per_frame']['p50']}, max {result['deltas_per_frame']['max']})")
+    print(f"Results written to {save_results('replay', {'replay': result}, args.out)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def percentile(sorted_values, q):
+    """
+    Nearest-rank percentile of an already sorted list (q in 0..100).
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def save_results(name: str, results: dict, path: str | None = None) -> str:
+    """
+    Writes benchmark results plus run metadata to JSON and returns the path.
+    Defaults to benchmarks/results/<name>-<timestamp>.json.
+    """
+    now = datetime.now(timezone.utc)
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{now:%Y%m%dT%H%M%S}.json")
+    document = {
+        "name": name,
+        "timestamp": now.isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+    return path
+
+def compare_results(baseline: dict, current: dict, metric: str = "median_us") -> list:
+    """
+    Compares two result documents benchmark by benchmark. Returns a list of
+    (name, baseline, current, change) rows; change is the relative difference
+    of `metric` (positive means slower).
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or metric not in base or metric not in result:
+            continue
+        change = (result[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+        rows.append((name, base[metric], result[metric], change))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="median_us")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression.")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    regressions = 0
+    for name, base, value, change in compare_results(baseline, current, args.metric):
+        flag = "REGRESSION" if change > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{name:<28} {base:>12.1f} -> {value:>12.1f}  {change:+7.1%} {flag}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.alert_service.backend.alerts.rules import DEFAULT_RULES, RuleSet, load_columns
+from src.alert_service.backend.database.enums import CODED_COLUMNS
+from src.alert_service.backend.database.models import AlertEntry, Base
+from src.alert_service.benchmarks.payloads import random_address, random_symbol
+from src.alert_service.benchmarks.results import save_results
+
+def fill_entries(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    codes = {code_column: [int(m) for m in enum_cls] for code_column, enum_cls in CODED_COLUMNS.values()}
+    records = []
+    for _ in range(rows):
+        price = 10 ** rng.uniform(-3, 0)
+        record = {
+            "address": random_address(rng), "symbol": random_symbol(rng),
+            "first_alert_price": price, "current_price": price * rng.uniform(0.5, 5),
+            "curr_multiplier": rng.uniform(0.5, 5), "token_age": rng.uniform(0, 7200),
+            "alert_count": rng.randint(1, 40), "sm_buy_count": rng.randint(0, 10),
+            "volume_5min": rng.uniform(1e3, 5e3), "volume_1hr": rng.uniform(1e3, 5e4),
+            "active_watchlist": True, "channel_flags": 0,
+        }
+        record.update({column: rng.choice(choices) for column, choices in codes.items()})
+        records.append(record)
+    with engine.begin() as conn:
+        conn.execute(insert(AlertEntry), records)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run(rows: int) -> dict:
+    """
+    Evaluates DEFAULT_RULES over `rows` entries with each compiled form:
+    per-entry closures over loaded ORM objects, NumPy masks over column
+    arrays, and the single SQL UPDATE used by the watchlist job.
+    """
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'rules_bench.db')}")
+    Base.metadata.create_all(engine)
+    fill_entries(engine, rows)
+    rules = RuleSet(DEFAULT_RULES)
+
+    db = sessionmaker(bind=engine)()
+    entries, load_orm = timed(lambda: db.query(AlertEntry).all())
+    _, per_entry = timed(lambda: [rules.apply(entry) for entry in entries])
+    db.close()
+
+    columns, load_arrays = timed(lambda: load_columns(engine, rules.fields))
+    arrays, numpy_eval = timed(lambda: rules.evaluate_arrays(columns))
+    first = rules.apply_bulk(engine)
+    again = rules.apply_bulk(engine)
+    return {
+        "rows": rows,
+        "rules": len(rules.rules),
+        "closures": {"load_s": load_orm, "evaluate_s": per_entry, "per_entry_us": per_entry / rows * 1e6},
+        "numpy": {"load_s": load_arrays, "evaluate_s": numpy_eval},
+        "sql": {"apply_s": first["seconds"], "changed": first["changed"],
+                "reapply_s": again["seconds"], "reapply_changed": again["changed"]},
+        "hits": first["hits"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Routing rule evaluation over many entries.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    result = run(args.rows)
+    closures, arrays, sql = result["closures"], result["numpy"], result["sql"]
+    print(f"{result['rules']} rules over {result['rows']} entries")
+    print(f"Closures: {closures['evaluate_s'] * 1000:.0f} ms ({closures['per_entry_us']:.1f} us/entry) "
+          f"+ {closures['load_s'] * 1000:.0f} ms ORM load")
+    print(f"NumPy:    {arrays['evaluate_s'] * 1000:.1f} ms + {arrays['load_s'] * 1000:.0f} ms column load")
+    print(f"SQL:      {sql['apply_s'] * 1000:.0f} ms ({sql['changed']} rows changed), "
+          f"re-run {sql['reapply_s'] * 1000:.0f} ms ({sql['reapply_changed']} changed)")
+    print(f"Hits: {result['hits']}")
+    print(f"Results written to {save_results('rules', {'rules': result}, args.out)}")
+
+if __name__ == "__main__":
+    main()
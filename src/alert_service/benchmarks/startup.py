@@ -0,0 +1,85 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from src.alert_service.benchmarks.results import save_results
+
+APP_MODULE = "src.alert_service.backend.app"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def import_profile(module: str = APP_MODULE, top: int = 15) -> dict:
+    """
+    Imports `module` in a fresh interpreter with -X importtime and returns its
+    cumulative import time plus the slowest modules it pulled in directly.
+    """
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=env, capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(2)), len(match.group(3))))
+    total_us = next(cumulative for name, cumulative, _ in entries if name == module)
+    # Direct children of the module are indented one level (three spaces) below it.
+    children = [(name, cumulative) for name, cumulative, depth in entries if depth == 3]
+    children.sort(key=lambda item: item[1], reverse=True)
+    return {"total_ms": total_us / 1000, "top_imports_ms": {name: us / 1000 for name, us in children[:top]}}
+
+def time_to_ready(probe: str, port: int) -> float:
+    """
+    Starts the backend with uvicorn on a fresh database and returns the
+    seconds until `probe` answers 200.
+    """
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/startup.db", PYTHONPATH=os.getcwd())
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{APP_MODULE}:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < 60:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}{probe}", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                pass
+            if process.poll() is not None:
+                raise RuntimeError("Backend exited during startup.")
+            time.sleep(0.02)
+        raise RuntimeError("Backend did not become ready within 60s.")
+    finally:
+        process.terminate()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend cold-start profile: import time and time to ready.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--probe", default="/readyz", help="Path polled until it answers 200.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: benchmarks/results/).")
+    args = parser.parse_args()
+
+    imports = [import_profile() for _ in range(args.runs)]
+    ready = [time_to_ready(args.probe, args.port) for _ in range(args.runs)]
+    results = {
+        "import_ms": {"median_us": statistics.median(run["total_ms"] for run in imports) * 1000,
+                      "runs": [run["total_ms"] for run in imports]},
+        "time_to_ready_ms": {"median_us": statistics.median(ready) * 1e6, "runs": [s * 1000 for s in ready]},
+        "top_imports_ms": imports[-1]["top_imports_ms"],
+    }
+    print(f"Import {APP_MODULE}: {results['import_ms']['median_us'] / 1000:.0f} ms (median of {args.runs})")
+    for name, ms in results["top_imports_ms"].items():
+        print(f"  {name:<55} {ms:8.1f} ms")
+    print(f"Time to {args.probe} = 200: {results['time_to_ready_ms']['median_us'] / 1000:.0f} ms")
+    print(f"Results written to {save_results('startup', results, args.out)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.alert_service.backend.database.enums import CHANNEL_COLUMNS, CODED_COLUMNS
+from src.alert_service.backend.database.migrations import LEGACY_ALERT_ENTRIES_DDL, migrate_compact_schema
+from src.alert_service.backend.database.models import AlertEntry
+from src.alert_service.backend.push.broadcaster import DELTA_FIELDS, encode_message, entry_delta
+from src.alert_service.benchmarks.payloads import random_address, random_symbol
+from src.alert_service.benchmarks.results import save_results
+
+def fill_legacy_table(engine, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    labels = {column: [m.label for m in enum_cls] for column, (_, enum_cls) in CODED_COLUMNS.items()}
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_ALERT_ENTRIES_DDL))
+        conn.execute(text("CREATE INDEX ix_alert_entries_address ON alert_entries (address)"))
+        conn.execute(text("CREATE INDEX ix_alert_entries_symbol ON alert_entries (symbol)"))
+        records = []
+        for _ in range(rows):
+            price = 10 ** rng.uniform(-6, -2)
+            record = {
+                "address": random_address(rng), "symbol": random_symbol(rng),
+                "first_alert_price": price, "current_price": price * rng.uniform(0.5, 5),
+                "alert_count": rng.randint(1, 40), "first_alert_time": now - timedelta(hours=rng.uniform(0, 48)),
+                "active_watchlist": True, "volume_5min": rng.uniform(1e3, 5e3), "volume_1hr": rng.uniform(1e4, 5e4),
+            }
+            record.update({column: rng.choice(choices) for column, choices in labels.items()})
+            record.update({column: rng.random() < 0.2 for column in CHANNEL_COLUMNS})
+            records.append(record)
+        columns = list(records[0])
+        conn.execute(
+            text(f"INSERT INTO alert_entries ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+            records,
+        )
+
+def sqlite_bytes(engine) -> int:
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+        page_count = conn.execute(text("PRAGMA page_count")).scalar()
+        page_size = conn.execute(text("PRAGMA page_size")).scalar()
+    return page_count * page_size
+
+def legacy_delta(entry) -> dict:
+    """
+    The delta as it was sent before compaction: string labels and five
+    separate channel Booleans instead of codes and a bitmask.
+    """
+    delta = entry_delta(entry)
+    delta.pop("channel_flags")
+    for column in CODED_COLUMNS:
+        if column in delta:
+            delta[column] = getattr(entry, column)
+    delta.update({column: getattr(entry, column) for column in CHANNEL_COLUMNS})
+    return delta
+
+def run(rows: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "storage_bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    fill_legacy_table(engine, rows)
+    legacy_bytes = sqlite_bytes(engine)
+    migrate_compact_schema(engine)
+    compact_bytes = sqlite_bytes(engine)
+
+    db = sessionmaker(bind=engine)()
+    entries = db.query(AlertEntry).limit(1000).all()
+    legacy_json = sum(len(encode_message(legacy_delta(e))) for e in entries) / len(entries)
+    compact_json = sum(len(encode_message(entry_delta(e))) for e in entries) / len(entries)
+    db.close()
+    return {
+        "rows": rows,
+        "legacy_db_bytes_per_row": legacy_bytes / rows,
+        "compact_db_bytes_per_row": compact_bytes / rows,
+        "db_saving": 1 - compact_bytes / legacy_bytes,
+        "legacy_delta_bytes": legacy_json,
+        "compact_delta_bytes": compact_json,
+        "delta_saving": 1 - compact_json / legacy_json,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Row-size and transfer savings of the compact AlertEntry schema.")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    result = run(args.rows)
+    print(f"DB:    {result['legacy_db_bytes_per_row']:.1f} -> {result['compact_db_bytes_per_row']:.1f} bytes/row "
+          f"({result['db_saving']:.1%} smaller)")
+    print(f"Delta: {result['legacy_delta_bytes']:.1f} -> {result['compact_delta_bytes']:.1f} bytes/message "
+          f"({result['delta_saving']:.1%} smaller)")
+    print(f"Results written to {save_results('storage', {'compact_schema': result}, args.out)}")
+
+if __name__ == "__main__":
+    main()
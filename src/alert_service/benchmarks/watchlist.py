@@ -0,0 +1,146 @@
+import argparse
+import os
+import tempfile
+import time
+
+import panel as pn
+from panel.io.state import set_curdoc
+
+from src.alert_service.benchmarks.dashboard_payload import attach, document_bytes, wire_bytes
+from src.alert_service.benchmarks.results import save_results
+from src.alert_service.frontend import watchlist
+from src.alert_service.frontend.watchlist_view import TAG_EMOJIS, WatchlistAccordion
+
+def make_watchlist(tokens: int):
+    tags = list(TAG_EMOJIS)
+    return [{"address": f"0x{i:040x}", "symbol": f"TKN{i}", "notes": "", "tags": [tags[i % len(tags)]]}
+            for i in range(tokens)]
+
+def legacy_accordion(entries, on_select):
+    """
+    The old get_watchlist_accordion: a new Tabs with a new Button per tagged
+    token, built on every watchlist change.
+    """
+    tab_items = []
+    for cat, emoji in TAG_EMOJIS.items():
+        coins = [entry for entry in entries if cat in entry.get("tags", [])]
+        if coins:
+            buttons = []
+            for coin in coins:
+                address = coin.get("address")
+                btn = pn.widgets.Button(name=coin.get("symbol", address), width=200, height=30,
+                                        css_classes=[f"watchlist-button-{cat}"])
+                btn.on_click(lambda event, address=address: on_select(address))
+                buttons.append(btn)
+            content = pn.Column(*buttons, sizing_mode="stretch_width")
+        else:
+            content = pn.pane.Markdown("No coins in this category.", sizing_mode="stretch_width")
+        tab_items.append((emoji, content))
+    return pn.Tabs(*tab_items, margin=7)
+
+def edits(entries):
+    """
+    The watchlist changes a user makes: re-tag one token, add one, remove one.
+    Each step returns the new entries.
+    """
+    def retag(current):
+        changed = [dict(entry) for entry in current]
+        changed[len(changed) // 2]["tags"] = ["hawk"]
+        return changed
+
+    def add(current):
+        return current + [{"address": "0x" + "f" * 40, "symbol": "NEW", "notes": "", "tags": ["untagged"]}]
+
+    def remove(current):
+        return current[:1] + current[2:]
+
+    return [("retag", retag), ("add", add), ("remove", remove)]
+
+def measure(render, doc, events, entries) -> dict:
+    result = {}
+    current = entries
+    for name, step in edits(entries):
+        current = step(current)
+        events.clear()
+        started = time.perf_counter()
+        # As in a server callback: curdoc is set and Panel holds the document
+        with set_curdoc(doc):
+            doc.hold("combine")
+            render(current)
+            doc.unhold()
+        elapsed = time.perf_counter() - started
+        result[name] = {"server_ms": elapsed * 1000, "bytes": wire_bytes(events)}
+    return result
+
+def time_reads(entries, repeat: int = 200) -> dict:
+    """
+    Looking up the selected token: re-parsing the JSON file, as every
+    selection used to, vs get_watchlist_entry() on the cache; plus a whole
+    load_watchlist() from the cache.
+    """
+    saved_path = watchlist.WATCHLIST_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        watchlist.WATCHLIST_PATH = os.path.join(tmp, "watchlist.json")
+        try:
+            watchlist.save_watchlist(entries)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                watchlist._read_watchlist()
+            disk = (time.perf_counter() - started) / repeat
+            address = entries[len(entries) // 2]["address"]
+            started = time.perf_counter()
+            for _ in range(repeat):
+                watchlist.get_watchlist_entry(address)
+            lookup = (time.perf_counter() - started) / repeat
+            started = time.perf_counter()
+            for _ in range(repeat):
+                watchlist.load_watchlist()
+            cached = (time.perf_counter() - started) / repeat
+        finally:
+            watchlist.WATCHLIST_PATH = saved_path
+    return {"disk_read_ms": disk * 1000, "cached_lookup_ms": lookup * 1000, "cached_load_ms": cached * 1000}
+
+def run(tokens: int) -> dict:
+    """
+    Server time and PATCH-DOC bytes of one watchlist edit with `tokens`
+    watched: the old accordion rebuilt from scratch vs keyed buttons.
+    """
+    entries = make_watchlist(tokens)
+
+    holder = pn.Column(legacy_accordion(entries, print))
+    legacy_doc, legacy_events, legacy_build = attach(holder)
+
+    def legacy_render(current):
+        # A pn.depends function's output replaced wholesale, as the old pane did
+        holder.objects = [legacy_accordion(current, print)]
+
+    keyed = WatchlistAccordion(print)
+    keyed.update(entries)
+    keyed_doc, keyed_events, keyed_build = attach(keyed.layout)
+
+    return {
+        "tokens": tokens,
+        "initial_bytes": {"rebuild": document_bytes(legacy_doc), "keyed": document_bytes(keyed_doc)},
+        "rebuild": measure(legacy_render, legacy_doc, legacy_events, entries),
+        "keyed": measure(keyed.update, keyed_doc, keyed_events, entries),
+        "reads": time_reads(entries),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Watchlist re-render cost, full rebuild vs keyed buttons.")
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    result = run(args.tokens)
+    print(f"watchlist of {result['tokens']} tokens:")
+    for mode in ("rebuild", "keyed"):
+        for name, step in result[mode].items():
+            print(f"  {mode:8s} {name:7s} {step['server_ms']:8.1f} ms server  {step['bytes'] / 1e3:8.1f} kB")
+    reads = result["reads"]
+    print(f"  selection lookup: {reads['disk_read_ms']:.2f} ms from disk, {reads['cached_lookup_ms']:.3f} ms cached "
+          f"(whole load_watchlist from cache {reads['cached_load_ms']:.2f} ms)")
+    print(f"Results written to {save_results('watchlist', result, args.out)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# analytics_tab.py
+
+import os
+
+import httpx
+import pandas as pd
+import panel as pn
+
+from src.alert_service.frontend.http_client import http_client
+
+# Backend /analytics endpoint; override via environment variable.
+ANALYTICS_URL = os.environ.get("ANALYTICS_URL", "http://172.184.170.40:8000/analytics")
+
+# ---------------------
+# Query name -> (title, columns to show)
+ANALYTICS_QUERIES = {
+    "hit_rate": ("Hit rate by channel", ["channel", "entries", "hit_rate", "median_ath", "mean_ath"]),
+    "multipliers": ("ATH multiplier by alert count", ["bucket", "entries", "p25", "p50", "p75", "p90"]),
+    "time_to_ath": ("Time to ATH by alert count (minutes)", ["bucket", "entries", "at_first_alert", "median_minutes", "p90_minutes"]),
+}
+
+# Validators of the last response per (query, params), for conditional GETs
+analytics_validators = {}
+
+async def fetch_analytics(query: str, **params) -> tuple[pd.DataFrame | None, float | None]:
+    """
+    Returns the rows of one /analytics query as a DataFrame and the server-side
+    query time. The DataFrame is None when the result has not changed since
+    the last fetch with the same params.
+    """
+    validators = analytics_validators.setdefault((query, tuple(sorted(params.items()))), {})
+    try:
+        response = await http_client.get(f"{ANALYTICS_URL}/{query}", params=params, validators=validators)
+        if response is None:
+            return None, None
+        result = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        validators.clear()
+        print(f"Error fetching analytics {query}: {e}")
+        return pd.DataFrame(columns=ANALYTICS_QUERIES[query][1]), None
+    return pd.DataFrame(result["rows"], columns=ANALYTICS_QUERIES[query][1]), result.get("seconds")
+
+# ---------------------
+# Widgets
+hit_threshold = pn.widgets.FloatInput(name="Hit multiplier", value=2.0, step=0.5, start=1.0, width=150)
+analytics_refresh_button = pn.widgets.Button(name="Refresh Analytics", button_type="default")
+analytics_status = pn.pane.Markdown("", sizing_mode="stretch_width")
+analytics_tables = {
+    query: pn.widgets.Tabulator(pd.DataFrame(columns=columns), show_index=False, disabled=True,
+                                layout="fit_data_stretch", sizing_mode="stretch_width")
+    for query, (_, columns) in ANALYTICS_QUERIES.items()
+}
+
+async def refresh_analytics(event=None):
+    timings = []
+    unchanged = []
+    for query, table in analytics_tables.items():
+        params = {"threshold": hit_threshold.value} if query == "hit_rate" else {}
+        df, seconds = await fetch_analytics(query, **params)
+        if df is None:
+            # Same result as shown: skip the re-render
+            unchanged.append(query)
+            continue
+        table.value = df
+        if seconds is not None:
+            timings.append(f"{query} {seconds * 1000:.0f} ms")
+    if timings or unchanged:
+        status = [f"Server query time: {', '.join(timings)}"] if timings else []
+        status += [f"unchanged: {', '.join(unchanged)}"] if unchanged else []
+        analytics_status.object = "; ".join(status)
+    else:
+        analytics_status.object = "Analytics unavailable."
+
+analytics_refresh_button.on_click(refresh_analytics)
+hit_threshold.param.watch(refresh_analytics, "value")
+
+def get_analytics_tab():
+    controls = pn.Row(hit_threshold, pn.layout.HSpacer(), analytics_refresh_button, sizing_mode="stretch_width")
+    sections = [pn.Column(f"### {title}", analytics_tables[query], sizing_mode="stretch_width")
+                for query, (title, _) in ANALYTICS_QUERIES.items()]
+    pn.state.execute(refresh_analytics)
+    return pn.Column(controls, analytics_status, *sections, sizing_mode="stretch_width")
@@ -1,19 +1,34 @@
 import panel as pn
 import pandas as pd
 import numpy as np
-import requests
 import os
 import signal
+import html
 import sys
+import time
 import asyncio
+import threading
 from bokeh.models.widgets.tables import NumberFormatter, BooleanFormatter
-from src.alert_service.frontend.websocket_client import set_update_callback, run_ws_client_in_background, websocket_shutdown
+from src.alert_service.frontend.websocket_client import set_update_callback, set_batch_update_callback, set_resync_callback, add_batch_listener, run_ws_client_in_background, websocket_shutdown
+from src.alert_service.frontend.price_panel import price_feed
+from src.alert_service.frontend.deltas import apply_deltas
+from src.alert_service.frontend.transforms import update_derived_columns
+from src.alert_service.frontend.http_client import http_client
+from src.alert_service.frontend.snapshot import fetch_snapshot, load_snapshot, prepare_snapshot
+from src.alert_service.frontend.timing import DASHBOARD_TIMING, mark, timed, print_timing_report
+from src.alert_service.frontend.table_view import (
+    HIDDEN_KEY_COLUMNS, TIME_AGO_COLUMNS, TIME_AGO_FORMATTER, PagedTabulator, bind_symbol_filter, row_details,
+    sync_rows, visible_frame,
+)
 from watchlist import load_watchlist, add_to_watchlist, remove_from_watchlist, update_watchlist_notes
 from watchlist_tab import get_watchlist_tab, get_watchlist_accordion, refresh_watchlist
+from analytics_tab import get_analytics_tab
 from shared_data import set_local_df
-from token_crawler import TokenCrawler
 from concurrent.futures import ThreadPoolExecutor
 
+# Start of this session: panel serve runs the script once per browser session
+SESSION_STARTED = time.perf_counter()
+
 NO_HEADER_RAW_CSS = """
 nav#header {
     display: none;
@@ -39,122 +54,88 @@ MAXIMIZE_FIRST_PANEL = """
 pn.extension('tabulator', sizing_mode="stretch_height", raw_css=[NO_HEADER_RAW_CSS, MAXIMIZE_FIRST_PANEL])
 
 REST_ALERTS_URL = os.environ.get("ALERTS_URL", "http://172.184.170.40:3000/alerts")
-token_crawler = TokenCrawler(headless=True)
 
-# --- Data Loading and Processing Functions (mostly unchanged) ---
-def load_data():
-    try:
-        response = requests.get(REST_ALERTS_URL)
-        response.raise_for_status()
-        data = response.json()
-        print(f"Data loaded with {len(data)} alerts")
-        df = pd.DataFrame(data)
-    except Exception as e:
-        print("Error fetching alerts from REST endpoint:", e)
-        df = pd.DataFrame() # Start with empty if error
-
-    if df.empty:
-        print("Loaded empty DataFrame, returning early.")
-        return df # Return empty df if fetch failed or returned no data
-
-    timestamp_cols = ['first_alert_time', 'last_alert_time', 'last_update_time']
-    for col in timestamp_cols:
-        if col in df.columns:
-            # Ensure conversion happens even if data is mixed type
-            df[col] = pd.to_datetime(df[col], utc=True, errors='coerce')
-
-    # Drop rows where essential columns might be NaN after coerce
-    df.dropna(subset=['address', 'chain'], inplace=True) # Ensure address/chain exist
-
-    df = alter_data(df)
-    col_order = [
-        "favorited",
-        "symbol",
-        "alert_count",
-        "last_update_time_ago",
-        "first_alert_time_ago",
-        "ath_multiplier",
-        "curr_multiplier",
-        "first_alert_price",
-        "current_price",
-        "avg_purchase_size",
-        "chain"
-    ]
-    # Ensure all columns in col_order actually exist before reordering
-    existing_cols_in_order = [col for col in col_order if col in df.columns]
-    df = reorder_and_rename_df(df, existing_cols_in_order)
+# Created on first use: building it sets up Selenium, which only the token pane needs
+token_crawler = None
+token_crawler_lock = threading.Lock()
+
+def get_token_crawler():
+    global token_crawler
+    with token_crawler_lock:
+        if token_crawler is None:
+            from token_crawler import TokenCrawler
+            token_crawler = TokenCrawler(headless=True)
+    return token_crawler
+
+# ETag / Last-Modified / body digest of this session's last snapshot, for conditional GETs
+snapshot_validators = {}
+
+# --- Data Loading and Processing Functions ---
+@timed
+async def load_data():
+    """Re-fetches the snapshot for the refresh button and WS resyncs; None when it has not changed."""
+    raw = await fetch_snapshot(REST_ALERTS_URL, snapshot_validators)
+    if raw is None:
+        return None
+    df = await asyncio.get_running_loop().run_in_executor(None, prepare_data, raw)
     print(f"Data processed with {len(df)} alerts remaining")
     return df
 
-def reorder_and_rename_df(df, first_columns, rename_map=None):
-    # Defensive check for empty df
-    if df.empty:
-        return df
-    # Ensure first_columns exist in df before using them
-    valid_first_columns = [col for col in first_columns if col in df.columns]
-    remaining_columns = [col for col in df.columns if col not in valid_first_columns]
-    new_order = valid_first_columns + remaining_columns
-    df = df[new_order]
-    if rename_map:
-        df = df.rename(columns=rename_map)
-    return df
-
-def alter_data(df):
-    if df.empty:
-        return df
-
-    # Add dexscreener link column
-    if 'address' in df.columns and 'chain' in df.columns:
-         # Ensure chain is suitable for URL (e.g., lowercase) - adjust if needed
-        df['dexscreener_link'] = df.apply(
-            lambda row: f"https://dexscreener.com/{str(row['chain']).lower()}/{row['address']}" if pd.notna(row['address']) and pd.notna(row['chain']) else None,
-            axis=1
-        )
-
-    # Initialize favorited column
-    watchlist = load_watchlist()
-    watchlist_addresses = {entry.get("address") for entry in watchlist}
-    if 'address' in df.columns:
-        df['favorited'] = df['address'].apply(lambda addr: addr in watchlist_addresses if pd.notna(addr) else False)
-    else:
-        df['favorited'] = False # Add column even if address doesn't exist
-
-    # Add time ago columns
-    timestamp_cols = ['first_alert_time', 'last_alert_time', 'last_update_time']
-    now = pd.Timestamp.now(tz='UTC') # Calculate 'now' once for efficiency
-    for col in timestamp_cols:
-        if col in df.columns:
-            df[f'{col}_ago'] = df[col].apply(lambda dt: format_timedelta(dt, now))
-
-    # Calculate avg_purchase_size
-    if 'purchase_size' in df.columns and 'alert_count' in df.columns:
-        df['avg_purchase_size'] = np.where(df['alert_count'] > 0, df['purchase_size'] / df['alert_count'], 0)
-    else:
-         df['avg_purchase_size'] = 0 # Add column even if source cols don't exist
+def watchlist_addresses():
+    return {entry.get("address") for entry in load_watchlist()}
 
-    return df
+@timed
+def prepare_data(df, addresses=None):
+    # Initialize favorited column from the watchlist
+    if addresses is None:
+        addresses = watchlist_addresses()
+    return prepare_snapshot(df, addresses)
 
-def format_timedelta(dt_val, now): # Pass 'now' for efficiency
-    if pd.isnull(dt_val):
-        return "N/A" # Or None or ''
-    # Ensure dt_val is timezone-aware (like now) or make now naive
-    if dt_val.tzinfo is None:
-        dt_val = dt_val.tz_localize('UTC') # Assume UTC if naive, adjust if needed
-
-    diff = now - dt_val
-    total_minutes = int(diff.total_seconds() // 60)
-    if total_minutes < 0: # Handle potential clock skew or future dates
-        return "Future?"
-    hours = total_minutes // 60
-    minutes = total_minutes % 60
-    return f"{hours:02d}:{minutes:02d}"
-
-def refresh_data(event=None): # Added event=None for compatibility
+async def initial_load():
+    """
+    Loads the snapshot once the layout is on screen. The first page is shown
+    as soon as its rows are prepared and the rest is streamed in; the WS
+    client starts once local_df holds the whole snapshot.
+    """
+    global local_df
+    first_paint = mark("first_paint", SESSION_STARTED)
+    loop = asyncio.get_running_loop()
+    addresses = await loop.run_in_executor(None, watchlist_addresses)
+    first_rows = {}
+
+    def on_chunk(chunk, first):
+        global local_df
+        if first:
+            local_df = chunk
+            data_table.value = visible_frame(local_df)
+            data_table.loading = False
+            preload_chart(local_df)
+            first_rows["seconds"] = mark("first_rows", SESSION_STARTED)
+        else:
+            local_df = pd.concat([local_df, chunk])
+            # Remote pagination: only the page count changes in the browser
+            data_table.stream(visible_frame(chunk), reset_index=False, follow=False)
+
+    rows = await load_snapshot(lambda: fetch_snapshot(REST_ALERTS_URL, snapshot_validators),
+                               lambda chunk: prepare_data(chunk, addresses),
+                               on_chunk, data_table.page_size)
+    data_table.loading = False
+    set_local_df(local_df)
+    loaded = mark("snapshot_loaded", SESSION_STARTED)
+    first = f"first rows {first_rows['seconds'] * 1000:.0f} ms, " if first_rows else ""
+    print(f"Startup: first paint {first_paint * 1000:.0f} ms, {first}{rows} rows loaded in {loaded * 1000:.0f} ms")
+    # Started after the snapshot, so deltas are applied to loaded rows
+    run_ws_client_in_background()
+
+async def refresh_data(event=None): # Added event=None for compatibility
     global local_df
-    new_df = load_data()
+    new_df = await load_data()
+    if new_df is None:
+        print("Snapshot unchanged since the last load. Table not re-rendered.")
+        return
     if not new_df.empty:
         local_df = new_df
-        data_table.value = local_df.copy() # Update table value
+        data_table.value = visible_frame(local_df) # Remote pagination sends only the first page
         set_local_df(local_df) # Update shared data
         print("Data refreshed.")
         # Optionally, update chart if a row was previously selected
@@ -164,158 +145,40 @@ def refresh_data(event=None): # Added event=None for compatibility
     else:
         print("Refresh resulted in empty data. Table not updated.")
 
-# Filter function needs refinement - currently just re-runs alter_data
-# A proper filter would typically subset local_df based on filter input
-def filter_data(event=None):
-    global local_df
-    # Example: Filter by symbol based on symbol_filter widget
-    filter_value = symbol_filter.value_input.strip().lower() # Use value_input for TextInput
-    if filter_value:
-        # Make sure 'symbol' column exists and handle potential NaNs
-        if 'symbol' in local_df.columns:
-             filtered_df = local_df[local_df['symbol'].str.lower().str.contains(filter_value, na=False)]
-        else:
-            filtered_df = local_df.copy() # Or empty df if symbol essential
-    else:
-        filtered_df = local_df.copy() # Show all if filter is empty
-
-    # Re-apply time formatting to the filtered view
-    timestamp_cols = ['first_alert_time', 'last_alert_time', 'last_update_time']
-    now = pd.Timestamp.now(tz='UTC')
-    for col in timestamp_cols:
-        if col in filtered_df.columns:
-             filtered_df[f'{col}_ago'] = filtered_df[col].apply(lambda dt: format_timedelta(dt, now))
-
-    # Update the table with the filtered data
-    data_table.value = filtered_df
-    # Do NOT update local_df here, local_df should hold the *full* dataset
-    # set_local_df(local_df) # This line should maybe be removed from filter_data
+@timed
+def update_callback(payload):
+    batch_update_callback([payload])
 
-def timestamp_update():
+@timed
+def batch_update_callback(payloads):
+    """Applies a batch of WS deltas to local_df in one DataFrame update."""
     global local_df
     if local_df.empty:
         return
-    now = pd.Timestamp.now(tz='UTC')
-    timestamp_cols = ['first_alert_time', 'last_alert_time', 'last_update_time']
-    needs_update = False
-    # Create a copy to modify, then assign back if needed
-    df_copy = data_table.value.copy() # Update the *displayed* data
-    if df_copy.empty: # If table is empty (e.g. after filtering everything)
-        return
 
-    for col in timestamp_cols:
-        if col in local_df.columns: # Check against original df columns
-            col_ago = f'{col}_ago'
-            # Apply update to the table's current value (could be filtered)
-            if col_ago in df_copy.columns and col in df_copy.columns:
-                 df_copy[col_ago] = df_copy[col].apply(lambda dt: format_timedelta(dt, now))
-                 needs_update = True
-
-    if needs_update:
-        # Update the table's value to refresh display
-        data_table.value = df_copy
-
-def timestamp_callback(event=None):
-    timestamp_update()
-
-def format_timestamp_from_seconds(seconds):
-    try:
-        # Attempt conversion, handle potential errors (non-numeric, etc.)
-        return pd.to_datetime(seconds, unit='s', utc=True, errors='coerce')
-    except (ValueError, TypeError):
-        return pd.NaT # Return NaT on error
-
-def update_callback(payload):
-    global local_df
-    address = payload.get("address")
-    if not address or local_df.empty:
+    updated, missing = apply_deltas(local_df, payloads)
+    if missing:
+        print(f"{len(missing)} addresses not in local_df; performing full refresh.")
+        asyncio.ensure_future(refresh_data()) # Reloads and updates the table without blocking the loop
         return
 
-    # Find index in the *master* DataFrame
-    matches = local_df.index[local_df['address'] == address].tolist()
-
-    if not matches:
-        print(f"Address {address} not in local_df; performing full refresh.")
-        # Consider if a full refresh is always desired here, or maybe just add the new row
-        refresh_data() # This reloads and updates the table
-    else:
-        idx = matches[0] # Assuming unique addresses
-        update_occurred = False
-        timestampcols = ['first_alert_time', 'last_alert_time', 'last_update_time']
-
-        for key, val in payload.items():
-            if key != "address" and key in local_df.columns:
-                original_value = local_df.at[idx, key]
-                try:
-                    if key in timestampcols:
-                        new_val = format_timestamp_from_seconds(val)
-                        # Check if conversion was successful before assigning
-                        if pd.isna(new_val):
-                             print(f"Skipping timestamp update for {key} due to conversion error for value: {val}")
-                             continue # Skip this key
-                    else:
-                        # Try to cast to the column's type to avoid mixed types
-                        col_type = local_df[key].dtype
-                        try:
-                             new_val = pd.Series([val]).astype(col_type)[0]
-                        except Exception:
-                             new_val = val # Assign as is if casting fails
-
-                    # Only update if value actually changed
-                    # Handle NaT/None comparison carefully
-                    if pd.isna(original_value) and pd.isna(new_val):
-                         changed = False
-                    elif pd.isna(original_value) or pd.isna(new_val):
-                         changed = True
-                    else:
-                         changed = original_value != new_val
-
-                    if changed:
-                        print(f"Updating {key} for address {address} from '{original_value}' to '{new_val}'")
-                        local_df.at[idx, key] = new_val
-                        update_occurred = True
-                    # else:
-                    #     print(f"Skipping update for {key} - value unchanged: {val}")
-
-                except Exception as e:
-                    print(f"Error processing update for key {key}, value {val}: {e}")
-            # else:
-                # print(f"Skipping key {key} (not in df or is address)")
-
-        if update_occurred:
-            # Re-apply dependent calculations like 'time_ago' and 'avg_purchase_size' for the updated row
-            # This is complex to do efficiently in place. Re-running alter_data might be simpler if performance allows.
-            # Quick fix: recalculate time_ago for the updated row
-            now = pd.Timestamp.now(tz='UTC')
-            for col in timestampcols:
-                 if col in local_df.columns:
-                    dt_val = local_df.at[idx, col]
-                    local_df.at[idx, f'{col}_ago'] = format_timedelta(dt_val, now)
-
-            if 'purchase_size' in local_df.columns and 'alert_count' in local_df.columns:
-                 alert_count = local_df.at[idx, 'alert_count']
-                 purchase_size = local_df.at[idx, 'purchase_size']
-                 local_df.at[idx, 'avg_purchase_size'] = np.where(alert_count > 0, purchase_size / alert_count, 0)
-
-
-            # Refresh the table *view* based on the current filter
-            filter_data() # This will apply current filters to the updated local_df
-            set_local_df(local_df) # Update shared data
-            print(f"Updated row for address {address} via WS.")
-
-            # Refresh watchlist if the favorited status might have changed (unlikely via WS?)
-            # refresh_watchlist() # Uncomment if needed
-
+    if updated:
+        update_derived_columns(local_df, updated)
+        # Send only the changed visible cells; rows off the current page are updated server-side only
+        sync_rows(data_table, local_df, updated)
+        set_local_df(local_df) # Update shared data
+        print(f"Applied {len(payloads)} WS deltas to {len(updated)} rows.")
 
 def shutdown_handler(signum, frame):
     print("Shutting down dashboard gracefully...")
-    if token_crawler:
+    if token_crawler is not None:
         token_crawler.cleanup()
     # Ensure websocket shutdown is called, ideally awaiting it if possible
     # asyncio.run(websocket_shutdown()) # This might block, use loop if available
     loop = asyncio.get_event_loop()
     if loop.is_running():
         loop.create_task(websocket_shutdown())
+        loop.create_task(http_client.aclose()) # Pooled connections belong to this loop
     else:
         asyncio.run(websocket_shutdown()) # Fallback if loop isn't running
     print("Shutdown complete.")
@@ -371,6 +234,7 @@ def update_details_pane(row_index):
              chain = "solana" # Default assumption
 
     print(f"Updating details for address: {address} on chain: {chain} (Row index in view: {row_index})")
+    details_pane.object = render_details(row_details(local_df, address))
 
     # Set loading message first
     embed_pane.object = """
@@ -409,9 +273,16 @@ def update_details_pane(row_index):
               token_pane.object = "<p>Token info not available for this chain/address.</p>"
 
 
-async def load_embed_pane(chain, address):
-    """Loads the Dexscreener embed."""
-    embed_html = f"""
+def render_details(details):
+    """HTML list of the selected row's detail fields (not sent with the table)."""
+    if not details:
+        return ""
+    items = "".join(f"<li><b>{html.escape(str(key))}</b>: {html.escape(str(value))}</li>" for key, value in details.items())
+    return f"<ul style='padding-left: 1em; margin: 0.5em 0;'>{items}</ul>"
+
+def embed_html(chain, address):
+    """Dexscreener chart iframe for a token."""
+    return f"""
     <style>
       #dexscreener-embed {{
         position: relative; width: 100%; height: 100%; /* Use 100% height */
@@ -426,7 +297,21 @@ async def load_embed_pane(chain, address):
       <iframe src="https://dexscreener.com/{chain}/{address}?embed=1&loadChartSettings=1&trades=0&chartLeftToolbar=0&chartTheme=dark&theme=dark&chartStyle=1&chartType=usd&interval=5"></iframe>
     </div>
     """
-    embed_pane.object = embed_html
+
+def preload_chart(df):
+    """Shows the first row's chart until a row is selected."""
+    if df.empty:
+        return
+    first_row = df.iloc[0]
+    address = first_row.get("address")
+    chain = first_row.get("chain", "solana") # Default if missing
+    if address and chain:
+        embed_pane.object = embed_html(chain, address)
+        print(f"Preloading chart for first row: {address}")
+
+async def load_embed_pane(chain, address):
+    """Loads the Dexscreener embed."""
+    embed_pane.object = embed_html(chain, address)
     print(f"Embed updated for: {address}")
 
 async def load_token_pane(address):
@@ -438,8 +323,9 @@ async def load_token_pane(address):
         # Example using ThreadPoolExecutor if get_pane_data is blocking
         loop = asyncio.get_running_loop()
         with ThreadPoolExecutor() as pool:
+             # The crawler is created here on first use, off the event loop
              token_data_html = await loop.run_in_executor(
-                 pool, token_crawler.get_pane_data, address
+                 pool, lambda: get_token_crawler().get_pane_data(address)
              )
         token_pane.object = token_data_html
         print(f"Token pane updated for: {address}")
@@ -483,10 +369,8 @@ def toggle_favorite_callback(event):
             remove_from_watchlist(address)
             print(f"Removed {symbol} ({address}) from watchlist.")
 
-        # Update the displayed table data directly for immediate feedback
-        # Need to get the index within the *current* table view again
-        # This is tricky if sorting/filtering is active. Easiest is to refresh the table view.
-        filter_data() # Re-applies filters/sorts to updated local_df
+        # Update the displayed cell for immediate feedback
+        data_table.patch({"favorited": [(master_index, bool(new_value))]})
 
         # Update shared data and refresh the separate watchlist view
         set_local_df(local_df)
@@ -528,10 +412,9 @@ def handle_double_click(event):
     update_details_pane(event.row)
 
 
-# --- Load Initial Data ---
-local_df = load_data()
-print(f"Setting initial local_df on dashboard startup. Rows: {len(local_df)}")
-set_local_df(local_df.copy() if not local_df.empty else pd.DataFrame()) # Pass copy or empty
+# --- Initial Data ---
+# Empty until initial_load runs after the layout is served
+local_df = pd.DataFrame()
 
 
 # --- Define Table Formatters ---
@@ -546,40 +429,34 @@ formatters = {
     },
     'ath_multiplier': NumberFormatter(format="0.0"),
     'curr_multiplier': NumberFormatter(format="0.0"),
-    'avg_purchase_size': NumberFormatter(format="0.0")
+    'avg_purchase_size': NumberFormatter(format="0.0"),
+    # Rendered as "HH:MM" ago and kept current by the browser; no server callback
+    **{col: TIME_AGO_FORMATTER for col in TIME_AGO_COLUMNS},
 }
 
 # --- Create Widgets and Panes ---
-data_table = pn.widgets.Tabulator(
-    local_df.copy() if not local_df.empty else pd.DataFrame(), # Start with data or empty DF
-    pagination='local',
+# Remote pagination: the browser holds one page of the visible columns only
+data_table = PagedTabulator(
+    pd.DataFrame(), # Filled by initial_load
+    loading=True,
     page_size=30, # Adjust page size if needed
     layout='fit_columns',
     text_align='center',
     show_index=False,
     disabled=True,
     selectable=True,
-    hidden_columns=[ # List columns to hide
-        'address', 'dexscreener_link', 'channel_HighConviction', 'channel_EarlyAlpha',
-        'channel_5xSMWallet', 'channel_SmartFollowers', 'channel_KimchiTest',
-        'isMoni', 'isNansen', 'first_alert_time', 'last_alert_time', 'last_update_time',
-        'token_age', 'twitter_sentiment', 'rug_bundle_check', 'macd_line', 'macd_short', 'macd_long',
-        'sm_buy_count', 'purchase_size', 'notes', 'website', 'twitter', 'summary',
-        'active_watchlist', 'volume_5min', 'volume_1hr',
-        # Hide original timestamp columns if _ago versions are preferred
-        # 'first_alert_time', 'last_alert_time', 'last_update_time'
-    ],
+    hidden_columns=HIDDEN_KEY_COLUMNS, # Other detail fields are never sent; see details_pane
     titles={ # Friendly column names
         "alert_count": "Count",
         "symbol": "Symbol",
-        "first_alert_time_ago": "First Alert",
-        "last_alert_time_ago": "Last Alert",
+        "first_alert_time": "First Alert",
+        "last_alert_time": "Last Alert",
         "first_alert_price": "First Price",
         "current_price": "Current Price",
         "ath_multiplier": "ATH",
         "curr_multiplier": "CURR",
         "avg_purchase_size": "Avg Buy $",
-        "last_update_time_ago": "Last Update",
+        "last_update_time": "Last Update",
         "favorited": "Fav",
         "chain": "Chain"
     },
@@ -593,29 +470,8 @@ symbol_filter = pn.widgets.TextInput(placeholder="Filter Symbol (contains)...",
 refresh_button = pn.widgets.Button(name="↻", button_type="primary", width=20, height=20)
 
 # --- Embed and Token Panes ---
-# Initial state for embed pane (Load first row's chart if data exists)
+# The first row's chart is preloaded by initial_load once the first page is in
 initial_embed_html = "<div>Select a row to view chart.</div>"
-if not local_df.empty:
-    try:
-        first_row = local_df.iloc[0]
-        address = first_row.get("address")
-        chain = first_row.get("chain", "solana") # Default if missing
-        if address and chain:
-             # Generate initial iframe HTML directly
-             initial_embed_html = f"""
-                <style>
-                #dexscreener-embed {{ position: relative; width: 100%; height: 100%; min-height: 500px; }}
-                #dexscreener-embed iframe {{ position: absolute; width: 100%; height: 100%; top: 0; left: 0; border: 0; }}
-                </style>
-                <div id="dexscreener-embed">
-                <iframe src="https://dexscreener.com/{chain}/{address}?embed=1&loadChartSettings=1&trades=0&chartLeftToolbar=0&chartTheme=dark&theme=dark&chartStyle=1&chartType=usd&interval=5"></iframe>
-                </div>
-             """
-             print(f"Preloading chart for first row: {address}")
-    except Exception as e:
-        print(f"Could not preload first chart: {e}")
-
-
 embed_pane = pn.pane.HTML(initial_embed_html, sizing_mode="stretch_both", min_height=530) # Ensure min height
 styles = {
     'background-color': '#111', # Slightly lighter than pure black
@@ -625,13 +481,14 @@ styles = {
     'font-size': '0.9em'
 }
 token_pane = pn.pane.HTML("Select a non-EVM token to view info.", styles=styles, height=350, width=250, sizing_mode="fixed") # Fixed size
+details_pane = pn.pane.HTML("", styles=styles, width=250, sizing_mode="fixed") # Detail fields of the selected row
 
 
 # --- Connect Callbacks ---
 refresh_button.on_click(refresh_data)
 
-# Watch the 'value_input' for TextInput changes (debounced)
-symbol_filter.param.watch(filter_data, 'value_input')
+# Filter server-side as the user types; only the first matching page is sent
+bind_symbol_filter(data_table, symbol_filter)
 
 # Watch selection changes for updating panes
 data_table.param.watch(handle_selection_change, 'selection')
@@ -640,15 +497,15 @@ data_table.param.watch(handle_selection_change, 'selection')
 data_table.on_click(handle_cell_click)
 
 # Periodic callbacks
-# Consider increasing filter period if it causes performance issues
-# pn.state.add_periodic_callback(filter_data, period=10000) # Filter might not need periodic trigger
-pn.state.add_periodic_callback(timestamp_callback, period=30000) # Update timestamps every 30s
+# "Time ago" cells refresh in the browser (TIME_AGO_FORMATTER), so no timestamp callback runs here
+if DASHBOARD_TIMING:
+    pn.state.add_periodic_callback(print_timing_report, period=60000) # Print timing report every 60s
 
 
 # --- Layout ---
 table_container = pn.Row(
     data_table,
-    token_pane
+    pn.Column(token_pane, details_pane)
 )
 
 controls = pn.Row(
@@ -667,7 +524,9 @@ alerts_tab = pn.Column(
 
 dashboard_tabs = pn.Tabs(
     ("Alerts", alerts_tab),
-    ("Watchlist", get_watchlist_tab()), # Assuming this function returns a Panel layout
+    # Built after the page is served, each behind its own loading spinner
+    ("Watchlist", pn.panel(get_watchlist_tab, defer_load=True)),
+    ("Analytics", pn.panel(get_analytics_tab, defer_load=True)),
     sizing_mode="stretch_both",
     min_width=1200,
     dynamic=True
@@ -682,7 +541,7 @@ template = pn.template.FastGridTemplate(
 
 # Use the new accordion watchlist in the left panel.
 # Ensure get_watchlist_accordion returns a Panel object/layout
-watchlist_panel_container = pn.panel(get_watchlist_accordion, sizing_mode="stretch_both")
+watchlist_panel_container = pn.panel(get_watchlist_accordion, sizing_mode="stretch_both", defer_load=True)
 
 # Adjust grid layout numbers if needed based on FastGridTemplate structure
 template.main[0:7, 0:2] = watchlist_panel_container # Span rows 0-6, columns 0-1
@@ -695,7 +554,14 @@ signal.signal(signal.SIGTERM, shutdown_handler) # Handle termination signal too
 
 # Ensure update_callback is set before starting client
 set_update_callback(update_callback)
-run_ws_client_in_background()
+set_batch_update_callback(batch_update_callback)
+# Reload the full snapshot when WS deltas were dropped or missed (scheduled, not awaited)
+set_resync_callback(refresh_data)
+# Watchlist prices go into ring buffers here; the price tiles redraw on their own frame clock
+add_batch_listener(price_feed.on_batch)
+
+# Load the snapshot once the layout has rendered in the browser
+pn.state.onload(initial_load)
 
 # --- Serve the App ---
 template.servable()
\ No newline at end of file
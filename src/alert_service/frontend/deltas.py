@@ -0,0 +1,92 @@
+# deltas.py
+import pandas as pd
+
+TIMESTAMP_COLS = ['first_alert_time', 'last_alert_time', 'last_update_time']
+
+# Categorical fields arrive as small-integer codes (see backend database/enums.py).
+CODE_LABELS = {
+    'twitter_sentiment': {1: 'Positive', 2: 'Neutral', 3: 'Negative'},
+    'rug_bundle_check': {1: 'Safe', 2: 'Warning', 3: 'Critical'},
+    'macd_line': {1: 'Above Signal', 2: 'Below Signal'},
+}
+# Bits of the channel_flags field.
+CHANNEL_BITS = {
+    'channel_HighConviction': 1,
+    'channel_EarlyAlpha': 2,
+    'channel_5xSMWallet': 4,
+    'channel_SmartFollowers': 8,
+    'channel_KimchiTest': 16,
+}
+
+def decode_compact_fields(deltas):
+    """
+    Maps integer codes back to their labels and expands channel_flags into
+    the channel_* Boolean columns the dashboard displays. Values that are
+    already labels pass through unchanged.
+    """
+    for col, labels in CODE_LABELS.items():
+        if col in deltas.columns:
+            deltas[col] = deltas[col].map(lambda v: labels.get(v, v) if pd.notna(v) else v)
+    if 'channel_flags' in deltas.columns:
+        flags = deltas.pop('channel_flags')
+        known = flags.notna()
+        for col, bit in CHANNEL_BITS.items():
+            deltas[col] = pd.Series(pd.NA, index=deltas.index, dtype=object)
+            deltas.loc[known, col] = (flags[known].astype(int) & bit) != 0
+    return deltas
+
+def apply_deltas(df, payloads, timestamp_cols=TIMESTAMP_COLS):
+    """
+    Applies a batch of field-level deltas (dicts keyed by "address") to df in
+    place. Deltas for the same address are merged (later values win), and each
+    field is written with one vectorised assignment instead of one cell write
+    per delta. Timestamp fields are expected as epoch seconds.
+
+    Returns:
+        (updated, missing): index labels of rows that changed, and addresses
+        that are not present in df.
+    """
+    if df.empty or not payloads or 'address' not in df.columns:
+        return [], []
+    deltas = pd.DataFrame.from_records(payloads)
+    if 'address' not in deltas.columns:
+        return [], []
+    deltas = deltas.dropna(subset=['address']).groupby('address', sort=False).last()
+    deltas = decode_compact_fields(deltas)
+
+    # Map each delta address to its row label in df (first match wins).
+    lookup = pd.Series(df.index, index=df['address'])
+    lookup = lookup[~lookup.index.duplicated()]
+    labels = lookup.reindex(deltas.index)
+    known = labels.notna()
+    missing = deltas.index[~known].tolist()
+    deltas, labels = deltas[known], labels[known]
+
+    updated = set()
+    for col in deltas.columns:
+        if col not in df.columns:
+            continue
+        values = deltas[col]
+        if col in timestamp_cols:
+            values = pd.to_datetime(values, unit='s', utc=True, errors='coerce')
+        has_value = values.notna()
+        if not has_value.any():
+            continue
+        values, targets = values[has_value], labels[has_value].values
+        try:
+            # Cast to the column's type to avoid mixed types
+            values = values.astype(df[col].dtype)
+        except (TypeError, ValueError):
+            pass
+        current = df.loc[targets, col]
+        changed = current.isna().values | (current.values != values.values)
+        if not changed.any():
+            continue
+        targets, values = targets[changed], values[changed]
+        try:
+            df.loc[targets, col] = values.array
+        except (TypeError, ValueError):
+            df[col] = df[col].astype(object)
+            df.loc[targets, col] = values.array
+        updated.update(targets)
+    return sorted(updated), missing
@@ -0,0 +1,111 @@
+# http_client.py
+# One async HTTP client shared by the dashboard's REST calls: pooled
+# keep-alive connections, explicit timeouts, gzip, retries with backoff and
+# conditional GETs, so a slow backend never blocks the Panel event loop.
+import asyncio
+import hashlib
+import os
+import random
+
+import httpx
+
+# Seconds allowed to connect, and to wait for each read of the response.
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "15"))
+# Attempts after the first one for connection errors, timeouts and 429/5xx responses.
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "3"))
+# First retry delay in seconds; doubled per attempt, with jitter.
+HTTP_BACKOFF_SECONDS = float(os.environ.get("HTTP_BACKOFF_SECONDS", "0.5"))
+# Connection pool shared by every session of the dashboard process.
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_SECONDS = float(os.environ.get("HTTP_KEEPALIVE_SECONDS", "30"))
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+def backoff_delay(attempt, base=HTTP_BACKOFF_SECONDS):
+    """
+    Delay before retry `attempt` (0-based): base * 2**attempt, scaled by a
+    random factor in [0.5, 1) so sessions retrying together spread out.
+    """
+    return base * (2 ** attempt) * (0.5 + random.random() / 2)
+
+def body_digest(content):
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+class HttpClient:
+    """
+    Lazily creates one httpx.AsyncClient on first use, on the loop that
+    serves the dashboard. `transport` is for tests.
+    """
+
+    def __init__(self, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF_SECONDS, transport=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.transport = transport
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                                    max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                                    keepalive_expiry=HTTP_KEEPALIVE_SECONDS),
+                headers={"Accept-Encoding": "gzip"},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def get(self, url, params=None, validators=None):
+        """
+        GETs `url`, retrying connection errors, timeouts and 429/5xx with
+        backoff; the last error is raised, and other error statuses raise
+        httpx.HTTPStatusError.
+
+        `validators` is a dict owned by the caller (one per session and URL).
+        Its ETag and Last-Modified are sent as If-None-Match and
+        If-Modified-Since, and updated from each 200 response together with a
+        digest of the body. Returns None when the server answers 304, or when
+        the body is identical to the previous one for servers that send no
+        validators; the caller then has nothing to re-render.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.get(url, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    break
+                print(f"GET {url} returned {response.status_code}; retrying.")
+            except httpx.TransportError as e:
+                if attempt >= self.retries:
+                    raise
+                print(f"GET {url} failed ({type(e).__name__}); retrying.")
+            await asyncio.sleep(backoff_delay(attempt, self.backoff))
+            attempt += 1
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        if validators is not None:
+            # hashlib releases the GIL on large bodies, so hash off the loop
+            digest = await asyncio.get_running_loop().run_in_executor(None, body_digest, response.content)
+            unchanged = digest == validators.get("digest")
+            validators.update(etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"),
+                              digest=digest)
+            if unchanged:
+                return None
+        return response
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+# Shared by every session of the dashboard process
+http_client = HttpClient()
@@ -0,0 +1,181 @@
+# price_panel.py
+# Price sparklines for watched tokens. The WS delta batches feed one ring
+# buffer of recent prices per watched address for the whole process; each
+# session's tiles read those buffers and redraw on a fixed frame clock, so a
+# burst of batches costs one redraw per tile instead of one per message.
+import os
+import time
+
+import numpy as np
+import panel as pn
+from bokeh.models import ColumnDataSource
+from bokeh.plotting import figure
+from panel.io.document import hold
+
+# Recent ticks kept per watched token, and drawn in its sparkline.
+PRICE_HISTORY_TICKS = int(os.environ.get("PRICE_HISTORY_TICKS", "240"))
+# Tile redraws per second, however often price batches arrive.
+PRICE_FRAME_RATE = float(os.environ.get("PRICE_FRAME_RATE", "2"))
+
+class PriceRing:
+    """
+    The last `capacity` (time, price) ticks of one token in two numpy arrays.
+    `total` counts every tick ever appended and is used as the x position,
+    so a tile can tell how many ticks it has not drawn yet.
+    """
+
+    def __init__(self, capacity=PRICE_HISTORY_TICKS):
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.prices = np.zeros(capacity)
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, t, price):
+        """
+        Adds a tick unless it is not newer than the last one: every session
+        runs its own WS connection, so the same delta can arrive more than
+        once. Returns True if the tick was added.
+        """
+        if self.total and t <= self.times[(self.total - 1) % self.capacity]:
+            return False
+        slot = self.total % self.capacity
+        self.times[slot] = t
+        self.prices[slot] = price
+        self.total += 1
+        return True
+
+    def series(self, last=None):
+        """
+        Returns (tick numbers, prices) of the buffered ticks, oldest first,
+        or of only the `last` newest ones.
+        """
+        count = len(self) if last is None else min(last, len(self))
+        ticks = np.arange(self.total - count, self.total)
+        return ticks, self.prices[ticks % self.capacity]
+
+class PriceFeed:
+    """
+    Ring buffers for the watched addresses, filled from WS delta batches by
+    on_batch (registered with websocket_client.add_batch_listener). Deltas of
+    other tokens are skipped.
+    """
+
+    def __init__(self, capacity=PRICE_HISTORY_TICKS):
+        self.capacity = capacity
+        self.rings = {}
+
+    def watch(self, addresses, prices=None):
+        """
+        Keeps buffers for exactly `addresses`. A new buffer starts from
+        `prices` ({address: price}, e.g. the snapshot) when given.
+        """
+        addresses = set(addresses)
+        for address in [address for address in self.rings if address not in addresses]:
+            del self.rings[address]
+        for address in addresses:
+            if address not in self.rings:
+                ring = self.rings[address] = PriceRing(self.capacity)
+                price = (prices or {}).get(address)
+                if price is not None and not np.isnan(price):
+                    ring.append(0.0, price)
+
+    def on_batch(self, payloads):
+        added = 0
+        for payload in payloads:
+            ring = self.rings.get(payload.get("address"))
+            price = payload.get("current_price")
+            if ring is None or price is None:
+                continue
+            added += ring.append(payload.get("last_update_time") or time.time(), price)
+        return added
+
+# One feed per dashboard process, shared by every session's panel
+price_feed = PriceFeed()
+
+class PriceTile:
+    """
+    One token's sparkline: a small Bokeh line whose title shows the last
+    price and its change over the buffered ticks.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.source = ColumnDataSource(data={"tick": [], "price": []})
+        self.figure = figure(height=70, width=200, toolbar_location=None, title=symbol,
+                             min_border=2, outline_line_color=None)
+        self.figure.axis.visible = False
+        self.figure.grid.visible = False
+        self.figure.line("tick", "price", source=self.source, line_width=1.5, color="#90ee90")
+        self.pane = pn.pane.Bokeh(self.figure, margin=3)
+        self.drawn = 0
+
+    def render(self, ring):
+        """
+        Draws the ticks added to `ring` since the last render: streamed with
+        rollover when the sparkline still holds the earlier ones, otherwise
+        replaced. Returns False when there was nothing new.
+        """
+        new = ring.total - self.drawn
+        if new <= 0:
+            return False
+        if self.drawn == 0 or new >= len(ring):
+            ticks, prices = ring.series()
+            self.source.data = {"tick": ticks, "price": prices}
+        else:
+            ticks, prices = ring.series(new)
+            self.source.stream({"tick": ticks, "price": prices}, rollover=ring.capacity)
+        self.drawn = ring.total
+        _, buffered = ring.series()
+        change = (buffered[-1] / buffered[0] - 1) * 100 if buffered[0] else 0.0
+        self.figure.title.text = f"{self.symbol}  {buffered[-1]:.4g}  {change:+.1f}%"
+        return True
+
+class PricePanel:
+    """
+    A session's tiles, keyed by address like the watchlist buttons. start()
+    redraws them PRICE_FRAME_RATE times per second from `feed`.
+    """
+
+    def __init__(self, feed=price_feed, frame_rate=PRICE_FRAME_RATE):
+        self.feed = feed
+        self.frame_rate = frame_rate
+        self.tiles = {}
+        self.layout = pn.FlexBox(sizing_mode="stretch_width")
+        self.callback = None
+
+    def set_tokens(self, entries, prices=None):
+        """
+        Shows one tile per watchlist entry, reusing the existing tiles, and
+        points the feed at their addresses.
+        """
+        symbols = {entry.get("address"): entry.get("symbol", entry.get("address")) for entry in entries}
+        self.feed.watch(symbols, prices)
+        for address in [address for address in self.tiles if address not in symbols]:
+            del self.tiles[address]
+        for address, symbol in symbols.items():
+            if address not in self.tiles:
+                self.tiles[address] = PriceTile(symbol)
+        panes = [self.tiles[address].pane for address in symbols]
+        if len(panes) != len(self.layout.objects) or any(
+                new is not old for new, old in zip(panes, self.layout.objects)):
+            self.layout.objects = panes
+
+    def render_frame(self):
+        """
+        Redraws the tiles whose buffers got ticks since the last frame, in
+        one Bokeh message. Returns the number of tiles redrawn.
+        """
+        drawn = 0
+        with hold():
+            for address, tile in self.tiles.items():
+                ring = self.feed.rings.get(address)
+                if ring is not None:
+                    drawn += tile.render(ring)
+        return drawn
+
+    def start(self):
+        if self.callback is None:
+            self.callback = pn.state.add_periodic_callback(self.render_frame, period=int(1000 / self.frame_rate))
@@ -0,0 +1,220 @@
+# table_view.py
+# The alerts table as the browser sees it: only the visible columns, one page
+# at a time. Detail fields stay in the dashboard's local_df and are read when
+# a row is selected.
+import os
+from functools import partial
+
+import pandas as pd
+import panel as pn
+from panel.io.model import JSCode
+from panel.util import updating
+
+# How often the browser re-renders the "time ago" cells, in seconds.
+TIME_AGO_REFRESH_SECONDS = int(os.environ.get("TIME_AGO_REFRESH_SECONDS", "30"))
+
+# Columns sent to the browser, in display order. address and dexscreener_link
+# are hidden but needed for selection and the symbol link.
+VISIBLE_COLUMNS = [
+    "favorited",
+    "symbol",
+    "alert_count",
+    "last_update_time",
+    "first_alert_time",
+    "ath_multiplier",
+    "curr_multiplier",
+    "first_alert_price",
+    "current_price",
+    "avg_purchase_size",
+    "chain",
+    "address",
+    "dexscreener_link",
+]
+HIDDEN_KEY_COLUMNS = ["address", "dexscreener_link"]
+
+# Raw timestamps the browser renders as "HH:MM" ago with TIME_AGO_FORMATTER.
+TIME_AGO_COLUMNS = ["last_update_time", "first_alert_time"]
+
+# Tabulator formatter for TIME_AGO_COLUMNS. Panel sends datetimes as epoch
+# milliseconds (NaN when missing); the text matches transforms.format_timedelta.
+# One timer per page re-renders every live cell, so the clock moving costs the
+# server nothing. Cells are held through WeakRefs and dropped once collected.
+TIME_AGO_FORMATTER = JSCode("""
+function(cell) {
+  const state = window.__timeAgo || (window.__timeAgo = {
+    cells: [],
+    format(ms) {
+      if (ms == null || isNaN(ms)) return "N/A";
+      const minutes = Math.floor((Date.now() - ms) / 60000);
+      if (minutes < 0) return "Future?";
+      const pad = (n) => String(n).padStart(2, "0");
+      return pad(Math.floor(minutes / 60)) + ":" + pad(minutes %% 60);
+    },
+  });
+  if (state.timer == null) {
+    state.timer = setInterval(() => {
+      state.cells = state.cells.filter((ref) => {
+        const el = ref.deref();
+        if (el) el.textContent = state.format(Number(el.dataset.ts));
+        return el !== undefined;
+      });
+    }, %d);
+  }
+  const el = document.createElement("span");
+  el.dataset.ts = cell.getValue();
+  el.textContent = state.format(cell.getValue());
+  state.cells.push(new WeakRef(el));
+  return el;
+}
+""" % (TIME_AGO_REFRESH_SECONDS * 1000))
+
+# Detail fields shown for the selected row, read from local_df on selection.
+DETAIL_COLUMNS = [
+    "summary", "website", "twitter", "notes", "twitter_sentiment", "rug_bundle_check",
+    "macd_line", "sm_buy_count", "volume_5min", "volume_1hr", "token_age",
+]
+
+def visible_frame(df):
+    """
+    Returns the columns of df that the table displays, keeping df's index so
+    table rows and local_df rows share labels.
+    """
+    return df[[col for col in VISIBLE_COLUMNS if col in df.columns]].copy()
+
+def row_details(df, address):
+    """
+    Returns the detail fields of the row for `address`, or None if absent.
+    """
+    if df.empty or "address" not in df.columns:
+        return None
+    matches = df.index[df["address"] == address]
+    if len(matches) == 0:
+        return None
+    row = df.loc[matches[0]]
+    return {col: row[col] for col in DETAIL_COLUMNS if col in df.columns and not _is_missing(row[col])}
+
+def _is_missing(value):
+    return value is None or (not isinstance(value, (list, dict)) and pd.isna(value))
+
+def changed_cells(view, df, labels):
+    """
+    Builds a Tabulator patch ({column: [(label, value), ...]}) with the
+    visible cells of rows `labels` whose value in df differs from the view.
+    """
+    labels = [label for label in labels if label in view.index]
+    if not labels:
+        return {}
+    patch = {}
+    for col in view.columns:
+        if col not in df.columns:
+            continue
+        new = df.loc[labels, col]
+        old = view.loc[labels, col]
+        differs = ~((new == old) | (new.isna() & old.isna()))
+        if differs.any():
+            patch[col] = [(label, _plain(value)) for label, value in new[differs].items()]
+    return patch
+
+def sync_rows(table, df, labels):
+    """
+    Copies the visible columns of rows `labels` from df into the table's
+    value with one vectorised write, and patches the browser with the
+    changed cells among them that are on the current page; other pages pick
+    the new values up when shown. Tabulator.patch alone writes the value
+    cell by cell, which dominates a WS batch on a large table.
+
+    Returns the number of cells sent.
+    """
+    view = table.value
+    labels = [label for label in labels if label in view.index]
+    if not labels:
+        return 0
+    on_page = set(page_labels(table))
+    patch = changed_cells(view, df, [label for label in labels if label in on_page])
+    columns = [col for col in view.columns if col in df.columns]
+    view.loc[labels, columns] = df.loc[labels, columns]
+    if patch:
+        table.patch(patch)
+    return sum(len(cells) for cells in patch.values())
+
+def _plain(value):
+    # Bokeh patches take plain Python scalars
+    return value.item() if hasattr(value, "item") else value
+
+def page_labels(table):
+    """
+    Index labels of the rows on the table's current page.
+    """
+    view = table.current_view
+    if view is None:
+        return []
+    nrows = table.page_size or table.initial_page_size
+    start = (table.page - 1) * nrows
+    return list(view.index[start:start + nrows])
+
+def filter_by_symbol(df, pattern=""):
+    """Table filter: rows whose symbol contains `pattern` (case-insensitive)."""
+    pattern = (pattern or "").strip().lower()
+    if not pattern or "symbol" not in df.columns:
+        return df
+    return df[df["symbol"].str.lower().str.contains(pattern, na=False, regex=False)]
+
+def bind_symbol_filter(table, text_input):
+    """
+    Filters `table` by symbol as the user types into `text_input`. The
+    filter is only registered while the pattern is non-empty, so an
+    unfiltered table keeps PagedTabulator's page-only patches.
+    """
+    def on_change(event):
+        pattern = (event.new or "").strip()
+        table.set_filter(partial(filter_by_symbol, pattern=pattern) if pattern else None)
+    text_input.param.watch(on_change, "value_input")
+
+class PagedTabulator(pn.widgets.Tabulator):
+    """
+    Tabulator with remote pagination, so a value or filter change sends one
+    page instead of the whole DataFrame, and whose patch() only sends cells
+    on the current page.
+
+    Panel's remote pagination keeps patch positions relative to the full
+    value while the browser holds a single page, which fails for any page
+    past the first; positions are shifted to the page here. With sorters or
+    filters active Panel rebuilds the page instead, which is still one page,
+    so register filters only while they filter anything (see set_filter).
+    """
+
+    def __init__(self, value=None, **params):
+        params.setdefault("pagination", "remote")
+        super().__init__(value, **params)
+        self._function_filter = None
+
+    def set_filter(self, filter=None):
+        """
+        Replaces the function filter set by the previous call, or removes it
+        when `filter` is None, re-sending the page once.
+        """
+        if filter is None and self._function_filter is None:
+            return
+        self._filters = [(column, filt) for column, filt in self._filters if filt is not self._function_filter]
+        if filter is not None:
+            self._filters.append((None, filter))
+        self._function_filter = filter
+        self._update_cds()
+
+    @updating
+    def _patch(self, patch):
+        if self.pagination != "remote" or self.filters or self._filters or self.sorters:
+            return super()._patch(patch)
+        nrows = self.page_size or self.initial_page_size
+        start = (self.page - 1) * nrows
+        shifted = {}
+        for column, values in patch.items():
+            values = [(ind - start, value) for ind, value in values if start <= ind < start + nrows]
+            if values:
+                shifted[column] = values
+        if not shifted:
+            return
+        # Skip Tabulator._patch, which would filter the shifted positions against the page range again
+        super(pn.widgets.Tabulator, self)._patch(shifted)
+        self._update_style()
+        self._update_selectable()
@@ -0,0 +1,90 @@
+# timing.py
+# Opt-in per-function timing for the dashboard. Enable with DASHBOARD_TIMING=1;
+# when disabled, @timed returns the function unchanged so there is no overhead.
+import inspect
+import os
+import time
+from collections import deque
+from functools import wraps
+
+DASHBOARD_TIMING = os.environ.get("DASHBOARD_TIMING", "0") == "1"
+# Number of recent calls kept per function for the report.
+TIMING_WINDOW = 1000
+
+_timings = {}
+
+def record(name, seconds):
+    samples = _timings.get(name)
+    if samples is None:
+        samples = _timings[name] = deque(maxlen=TIMING_WINDOW)
+    samples.append(seconds)
+
+def mark(name, started):
+    """
+    Records the seconds since `started` (a perf_counter value) under `name`,
+    whether or not DASHBOARD_TIMING is set, and returns them. Used for the
+    per-session startup milestones.
+    """
+    seconds = time.perf_counter() - started
+    record(name, seconds)
+    return seconds
+
+def timed(func):
+    """
+    Decorator recording the wall-clock duration of each call when
+    DASHBOARD_TIMING is enabled. For coroutine functions the time until the
+    coroutine completes is recorded, awaits included.
+    """
+    if not DASHBOARD_TIMING:
+        return func
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(func.__name__, time.perf_counter() - start)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(func.__name__, time.perf_counter() - start)
+    return wrapper
+
+def timing_stats():
+    """
+    Returns {name: {"calls", "mean_ms", "p50_ms", "p95_ms", "max_ms"}} over the
+    recent window of calls.
+    """
+    stats = {}
+    for name, samples in _timings.items():
+        ordered = sorted(samples)
+        if not ordered:
+            continue
+        stats[name] = {
+            "calls": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p50_ms": ordered[len(ordered) // 2] * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "max_ms": ordered[-1] * 1000,
+        }
+    return stats
+
+def timing_report():
+    """
+    Formats timing_stats() as a small text table.
+    """
+    lines = [f"{'function':<24}{'calls':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for name, s in sorted(timing_stats().items()):
+        lines.append(f"{name:<24}{s['calls']:>7}{s['mean_ms']:>10.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}")
+    return "\n".join(lines)
+
+def print_timing_report(event=None):
+    if _timings:
+        print("Dashboard timing report:\n" + timing_report())
@@ -0,0 +1,70 @@
+# transforms.py
+# DataFrame transforms shared by the dashboard, kept free of Panel state so
+# they can be imported by tests and benchmarks.
+import pandas as pd
+import numpy as np
+
+def reorder_and_rename_df(df, first_columns, rename_map=None):
+    # Defensive check for empty df
+    if df.empty:
+        return df
+    # Ensure first_columns exist in df before using them
+    valid_first_columns = [col for col in first_columns if col in df.columns]
+    remaining_columns = [col for col in df.columns if col not in valid_first_columns]
+    new_order = valid_first_columns + remaining_columns
+    df = df[new_order]
+    if rename_map:
+        df = df.rename(columns=rename_map)
+    return df
+
+def alter_data(df, watchlist_addresses=frozenset()):
+    if df.empty:
+        return df
+
+    # Add dexscreener link column
+    if 'address' in df.columns and 'chain' in df.columns:
+         # Ensure chain is suitable for URL (e.g., lowercase) - adjust if needed
+        df['dexscreener_link'] = df.apply(
+            lambda row: f"https://dexscreener.com/{str(row['chain']).lower()}/{row['address']}" if pd.notna(row['address']) and pd.notna(row['chain']) else None,
+            axis=1
+        )
+
+    # Initialize favorited column
+    if 'address' in df.columns:
+        df['favorited'] = df['address'].apply(lambda addr: addr in watchlist_addresses if pd.notna(addr) else False)
+    else:
+        df['favorited'] = False # Add column even if address doesn't exist
+
+    # "Time ago" text is rendered in the browser from the raw timestamps (table_view.TIME_AGO_FORMATTER)
+
+    # Calculate avg_purchase_size
+    if 'purchase_size' in df.columns and 'alert_count' in df.columns:
+        df['avg_purchase_size'] = np.where(df['alert_count'] > 0, df['purchase_size'] / df['alert_count'], 0)
+    else:
+         df['avg_purchase_size'] = 0 # Add column even if source cols don't exist
+
+    return df
+
+def format_timedelta(dt_val, now): # Pass 'now' for efficiency
+    """Python twin of table_view.TIME_AGO_FORMATTER: "HH:MM" between dt_val and now."""
+    if pd.isnull(dt_val):
+        return "N/A" # Or None or ''
+    # Ensure dt_val is timezone-aware (like now) or make now naive
+    if dt_val.tzinfo is None:
+        dt_val = dt_val.tz_localize('UTC') # Assume UTC if naive, adjust if needed
+
+    diff = now - dt_val
+    total_minutes = int(diff.total_seconds() // 60)
+    if total_minutes < 0: # Handle potential clock skew or future dates
+        return "Future?"
+    hours = total_minutes // 60
+    minutes = total_minutes % 60
+    return f"{hours:02d}:{minutes:02d}"
+
+def update_derived_columns(df, labels):
+    """Recalculates 'avg_purchase_size' for the given rows only."""
+    rows = df.loc[labels]
+    if 'purchase_size' in df.columns and 'alert_count' in df.columns:
+        df.loc[labels, 'avg_purchase_size'] = np.where(
+            rows['alert_count'] > 0, rows['purchase_size'] / rows['alert_count'], 0
+        )
@@ -6,20 +6,48 @@ import os
 # You can configure this via an environment variable or hard-code a default.
 WATCHLIST_PATH = os.environ.get("WATCHLIST_PATH", "/Users/bosungkim/bosungkim/src/github/ripper/src/data/watchlist/watchlist.json")
 
+# Parsed watchlist kept in memory; the file is re-read only when its mtime changes.
+_cache = {"path": None, "mtime": None, "entries": []}
+
+def _copy(entry):
+    # Callers edit entries before saving; keep the cached ones untouched
+    return {**entry, "tags": list(entry.get("tags", ["untagged"]))}
+
+def _entries():
+    # The cached entries, re-read first if the file changed on disk
+    try:
+        mtime = os.stat(WATCHLIST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        # Create an empty JSON file if it doesn't exist
+        with open(WATCHLIST_PATH, "w") as f:
+            json.dump([], f)
+        return []
+    if _cache["path"] != WATCHLIST_PATH or _cache["mtime"] != mtime:
+        _cache.update(path=WATCHLIST_PATH, mtime=mtime, entries=_read_watchlist())
+    return _cache["entries"]
+
 def load_watchlist():
     """
-    Loads the watchlist from a JSON file.
+    Loads the watchlist, from memory unless the JSON file changed on disk
+    since it was last read or saved (one stat per call).
     
     Returns:
-        A list of watchlist entries. Each entry is a dict containing
+        A list of watchlist entries (copies). Each entry is a dict containing
         the token's address, symbol, notes, tags, etc.
     If the file does not exist, returns an empty list.
     """
-    if not os.path.exists(WATCHLIST_PATH):
-        # Create an empty JSON file if it doesn't exist
-        with open(WATCHLIST_PATH, "w") as f:
-            json.dump([], f)
-        return []
+    return [_copy(entry) for entry in _entries()]
+
+def get_watchlist_entry(address):
+    """
+    Returns a copy of the entry for `address`, or None.
+    """
+    for entry in _entries():
+        if entry.get("address") == address:
+            return _copy(entry)
+    return None
+
+def _read_watchlist():
     try:
         with open(WATCHLIST_PATH, "r") as f:
             data = json.load(f)
@@ -46,6 +74,8 @@ def save_watchlist(watchlist):
     try:
         with open(WATCHLIST_PATH, "w") as f:
             json.dump(watchlist, f, indent=4)
+        _cache.update(path=WATCHLIST_PATH, mtime=os.stat(WATCHLIST_PATH).st_mtime_ns,
+                      entries=[_copy(entry) for entry in watchlist])
     except Exception as e:
         print(f"Error saving watchlist: {e}")
 
@@ -97,6 +127,17 @@ def remove_from_watchlist(address):
     save_watchlist(new_watchlist)
     
 
+def set_watchlist_tags(address, tags):
+    """
+    Replaces the tags of the token with `address` in the watchlist.
+    """
+    watchlist = load_watchlist()
+    for entry in watchlist:
+        if entry.get("address") == address:
+            entry["tags"] = list(tags)
+            break
+    save_watchlist(watchlist)
+
 def update_watchlist_notes(symbol, notes):
     """
     Updates the notes for a token in the watchlist.
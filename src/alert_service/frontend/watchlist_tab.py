@@ -2,8 +2,13 @@
 
 import panel as pn
 import param
-from watchlist import load_watchlist, save_watchlist, add_to_watchlist, remove_from_watchlist, update_watchlist_notes
+from watchlist import (
+    load_watchlist, add_to_watchlist, remove_from_watchlist, update_watchlist_notes, get_watchlist_entry,
+    set_watchlist_tags,
+)
 from shared_data import get_local_df  # Returns the dashboard's local DataFrame
+from src.alert_service.frontend.price_panel import PricePanel
+from src.alert_service.frontend.watchlist_view import KeyedButtons, WatchlistAccordion
 
 # ---------------------
 # Utility: Get options for the Select widget.
@@ -67,15 +72,12 @@ class WatchlistState(param.Parameterized):
     def update_selection(self, address):
         print(f"Updating selection to {address}")
         self.selected_address = address
-        watchlist = load_watchlist()
-        found = False
-        for entry in watchlist:
-            if entry.get("address") == address:
-                self.selected_notes = entry.get("notes", "")
-                self.selected_tags = entry.get("tags", ["untagged"])
-                found = True
-                break
-        if not found:
+        # Served from the in-memory watchlist, not re-read from disk
+        entry = get_watchlist_entry(address)
+        if entry is not None:
+            self.selected_notes = entry.get("notes", "")
+            self.selected_tags = entry.get("tags", ["untagged"])
+        else:
             self.selected_notes = ""
             self.selected_tags = []
         # Update the MultiChoice widget manually so it doesn't override user changes.
@@ -139,12 +141,7 @@ def on_tags_change(event):
     if "untagged" in new_tags and len(new_tags) > 1:
         new_tags = [tag for tag in new_tags if tag != "untagged"]
         tags_multichoice.value = new_tags  # Update widget value accordingly.
-    watchlist = load_watchlist()
-    for entry in watchlist:
-        if entry.get("address") == watchlist_state.selected_address:
-            entry["tags"] = new_tags
-            break
-    save_watchlist(watchlist)
+    set_watchlist_tags(watchlist_state.selected_address, new_tags)
     watchlist_state.selected_tags = new_tags
     watchlist_state.refresh_watchlist_items()
     print(f"Updated tags for token {watchlist_state.selected_address} to {new_tags}")
@@ -206,54 +203,44 @@ remove_button.on_click(remove_token_callback)
 refresh_button.on_click(refresh_watchlist)
 
 # ---------------------
-# Create a reactive function to generate buttons for each watchlist entry.
-@pn.depends(watchlist_state.param.watchlist_items, watch=False)
-def get_watchlist_buttons(watchlist_items):
-    buttons = []
-    for entry in watchlist_items:
-        symbol = entry.get("symbol", entry.get("address"))
-        address = entry.get("address")
-        btn = pn.widgets.Button(name=symbol, width=200, height=30)
-        btn.css_classes = ["watchlist-button"]
-        btn.on_click(lambda event, address=address: watchlist_state.update_selection(address))
-        buttons.append(btn)
-    return buttons
-
-# ---------------------/
+# Keyed buttons: a watchlist change only adds, removes or moves the buttons it touches.
+watchlist_buttons = KeyedButtons(watchlist_state.update_selection, sizing_mode="stretch_width")
+watchlist_accordion = WatchlistAccordion(watchlist_state.update_selection)
+
+def render_watchlist(watchlist_items):
+    watchlist_buttons.update([(entry.get("address"), entry.get("symbol", entry.get("address")))
+                              for entry in watchlist_items])
+    watchlist_accordion.update(watchlist_items)
+
+render_watchlist(watchlist_state.watchlist_items)
+watchlist_state.param.watch(lambda event: render_watchlist(event.new), "watchlist_items")
+
+def get_watchlist_buttons():
+    return watchlist_buttons.column
+
+# ---------------------
 # Build a tabs layout for the fixed tag categories.
-@pn.depends(watchlist_state.param.watchlist_items, watch=False)
-def get_watchlist_accordion(watchlist_items=None):
-    # map string tags to emojis
-    tag_emojis = {
-        "untagged": "🆕",
-        "current": "💰",
-        "hawk": "🦅",
-        "slow": "🐢"
-    }
-    categories = ["untagged", "current", "hawk", "slow"]
-    tab_items = []
-    for cat in categories:
-        # Filter coins that have this tag.
-        coins = [entry for entry in watchlist_state.watchlist_items if "tags" in entry and cat in entry["tags"]]
-        if coins:
-            buttons = []
-            for coin in coins:
-                symbol = coin.get("symbol", coin.get("address"))
-                address = coin.get("address")
-                # Add an extra css class based on the category.
-                btn = pn.widgets.Button(
-                    name=symbol,
-                    width=200,
-                    height=30,
-                    css_classes=[f"watchlist-button-{cat}"]
-                )
-                btn.on_click(lambda event, address=address: watchlist_state.update_selection(address))
-                buttons.append(btn)
-            content = pn.Column(*buttons, sizing_mode="stretch_width")
-        else:
-            content = pn.pane.Markdown("No coins in this category.", sizing_mode="stretch_width")
-        tab_items.append((tag_emojis[cat], content))
-    return pn.Tabs(*tab_items, margin=7)
+def get_watchlist_accordion():
+    return watchlist_accordion.layout
+
+# ---------------------
+# Price sparklines for every watched token, fed by the WS deltas.
+def snapshot_prices():
+    df = get_local_df()
+    if df is None or "current_price" not in df.columns:
+        return {}
+    return dict(zip(df["address"], df["current_price"]))
+
+def get_price_panel():
+    # Built per session: Bokeh figures belong to a single document
+    panel = PricePanel()
+    panel.set_tokens(watchlist_state.watchlist_items, snapshot_prices())
+    watcher = watchlist_state.param.watch(lambda event: panel.set_tokens(event.new, snapshot_prices()),
+                                          "watchlist_items")
+    if pn.state.curdoc is not None:
+        pn.state.on_session_destroyed(lambda session_context: watchlist_state.param.unwatch(watcher))
+    panel.start()
+    return panel.layout
 
 # ---------------------
 # Construct the overall layout for the watchlist tab.
@@ -272,6 +259,8 @@ def get_watchlist_tab():
     watchlist_tab = pn.Column(
         watchlist_controls,
         pn.Spacer(height=10),
+        get_price_panel(),
+        pn.Spacer(height=10),
         update_embed_chart,
         pn.Spacer(height=30),
         notes_pane,
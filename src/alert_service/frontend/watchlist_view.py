@@ -0,0 +1,93 @@
+# watchlist_view.py
+# Keyed watchlist buttons: each token keeps one Button for as long as it is
+# listed, so a watchlist change adds, removes, relabels or moves only the
+# buttons it affects instead of rebuilding all of them.
+import panel as pn
+from panel.io.document import hold
+
+# Tag categories in display order, with their tab labels.
+TAG_EMOJIS = {
+    "untagged": "🆕",
+    "current": "💰",
+    "hawk": "🦅",
+    "slow": "🐢",
+}
+
+class KeyedButtons:
+    """
+    A Column holding one Button per key. update() diffs the new items
+    against the buttons it has: new keys get a button, dropped keys lose
+    theirs, changed labels are set in place, and the Column's children are
+    only replaced when membership or order changed, reusing the existing
+    buttons' models.
+    """
+
+    def __init__(self, on_click, css_class="watchlist-button", empty=None, **params):
+        self.on_click = on_click
+        self.css_class = css_class
+        self.empty = empty
+        self.buttons = {}
+        self.column = pn.Column(*([empty] if empty is not None else []), **params)
+
+    def _make_button(self, key, label):
+        button = pn.widgets.Button(name=label, width=200, height=30, css_classes=[self.css_class])
+        button.on_click(lambda event, key=key: self.on_click(key))
+        return button
+
+    def update(self, items):
+        """
+        Shows `items`, a list of (key, label) in display order.
+
+        Returns the number of buttons added, removed and relabelled.
+        """
+        labels = dict(items)
+        stats = {"added": 0, "removed": 0, "relabelled": 0}
+        for key in [key for key in self.buttons if key not in labels]:
+            del self.buttons[key]
+            stats["removed"] += 1
+        for key, label in labels.items():
+            button = self.buttons.get(key)
+            if button is None:
+                self.buttons[key] = self._make_button(key, label)
+                stats["added"] += 1
+            elif button.name != label:
+                button.name = label
+                stats["relabelled"] += 1
+        children = [self.buttons[key] for key in labels]
+        if not children and self.empty is not None:
+            children = [self.empty]
+        if len(children) != len(self.column.objects) or any(
+                new is not old for new, old in zip(children, self.column.objects)):
+            self.column.objects = children
+        return stats
+
+class WatchlistAccordion:
+    """
+    One KeyedButtons per tag category, shown as tabs. A token tagged with
+    several categories has a button in each.
+    """
+
+    def __init__(self, on_select):
+        self.lists = {
+            tag: KeyedButtons(on_select, css_class=f"watchlist-button-{tag}",
+                              empty=pn.pane.Markdown("No coins in this category.", sizing_mode="stretch_width"),
+                              sizing_mode="stretch_width")
+            for tag in TAG_EMOJIS
+        }
+        self.layout = pn.Tabs(*[(emoji, self.lists[tag].column) for tag, emoji in TAG_EMOJIS.items()], margin=7)
+
+    def update(self, entries):
+        """
+        Shows the watchlist `entries`; returns the summed KeyedButtons.update counts.
+
+        The tabs are updated under one frozen hold, so a re-tag touching two
+        tabs sends one message and Bokeh walks the document's models once.
+        """
+        totals = {"added": 0, "removed": 0, "relabelled": 0}
+        with hold(freeze=True):
+            for tag, buttons in self.lists.items():
+                items = [(entry.get("address"), entry.get("symbol", entry.get("address")))
+                         for entry in entries if tag in entry.get("tags", [])]
+                for key, count in buttons.update(items).items():
+                    totals[key] += count
+        return totals
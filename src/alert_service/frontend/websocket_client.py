@@ -1,12 +1,48 @@
 # websocket_client.py
 import asyncio
-import json
+import inspect
+import os
+import random
 import websockets
 
-# Global variable to hold the update callback.
+try:
+    from orjson import loads as decode_message
+except ImportError:
+    from json import loads as decode_message
+
+# Connection settings; override via environment variables.
+WS_URL = os.environ.get("WS_URL", "ws://172.184.170.40:8080")
+WS_PING_INTERVAL = float(os.environ.get("WS_PING_INTERVAL", "20"))
+WS_PING_TIMEOUT = float(os.environ.get("WS_PING_TIMEOUT", "10"))
+WS_QUEUE_SIZE = int(os.environ.get("WS_QUEUE_SIZE", "1000"))
+# Set WS_COMPRESSION="" to disable permessage-deflate.
+WS_COMPRESSION = os.environ.get("WS_COMPRESSION", "deflate") or None
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Sentinel placed on the inbound queue when the consumer must resync from REST.
+RESYNC = object()
+
+# Global variables holding the registered callbacks.
 _update_callback = None
+_batch_update_callback = None
+_resync_callback = None
+# Extra consumers of every delta batch (e.g. the watchlist price feed).
+_batch_listeners = []
 ws_connection = None
 
+# Counters exposed through get_ws_stats().
+ws_stats = {
+    "messages": 0,
+    "processed": 0,
+    "deltas": 0,
+    "batches": 0,
+    "dropped": 0,
+    "connects": 0,
+    "reconnects": 0,
+    "resyncs": 0,
+}
+
 def set_update_callback(callback):
     """
     Registers a callback function that will be called with the delta payload
@@ -15,21 +51,101 @@ def set_update_callback(callback):
     global _update_callback
     _update_callback = callback
 
-async def websocket_client():
+def set_batch_update_callback(callback):
+    """
+    Registers a callback function that will be called with a list of delta
+    payloads. When set, all deltas that are waiting on the inbound queue are
+    applied in one call instead of one update_callback call per delta.
+    """
+    global _batch_update_callback
+    _batch_update_callback = callback
+
+def add_batch_listener(listener):
+    """
+    Registers a function that is also called with each list of delta
+    payloads, after the update callbacks. Adding the same listener twice has
+    no effect.
+    """
+    if listener not in _batch_listeners:
+        _batch_listeners.append(listener)
+
+def remove_batch_listener(listener):
+    if listener in _batch_listeners:
+        _batch_listeners.remove(listener)
+
+def set_resync_callback(callback):
+    """
+    Registers a callback function that reloads the full snapshot. It is called
+    after inbound messages were dropped or the connection was re-established.
+    A coroutine function is scheduled on the running loop.
+    """
+    global _resync_callback
+    _resync_callback = callback
+
+def get_ws_stats():
+    """
+    Returns a copy of the client counters (messages, drops, reconnects, ...).
+    """
+    return dict(ws_stats)
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """
+    Exponential backoff with full jitter: a random delay between 0 and
+    min(cap, base * 2 ** attempt) seconds.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def enqueue_message(queue, message):
+    """
+    Puts a raw message on the inbound queue without blocking the receive loop.
+    If the queue is full, everything queued is dropped and a resync is
+    scheduled instead, since the dropped deltas can no longer be applied.
+
+    Returns True if the message was queued, False if it was dropped.
+    """
+    ws_stats["messages"] += 1
+    try:
+        queue.put_nowait(message)
+        return True
+    except asyncio.QueueFull:
+        dropped = request_resync(queue) + 1
+        ws_stats["dropped"] += dropped
+        print(f"Inbound WS queue full; dropped {dropped} messages, scheduling resync.")
+        return False
+
+def request_resync(queue):
+    """
+    Discards all queued messages and queues a single resync marker.
+    Returns the number of discarded messages.
+    """
+    dropped = 0
+    while not queue.empty():
+        if queue.get_nowait() is not RESYNC:
+            dropped += 1
+    queue.put_nowait(RESYNC)
+    return dropped
+
+async def websocket_client(queue, uri=WS_URL):
+    """
+    Connects to the WS server and feeds received messages into `queue` until
+    the connection closes. Liveness is checked with ping/pong frames; a missed
+    pong closes the connection and the exception propagates to the caller.
+    """
     global ws_connection
-    uri = "ws://172.184.170.40:8080"  # Replace with your VM's public IP/port.
-    async with websockets.connect(uri) as websocket:
+    async with websockets.connect(
+        uri,
+        ping_interval=WS_PING_INTERVAL,
+        ping_timeout=WS_PING_TIMEOUT,
+        compression=WS_COMPRESSION,
+    ) as websocket:
         ws_connection = websocket
-        print("Connected to WS server.")
-        while True:
-            try:
-                message = await websocket.recv()
-                data = json.loads(message)
-                if data.get("type") == "alertUpdated":
-                    process_delta(data["payload"])
-            except Exception as e:
-                print("Error in websocket client:", e)
-                await asyncio.sleep(2)  # minimal backoff before retrying
+        if ws_stats["connects"] > 0:
+            # Deltas sent while we were disconnected are lost.
+            ws_stats["dropped"] += request_resync(queue)
+        ws_stats["connects"] += 1
+        print(f"Connected to WS server at {uri}.")
+        async for message in websocket:
+            enqueue_message(queue, message)
 
 def process_delta(payload):
     """
@@ -41,13 +157,110 @@ def process_delta(payload):
     else:
         print("No update callback registered; ignoring payload:", payload)
 
-async def start_ws_client():
+def process_resync():
+    """
+    Calls the registered resync callback, if any.
+    """
+    ws_stats["resyncs"] += 1
+    if _resync_callback is not None:
+        result = _resync_callback()
+        if inspect.isawaitable(result):
+            asyncio.ensure_future(result)
+    else:
+        print("No resync callback registered; ignoring resync request.")
+
+def process_batch(payloads):
+    """
+    Applies a list of delta payloads through the batch callback, falling back
+    to the per-delta update callback when no batch callback is registered,
+    then hands the batch to the batch listeners.
+    """
+    ws_stats["deltas"] += len(payloads)
+    ws_stats["batches"] += 1
+    if _batch_update_callback is not None:
+        _batch_update_callback(payloads)
+    else:
+        for payload in payloads:
+            process_delta(payload)
+    for listener in _batch_listeners:
+        listener(payloads)
+
+def decode_deltas(message):
+    """
+    Decodes a raw message into a list of delta payloads. Both single
+    "alertUpdated" frames and "alertsBatch" frames are supported.
+    """
+    data = decode_message(message)
+    ws_stats["processed"] += 1
+    message_type = data.get("type")
+    if message_type == "alertsBatch":
+        return data["payload"]
+    if message_type == "alertUpdated":
+        return [data["payload"]]
+    return []
+
+def handle_messages(messages):
+    """
+    Decodes a run of inbound messages and dispatches their deltas as one
+    batch. A resync marker discards the deltas collected before it, since
+    the reloaded snapshot supersedes them.
+    """
+    deltas = []
+    for message in messages:
+        if message is RESYNC:
+            deltas = []
+            process_resync()
+            continue
+        try:
+            deltas.extend(decode_deltas(message))
+        except Exception as e:
+            print("Error decoding WS message:", e)
+    if deltas:
+        process_batch(deltas)
+
+async def consume_messages(queue):
+    """
+    Drains the inbound queue, applying everything that has accumulated since
+    the last pass in one batch, and yields to the event loop between passes
+    so UI callbacks stay responsive.
+    """
     while True:
+        messages = [await queue.get()]
+        while not queue.empty():
+            messages.append(queue.get_nowait())
         try:
-            await websocket_client()
+            handle_messages(messages)
         except Exception as e:
-            print("WebSocket client connection error:", e)
-            await asyncio.sleep(5)  # retry after delay
+            print("Error handling WS messages:", e)
+        await asyncio.sleep(0)
+
+async def start_ws_client(uri=WS_URL):
+    """
+    Runs the receive loop and the consumer, reconnecting with jittered
+    exponential backoff whenever the connection fails or goes silent.
+    """
+    queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+    consumer = asyncio.create_task(consume_messages(queue))
+    attempt = 0
+    try:
+        while True:
+            connects = ws_stats["connects"]
+            try:
+                await websocket_client(queue, uri)
+                print("WS connection closed by server.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("WebSocket client connection error:", e)
+            if ws_stats["connects"] > connects:
+                attempt = 0  # The last connection was established; start over.
+            delay = backoff_delay(attempt)
+            attempt += 1
+            ws_stats["reconnects"] += 1
+            print(f"Reconnecting to WS server in {delay:.1f}s (attempt {attempt}).")
+            await asyncio.sleep(delay)
+    finally:
+        consumer.cancel()
 
 def run_ws_client_in_background():
     """
@@ -61,9 +274,10 @@ async def websocket_shutdown():
     Closes the current WebSocket connection gracefully.
     """
     global ws_connection
-    if ws_connection and not ws_connection.closed:
+    if ws_connection is not None:
         try:
             await ws_connection.close(code=1000, reason="Dashboard shutdown")
             print("WebSocket connection closed gracefully.")
         except Exception as e:
             print("Error during graceful shutdown:", e)
+        ws_connection = None
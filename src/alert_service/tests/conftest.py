@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Point the backend at a throwaway SQLite file before any backend module is imported.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/alerts_test.db")
+
+import pytest
+from src.alert_service.backend.database.db import init_db
+
+@pytest.fixture(scope="session", autouse=True)
+def test_database():
+    init_db()
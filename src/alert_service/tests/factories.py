@@ -0,0 +1,23 @@
+from src.alert_service.backend.alerts.alert_models import Alert
+
+def alert_payload(address="So1AbC123pump", symbol="BTC", price=0.25, alert_count=1, **overrides):
+    """
+    Builds a raw alert payload shaped like the upstream feed.
+    """
+    payload = {
+        "address": address,
+        "price": price,
+        "lastTouched": 1700000000000,
+        "purchaseSize": 250.0,
+        "info": {"name": f"{symbol} token", "symbol": symbol, "websites": []},
+        "lastPrice": {"price": str(price), "fdv": "125000"},
+        "strategyAlertCount": alert_count,
+    }
+    payload.update(overrides)
+    return payload
+
+def make_alert(address="So1AbC123pump", symbol="BTC", price=0.25, alert_count=1, **overrides):
+    """
+    Builds an Alert from alert_payload().
+    """
+    return Alert(**alert_payload(address, symbol, price, alert_count, **overrides))
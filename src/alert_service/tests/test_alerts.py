@@ -1,23 +1,43 @@
+import json
+import pytest
+from pydantic import ValidationError
 from src.alert_service.backend.alerts.alert_handler import process_alert
-
-# Create a dummy alert class for testing
-class DummyAlert:
-    def __init__(self, symbol, price, sm_buy_count):
-        self.symbol = symbol
-        self.price = price
-        self.sm_buy_count = sm_buy_count
+from src.alert_service.backend.alerts.codec import decode_alert
+from src.alert_service.tests.factories import alert_payload, make_alert
 
 def test_process_new_alert():
-    alert = DummyAlert("BTC", 0.25, 5)
+    alert = make_alert(address="BTCaddress1", symbol="BTC", price=0.25, alert_count=1)
     # Process the alert and get the created entry
     entry = process_alert(alert)
+    assert entry.address == "BTCaddress1"
     assert entry.symbol == "BTC"
     assert entry.alert_count == 1
+    assert entry.first_alert_price == 0.25
 
 def test_process_existing_alert():
-    alert = DummyAlert("ETH", 1.0, 3)
+    alert = make_alert(address="ETHaddress1", symbol="ETH", price=1.0, alert_count=1)
     # Process the alert once to create the entry
     entry = process_alert(alert)
-    # Process the same alert again; should update the existing entry.
-    updated_entry = process_alert(alert)
-    assert updated_entry.alert_count == 2
\ No newline at end of file
+    # Process a follow-up alert for the same token; should update the existing entry.
+    updated_entry = process_alert(make_alert(address="ETHaddress1", symbol="ETH", price=1.2, alert_count=2))
+    assert updated_entry.address == entry.address
+    assert updated_entry.alert_count == 2
+    assert updated_entry.first_alert_price == 1.0
+
+def test_decode_alert_parses_and_validates_in_one_pass():
+    alert = decode_alert(json.dumps(alert_payload(address="CODECaddress", price=0.5)).encode(), "application/json")
+    assert alert.address == "CODECaddress"
+    assert alert.lastPrice.price == 0.5
+    assert alert.timestamp is not None
+
+@pytest.mark.parametrize("overrides", [
+    {"address": ""},
+    {"strategyAlertCount": None},
+    {"lastPrice": {"price": "0", "fdv": "125000"}},
+    {"info": {"name": "X token", "symbol": "", "websites": []}},
+    {"info": None},
+    {"lastPrice": None},
+])
+def test_decode_alert_rejects_incomplete_alerts(overrides):
+    with pytest.raises(ValidationError):
+        decode_alert(json.dumps(alert_payload(**overrides)).encode())
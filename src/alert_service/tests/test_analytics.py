@@ -0,0 +1,100 @@
+import random
+from datetime import datetime, timedelta
+
+import duckdb
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from src.alert_service.backend.analytics import queries
+from src.alert_service.backend.analytics.export import export_entries, read_state
+from src.alert_service.backend.database.enums import Channel
+from src.alert_service.backend.database.models import AlertEntry, Base
+
+START = datetime(2026, 3, 1)
+
+def make_entries(count: int, seed: int = 5) -> list[AlertEntry]:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        first = START + timedelta(days=i % 3, minutes=i)
+        rose = rng.random() < 0.6
+        entries.append(AlertEntry(
+            address=f"ANLaddr{i}", symbol="AN", first_alert_price=1.0, current_price=1.0,
+            alert_count=rng.randint(1, 25), channel_flags=rng.randint(0, 31),
+            ath_multiplier=1 + rng.uniform(0, 6) if rose else 1.0,
+            ath_time=first + timedelta(minutes=rng.randint(1, 600)) if rose else None,
+            first_alert_time=first, last_update_time=first,
+        ))
+    return entries
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(make_entries(300))
+    db.commit()
+    db.close()
+    return engine
+
+def exported(directory) -> pd.DataFrame:
+    return duckdb.sql(f"SELECT * FROM read_parquet('{directory}/alert_entries/*/*.parquet', hive_partitioning = true)").df()
+
+def test_export_is_incremental(engine, tmp_path):
+    directory = str(tmp_path / "analytics")
+    first = export_entries(engine, directory, archive_dir="")
+    assert (first["rows"], first["partitions"]) == (300, 3)
+    # Rows in the watermark's own second are read again, nothing older
+    assert export_entries(engine, directory, archive_dir="")["rows"] == 1
+
+    with engine.begin() as conn:
+        conn.execute(update(AlertEntry).where(AlertEntry.address == "ANLaddr4")
+                     .values(ath_multiplier=50.0, last_update_time=datetime(2026, 4, 1)))
+    again = export_entries(engine, directory, archive_dir="")
+    # Only the changed row and the previous watermark row are read, and only their partitions rewritten
+    assert (again["rows"], again["partitions"]) == (2, 2)
+    frame = exported(directory)
+    assert len(frame) == frame["address"].nunique() == 300
+    assert frame.set_index("address").loc["ANLaddr4", "ath_multiplier"] == 50.0
+    assert read_state(directory)["last_update_time"] == "2026-04-01T00:00:00"
+
+def test_archives_are_merged_once(engine, tmp_path):
+    directory, archive = str(tmp_path / "analytics"), tmp_path / "archive"
+    archive.mkdir()
+    pd.DataFrame([{"address": "PURGEDaddr", "symbol": "P", "first_alert_price": 1.0, "current_price": 1.0,
+                   "alert_count": 3, "channel_flags": 1, "ath_multiplier": 4.0,
+                   "first_alert_time": START, "last_update_time": START}]).to_parquet(archive / "alert_entries-1.parquet")
+    assert export_entries(engine, directory, archive_dir=str(archive))["archived_rows"] == 1
+    assert export_entries(engine, directory, archive_dir=str(archive))["archived_rows"] == 0
+    assert "PURGEDaddr" in set(exported(directory)["address"])
+
+def test_queries_match_pandas(engine, tmp_path):
+    directory = str(tmp_path / "analytics")
+    assert queries.hit_rate_by_channel(directory=directory)["rows"] == []
+    export_entries(engine, directory, archive_dir="")
+    frame = exported(directory)
+
+    hit_rate = {row["channel"]: row for row in queries.hit_rate_by_channel(3.0, directory=directory)["rows"]}
+    for channel in Channel:
+        members = frame[(frame["channel_flags"] & int(channel)) != 0]
+        row = hit_rate[channel.name]
+        assert row["entries"] == len(members)
+        assert row["hit_rate"] == pytest.approx((members["ath_multiplier"] >= 3.0).mean())
+        assert row["mean_ath"] == pytest.approx(members["ath_multiplier"].mean())
+        # Read off 0.5% log-scale bins; an even count gives the lower middle value
+        assert row["median_ath"] == pytest.approx(members["ath_multiplier"].quantile(0.5, interpolation="lower"), rel=0.006)
+    assert hit_rate["all"]["entries"] == 300
+    assert hit_rate["none"]["entries"] == (frame["channel_flags"] == 0).sum()
+
+    buckets = {row["bucket"]: row for row in queries.multiplier_by_alert_count([1, 5, 10], directory=directory)["rows"]}
+    assert list(buckets) == ["1-4", "5-9", "10+"]
+    members = frame[frame["alert_count"] >= 10]
+    assert buckets["10+"]["entries"] == len(members)
+    assert buckets["10+"]["p50"] == pytest.approx(members["ath_multiplier"].median())
+
+    (row,) = queries.time_to_ath([1], directory=directory)["rows"]
+    minutes = ((frame["ath_time"].fillna(frame["first_alert_time"]) - frame["first_alert_time"]).dt.total_seconds() / 60)
+    assert row["at_first_alert"] == pytest.approx(frame["ath_time"].isna().mean())
+    assert row["median_minutes"] == pytest.approx(minutes.median())
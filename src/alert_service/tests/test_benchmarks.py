@@ -0,0 +1,28 @@
+from src.alert_service.backend.alerts.alert_models import Alert
+from src.alert_service.benchmarks.payloads import AlertFeed
+from src.alert_service.benchmarks.results import compare_results, percentile
+
+def test_feed_payloads_match_alert_model():
+    feed = AlertFeed(tokens=20, seed=3)
+    payloads = [feed.next_payload() for _ in range(200)]
+    alerts = [Alert(**payload) for payload in payloads]
+    assert all(alert.info.symbol for alert in alerts)
+    # Alert counts increase per token
+    counts = {}
+    for alert in alerts:
+        assert alert.strategyAlertCount == counts.get(alert.address, 0) + 1
+        counts[alert.address] = alert.strategyAlertCount
+    assert len(counts) <= 20
+
+def test_feed_is_deterministic_per_seed():
+    first, second = AlertFeed(tokens=5, seed=7), AlertFeed(tokens=5, seed=7)
+    assert [first.next_payload()["address"] for _ in range(10)] == [second.next_payload()["address"] for _ in range(10)]
+
+def test_percentile_and_compare():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+    baseline = {"results": {"a": {"median_us": 100.0}, "b": {"median_us": 10.0}}}
+    current = {"results": {"a": {"median_us": 150.0}, "c": {"median_us": 1.0}}}
+    assert compare_results(baseline, current) == [("a", 100.0, 150.0, 0.5)]
@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.alert_service.backend.database.models import Base, AlertEntry
-from src.alert_service.backend.database.operations import add_new_entry, update_entry, cleanup_old_entries, get_entry_by_symbol
+from src.alert_service.backend.database.operations import add_new_entry, update_entry, cleanup_old_entries, get_entry_by_symbol, get_entry_by_address
 
 # Use an in-memory SQLite database for tests
 @pytest.fixture(scope="function")
@@ -16,25 +16,33 @@ def db_session():
     db.close()
 
 def test_add_new_entry(db_session):
-    entry = add_new_entry(db_session, "BTC", 0.25, 5)
+    entry = add_new_entry(db_session, "BTC", 0.25, 5, "BTCaddress")
     assert entry.symbol == "BTC"
-    assert entry.price == 0.25
-    assert entry.sm_buy_count == 5
-    assert entry.alert_count == 1
+    assert entry.first_alert_price == 0.25
+    assert entry.current_price == 0.25
+    assert entry.alert_count == 5
+    assert entry.active_watchlist is True
+    assert get_entry_by_address(db_session, "BTCaddress") is entry
 
 def test_update_entry(db_session):
-    entry = add_new_entry(db_session, "ETH", 1.0, 3)
-    original_alert_count = entry.alert_count
+    entry = add_new_entry(db_session, "ETH", 1.0, 3, "ETHaddress")
     entry = update_entry(db_session, entry, 1.1, 4)
-    assert entry.price == 1.1
-    assert entry.sm_buy_count == 4
-    assert entry.alert_count == original_alert_count + 1
+    assert entry.current_price == 1.1
+    assert entry.first_alert_price == 1.0
+    assert entry.alert_count == 4
 
 def test_cleanup_old_entries(db_session):
     # Create an entry with a first_alert_time older than 7 days
-    entry = add_new_entry(db_session, "DOGE", 0.05, 1)
+    entry = add_new_entry(db_session, "DOGE", 0.05, 1, "DOGEaddress")
     entry.first_alert_time = datetime.utcnow() - timedelta(days=8)
     db_session.commit()
     deleted_count = cleanup_old_entries(db_session, older_than_days=7)
     assert deleted_count == 1
-    assert get_entry_by_symbol(db_session, "DOGE") is None
\ No newline at end of file
+    assert get_entry_by_symbol(db_session, "DOGE") is None
+
+def test_init_db_skips_checks_when_schema_version_is_current():
+    from src.alert_service.backend.database.db import init_db, schema_version
+    from src.alert_service.backend.database.migrations import SCHEMA_VERSION
+    init_db()
+    assert schema_version() == SCHEMA_VERSION
+    assert init_db() is False
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+from src.alert_service.backend.app import app
+from src.alert_service.backend.alerts.dedup import DedupCache
+from src.alert_service.backend.database.db import SessionLocal
+from src.alert_service.backend.database.operations import get_entry_by_address
+from src.alert_service.tests.factories import alert_payload
+
+def test_dedup_cache_expires_and_stays_bounded():
+    now = [0.0]
+    cache = DedupCache(ttl=10, max_entries=3, clock=lambda: now[0])
+    assert not cache.seen("a")
+    assert cache.seen("a")
+    now[0] = 11
+    assert not cache.seen("a")  # expired, seen again
+    for key in "bcd":
+        cache.seen(key)
+    assert len(cache) == 3
+    assert not cache.seen("a")  # evicted as the oldest key
+
+def test_replayed_alert_skips_processing():
+    payload = alert_payload(address="DEDUPaddress", symbol="DUP", alert_count=3)
+    with TestClient(app) as client:
+        first = client.post("/alert", json=payload)
+        replay = client.post("/alert", json={**payload, "price": 9.0})
+        keyed = [client.post("/alert", json=alert_payload(address="DEDUPaddress", alert_count=n),
+                             headers={"Idempotency-Key": "retry-1"}) for n in (4, 5)]
+    assert first.status_code == 201
+    assert replay.json()["status"] == "duplicate"
+    assert [r.json()["status"] for r in keyed] == ["success", "duplicate"]
+    db = SessionLocal()
+    try:
+        assert get_entry_by_address(db, "DEDUPaddress").alert_count == 4
+    finally:
+        db.close()
+
+def test_failed_alert_returns_500_and_is_not_deduplicated(monkeypatch):
+    from src.alert_service.backend import app as app_module
+    payload = alert_payload(address="DEDUPfailed", symbol="FAIL")
+
+    def fail(alert):
+        raise RuntimeError("database is locked")
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(app_module, "process_alert", fail)
+        failed = client.post("/alert", json=payload)
+        monkeypatch.undo()
+        retried = client.post("/alert", json=payload)
+    assert failed.status_code == 500
+    assert retried.status_code == 201
+    assert retried.json()["status"] == "success"
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.alert_service.backend.alerts.derived import apply_price_tick, backfill_derived_metrics
+from src.alert_service.backend.database.migrations import add_missing_columns
+from src.alert_service.backend.database.models import Base, AlertEntry
+
+def test_price_ticks_keep_running_ath():
+    first = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    entry = AlertEntry(first_alert_price=2.0, current_price=2.0, first_alert_time=first.replace(tzinfo=None))
+    for price in (4.0, 10.0, 3.0):
+        apply_price_tick(entry, price, now=first + timedelta(minutes=5))
+    assert entry.current_price == 3.0
+    assert entry.curr_multiplier == 1.5
+    assert entry.ath_multiplier == 5.0
+    assert entry.ath_time == first + timedelta(minutes=5)
+    assert entry.token_age == 300
+
+def test_backfill_and_added_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'derived.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE alert_entries (address VARCHAR PRIMARY KEY, symbol VARCHAR NOT NULL, "
+            "first_alert_price FLOAT NOT NULL, current_price FLOAT NOT NULL, ath_multiplier FLOAT, "
+            "first_alert_time DATETIME, alert_count INTEGER NOT NULL, channel_flags INTEGER NOT NULL, "
+            "active_watchlist BOOLEAN NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO alert_entries VALUES "
+            "('a', 'A', 1.0, 3.0, NULL, '2024-01-01 00:00:00', 1, 0, 1), "
+            "('b', 'B', 2.0, 1.0, 4.0, '2024-01-01 00:00:00', 1, 0, 1)"
+        ))
+    assert {"curr_multiplier", "token_age"} <= set(add_missing_columns(engine))
+    Base.metadata.create_all(engine)
+    assert backfill_derived_metrics(engine) == 2
+    db = sessionmaker(bind=engine)()
+    try:
+        a, b = db.get(AlertEntry, "a"), db.get(AlertEntry, "b")
+        assert (a.curr_multiplier, a.ath_multiplier) == (3.0, 3.0)
+        assert (b.curr_multiplier, b.ath_multiplier) == (0.5, 4.0)
+        assert a.token_age > 0
+        # Only a's ATH was raised by the backfill
+        assert a.ath_time is not None and b.ath_time is None
+        assert (a.version, b.version) == (2, 2)
+        assert a.last_update_time is not None
+    finally:
+        db.close()
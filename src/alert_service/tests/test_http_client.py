@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.alert_service.frontend.http_client import HttpClient
+
+def make_client(handler, retries=2):
+    return HttpClient(retries=retries, backoff=0, transport=httpx.MockTransport(handler))
+
+def test_retries_then_revalidates_with_etag():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(503)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"address": "a"}], headers={"ETag": '"v1"'})
+
+    async def run():
+        client = make_client(handler)
+        validators = {}
+        first = await client.get("http://alerts/alerts", validators=validators)
+        second = await client.get("http://alerts/alerts", validators=validators)
+        await client.aclose()
+        return first, second, validators
+
+    first, second, validators = asyncio.run(run())
+    assert first.json() == [{"address": "a"}]
+    assert second is None
+    assert validators["etag"] == '"v1"'
+    assert len(requests) == 3
+    assert "gzip" in requests[0].headers["accept-encoding"]
+
+def test_unchanged_body_without_validators_is_not_modified():
+    bodies = iter([b"[1]", b"[1]", b"[2]"])
+
+    async def run():
+        client = make_client(lambda request: httpx.Response(200, content=next(bodies)))
+        validators = {}
+        results = [await client.get("http://alerts/alerts", validators=validators) for _ in range(3)]
+        await client.aclose()
+        return results
+
+    first, same, changed = asyncio.run(run())
+    assert first is not None and same is None and changed.content == b"[2]"
+
+def test_gives_up_after_retries():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def run():
+        client = make_client(handler, retries=1)
+        try:
+            await client.get("http://alerts/alerts")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run())
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from src.alert_service.backend.alerts.indicators import MACD_SPANS, VOLUME_WINDOWS, IndicatorEngine
+from src.alert_service.backend.database.enums import MacdSignal
+
+def reference_indicators(prices, volumes, ts, ring_size):
+    """
+    Recomputes the indicators from the full tick history with pandas.
+    """
+    series = pd.Series(prices)
+    result = {}
+    for column, (fast, slow, signal) in MACD_SPANS.items():
+        macd = series.ewm(span=fast, adjust=False).mean() - series.ewm(span=slow, adjust=False).mean()
+        above = macd.iloc[-1] >= macd.ewm(span=signal, adjust=False).mean().iloc[-1]
+        result[column] = int(MacdSignal.ABOVE_SIGNAL if above else MacdSignal.BELOW_SIGNAL)
+    kept = np.arange(len(ts)) >= len(ts) - ring_size
+    for column, window in VOLUME_WINDOWS.items():
+        result[column] = volumes[kept & (ts > ts[-1] - window)].sum()
+    return result
+
+def test_engine_matches_reference_per_tick_and_batched():
+    rng = np.random.default_rng(7)
+    ticks, tokens = 200, 5
+    prices = np.cumprod(rng.uniform(0.95, 1.05, (ticks, tokens)), axis=0)
+    volumes = rng.uniform(0, 100, (ticks, tokens))
+    ts = np.cumsum(rng.uniform(5, 120, ticks))
+    addresses = [f"token{i}" for i in range(tokens)]
+
+    single, batched = IndicatorEngine(ring_size=64, capacity=2), IndicatorEngine(ring_size=64, capacity=2)
+    for t in range(ticks):
+        for i, address in enumerate(addresses):
+            single.update(address, prices[t, i], volumes[t, i], ts[t])
+        batched.update_batch(addresses, prices[t], volumes[t], ts[t])
+
+    for i, address in enumerate(addresses):
+        expected = reference_indicators(prices[:, i], volumes[:, i], ts, ring_size=64)
+        for engine in (single, batched):
+            values = engine.snapshot([address])[0]
+            for column in MACD_SPANS:
+                assert values[column] == expected[column]
+            for column in VOLUME_WINDOWS:
+                assert np.isclose(values[column], expected[column])
+
+def test_repeated_address_in_batch_applies_ticks_in_order():
+    engine, reference = IndicatorEngine(), IndicatorEngine()
+    engine.update_batch(["a", "b", "a"], [1.0, 5.0, 2.0], [1.0, 1.0, 3.0], ts=100.0)
+    reference.update("a", 1.0, 1.0, 100.0)
+    reference.update("a", 2.0, 3.0, 100.0)
+    assert engine.macd("a") == reference.macd("a")
+    assert engine.snapshot(["a"])[0]["volume_5min"] == 4.0
+
+def test_evicted_and_idle_rows_are_reused_from_scratch():
+    engine, fresh = IndicatorEngine(capacity=2, idle_ttl=1000, sweep_interval=60), IndicatorEngine()
+    engine.update_batch(["a", "b"], [1.0, 9.0], [5.0, 5.0], ts=100.0)
+    assert engine.evict(["a", "unknown"]) == 1
+    assert len(engine) == 1
+
+    # "c" takes a's row and starts from its own first tick
+    engine.update("c", 2.0, 1.0, 110.0)
+    fresh.update("c", 2.0, 1.0, 110.0)
+    assert engine.snapshot(["c"]) == fresh.snapshot(["c"])
+
+    # "b" has not ticked for over idle_ttl by the sweep at 1150; "c" has
+    engine.update("c", 2.5, 1.0, 1000.0)
+    engine.update("c", 2.6, 1.0, 1150.0)
+    assert engine.evict(["b"]) == 0
+    assert len(engine) == 1
+    engine.update("d", 3.0, 1.0, 1151.0)
+    assert engine.capacity == 2
@@ -2,30 +2,72 @@ import json
 import pytest
 from fastapi.testclient import TestClient
 from src.alert_service.backend.app import app
+from src.alert_service.backend.alerts import codec
 from src.alert_service.backend.database.db import SessionLocal
 from src.alert_service.backend.database.models import AlertEntry
-
-client = TestClient(app)
+from src.alert_service.tests.factories import alert_payload
 
 def test_end_to_end_alert_flow():
     # Simulate sending an alert to the REST endpoint.
     data = {
         "address": "0xABC123",
         "price": 0.25,
-        "smBuyCount": 5
+        "lastTouched": 1700000000000,
+        "info": {"name": "Test Token", "symbol": "TEST", "websites": []},
+        "lastPrice": {"price": "0.25", "fdv": "250000"},
+        "strategyAlertCount": 5
     }
-    response = client.post("/alert", json=data)
+    with TestClient(app) as client:
+        response = client.post("/alert", json=data)
     assert response.status_code == 201
     json_response = response.json()
-    assert json_response["status"] == "success"
+    assert json_response == {"status": "success", "address": "0xABC123"}
     
     # Verify that the database has been updated with the alert.
     session = SessionLocal()
     try:
-        entry = session.query(AlertEntry).filter(AlertEntry.symbol == "0xABC123").first()
+        entry = session.query(AlertEntry).filter(AlertEntry.address == "0xABC123").first()
         assert entry is not None
-        assert entry.price == 0.25
-        assert entry.sm_buy_count == 5
+        assert entry.symbol == "TEST"
+        assert entry.first_alert_price == 0.25
+        assert entry.alert_count == 5
+        # Derived metrics follow the alert's price, not a provider stub's
+        assert entry.current_price == 0.25 and entry.curr_multiplier == 1.0 and entry.ath_multiplier == 1.0
         # Optionally, check additional fields updated by refresh_entry.
+        assert entry.twitter_sentiment is not None
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+def test_alert_endpoint_rejects_invalid_and_unsupported_bodies():
+    with TestClient(app) as client:
+        missing = client.post("/alert", json={"address": "0xDEF456", "price": 0.25})
+        unsupported = client.post("/alert", content=b"\x80", headers={"content-type": "application/msgpack"})
+    assert missing.status_code == 422
+    # Without msgpack installed the body is refused; with it, an empty map fails validation.
+    assert unsupported.status_code == (415 if codec.msgpack is None else 422)
+
+def test_alert_without_info_or_last_price_is_rejected():
+    with TestClient(app) as client:
+        responses = []
+        for field in ("info", "lastPrice"):
+            payload = alert_payload(address=f"0xNO{field}")
+            del payload[field]
+            responses.append(client.post("/alert", json=payload))
+    assert [r.status_code for r in responses] == [422, 422]
+
+def test_probes_report_liveness_and_readiness():
+    assert app.state.ready is False
+    with TestClient(app) as client:
+        assert client.get("/healthz").json() == {"status": "ok"}
+        ready = client.get("/readyz")
+    assert ready.status_code == 200
+    assert app.state.ready is False  # cleared again on shutdown
+
+def test_analytics_revalidates_with_etag():
+    with TestClient(app) as client:
+        first = client.get("/analytics/multipliers")
+        again = client.get("/analytics/multipliers", headers={"If-None-Match": first.headers["etag"]})
+        other = client.get("/analytics/hit_rate", params={"threshold": 3}, headers={"If-None-Match": first.headers["etag"]})
+    assert first.status_code == 200 and "rows" in first.json()
+    assert again.status_code == 304
+    assert other.status_code == 200
@@ -0,0 +1,47 @@
+import json
+import logging
+import queue
+from src.alert_service.backend import log
+
+def make_record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord("src.alert_service.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_structured_fields():
+    line = log.JsonFormatter().format(make_record("Processed alert for %s", "ABC", address="ABC"))
+    entry = json.loads(line)
+    assert entry["msg"] == "Processed alert for ABC"
+    assert entry["level"] == "INFO"
+    assert entry["address"] == "ABC"
+
+def test_sampling_filter_limits_flagged_records():
+    sampler = log.SamplingFilter(per_second=3)
+    passed = [sampler.filter(make_record("hot %s", i, sampled=True)) for i in range(10)]
+    assert sum(passed) == 3
+    # Records without the flag are never sampled
+    assert all(sampler.filter(make_record("cold %s", i)) for i in range(10))
+
+def test_queue_handler_never_blocks_and_defers_formatting():
+    handler = log.NonBlockingQueueHandler(queue.Queue(2))
+    for i in range(5):
+        handler.handle(make_record("message %s", i))
+    assert handler.dropped == 3
+    record = handler.queue.get_nowait()
+    # The message is formatted later, on the listener thread
+    assert record.msg == "message %s" and record.args == (0,)
+
+def test_configure_logging_writes_json_lines(tmp_path):
+    path = tmp_path / "alerts.log"
+    logger = log.configure_logging(level="INFO", fmt="json", path=str(path))
+    try:
+        child = logging.getLogger(log.PACKAGE_LOGGER + ".backend.test")
+        child.debug("gated out %s", "x")
+        child.info("kept %s", "y", extra={"address": "ADDR"})
+    finally:
+        log.shutdown_logging()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["msg"] for line in lines] == ["kept y"]
+    assert lines[0]["address"] == "ADDR"
+    assert logger.level == logging.INFO
+    log.configure_logging()
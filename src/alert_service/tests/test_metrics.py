@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+from src.alert_service.backend.app import app
+from src.alert_service.frontend import timing
+from src.alert_service.tests.factories import make_alert
+
+def test_metrics_endpoint_reports_pipeline_stages():
+    alert = make_alert(address="METRICSaddress", symbol="MTR")
+    with TestClient(app) as client:
+        assert client.post("/alert", json=alert.model_dump(mode="json", exclude_none=True)).status_code == 201
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    for stage in ("validation", "db_lookup", "db_write", "refresh", "total"):
+        assert f'alert_stage_seconds_count{{stage="{stage}"}}' in body
+    assert 'alert_entries_total{outcome="new"}' in body
+    assert "db_pool_checked_out" in body
+    assert "push_clients" in body
+
+def test_timing_stats_summarise_recorded_calls():
+    for ms in range(1, 101):
+        timing.record("load_data_test", ms / 1000)
+    stats = timing.timing_stats()["load_data_test"]
+    assert stats["calls"] == 100
+    assert stats["max_ms"] == 100
+    assert 45 < stats["p50_ms"] < 55
+    assert "load_data_test" in timing.timing_report()
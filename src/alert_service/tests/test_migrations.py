@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from src.alert_service.backend.database.enums import Channel, Sentiment
+from src.alert_service.backend.database.migrations import LEGACY_ALERT_ENTRIES_DDL, migrate_compact_schema
+from src.alert_service.backend.database.models import AlertEntry, Base
+
+@pytest.fixture
+def legacy_engine():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_ALERT_ENTRIES_DDL))
+        conn.execute(text("CREATE INDEX ix_alert_entries_address ON alert_entries (address)"))
+        conn.execute(text("CREATE INDEX ix_alert_entries_symbol ON alert_entries (symbol)"))
+        conn.execute(text(
+            "INSERT INTO alert_entries (address, symbol, first_alert_price, current_price, alert_count, "
+            "twitter_sentiment, rug_bundle_check, macd_line, active_watchlist, channel_HighConviction, "
+            "channel_EarlyAlpha, channel_5xSMWallet, channel_SmartFollowers, channel_KimchiTest) VALUES "
+            "('A', 'AAA', 0.1, 0.2, 3, 'Negative', 'Safe', 'Below Signal', 1, 1, 0, 1, 0, 0), "
+            "('B', 'BBB', 1.0, 1.0, 1, NULL, 'Critical', NULL, 0, 0, 0, 0, 0, 1)"
+        ))
+    return engine
+
+def test_migration_converts_legacy_rows(legacy_engine):
+    assert migrate_compact_schema(legacy_engine) == 2
+    columns = {c["name"] for c in inspect(legacy_engine).get_columns("alert_entries")}
+    assert "channel_flags" in columns and "channel_HighConviction" not in columns
+
+    db = sessionmaker(bind=legacy_engine)()
+    a = db.get(AlertEntry, "A")
+    assert a.twitter_sentiment == "Negative"
+    assert a.twitter_sentiment_code == Sentiment.NEGATIVE
+    assert a.rug_bundle_check == "Safe"
+    assert a.macd_line == "Below Signal"
+    assert a.channel_flags == Channel.HighConviction | Channel.FiveXSMWallet
+    assert a.channel_HighConviction and a.channel_5xSMWallet and not a.channel_EarlyAlpha
+    b = db.get(AlertEntry, "B")
+    assert b.twitter_sentiment is None
+    assert b.channel_KimchiTest and b.active_watchlist is False
+    # Accessors also work in queries
+    assert [e.address for e in db.query(AlertEntry).filter(AlertEntry.channel_KimchiTest)] == ["B"]
+    db.close()
+
+    # Running again is a no-op
+    assert migrate_compact_schema(legacy_engine) == 0
+
+def test_compatibility_setters():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    entry = AlertEntry(address="C", symbol="CCC", first_alert_price=1.0, current_price=1.0, alert_count=1)
+    entry.twitter_sentiment = "Positive"
+    entry.channel_EarlyAlpha = True
+    entry.channel_SmartFollowers = True
+    entry.channel_EarlyAlpha = False
+    db.add(entry)
+    db.commit()
+    assert entry.twitter_sentiment_code == 1
+    assert entry.channel_flags == Channel.SmartFollowers
+    db.close()
@@ -0,0 +1,133 @@
+import json
+
+import httpx
+import pytest
+
+from src.alert_service.backend.alerts import alert_handler
+from src.alert_service.backend.alerts.alert_handler import process_alert
+from src.alert_service.backend.notify.dispatcher import NotificationDispatcher, RetryQueue, TokenBucket
+from src.alert_service.backend.notify.sinks import FileSink, WebhookSink, parse_sinks
+from src.alert_service.tests.factories import make_alert
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FlakySink:
+    def __init__(self, failures: int):
+        self.name = "flaky"
+        self.failures = failures
+        self.sent = []
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink down")
+        self.sent.append(message)
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def make_dispatcher(tmp_path, sinks, clock=None, **kwargs):
+    return NotificationDispatcher(sinks, retry_path=str(tmp_path / "retry.db"), clock=clock or FakeClock(), **kwargs)
+
+def test_token_bucket_refills_up_to_burst():
+    bucket = TokenBucket(rate=1.0, burst=2, now=0.0)
+    assert bucket.take(0.0) and bucket.take(0.0)
+    assert not bucket.take(0.5)
+    assert bucket.take(1.0)
+    assert bucket.available(100.0) == 2
+
+def test_bursts_become_digests(tmp_path):
+    clock = FakeClock()
+    sink = FileSink(str(tmp_path / "out.jsonl"))
+    dispatcher = make_dispatcher(tmp_path, [sink], clock, rate_per_min=60, burst=3)
+    for i in range(2):
+        dispatcher.notify({"address": f"a{i}"})
+    dispatcher.run_once()
+    assert [m["address"] for m in read_lines(tmp_path / "out.jsonl")] == ["a0", "a1"]
+
+    # Ten events with one token left: a single digest
+    for i in range(10):
+        dispatcher.notify({"address": f"b{i}"})
+    dispatcher.run_once()
+    digest = read_lines(tmp_path / "out.jsonl")[-1]
+    assert (digest["type"], digest["count"]) == ("digest", 10)
+
+    # Out of tokens: held back until the bucket refills
+    dispatcher.notify({"address": "c0"})
+    dispatcher.run_once()
+    assert len(read_lines(tmp_path / "out.jsonl")) == 3
+    clock.now += 1.0
+    dispatcher.run_once()
+    assert read_lines(tmp_path / "out.jsonl")[-1]["address"] == "c0"
+
+def test_failed_sends_are_retried_then_dropped(tmp_path):
+    sink = FlakySink(failures=2)
+    dispatcher = make_dispatcher(tmp_path, [sink], backoff=0, max_attempts=5)
+    dispatcher.notify({"address": "retry"})
+    for _ in range(3):
+        dispatcher.run_once()
+    assert [m["address"] for m in sink.sent] == ["retry"]
+    assert len(RetryQueue(str(tmp_path / "retry.db"))) == 0
+
+    down = FlakySink(failures=100)
+    dispatcher = make_dispatcher(tmp_path, [down], backoff=0, max_attempts=3)
+    dispatcher.notify({"address": "lost"})
+    for _ in range(5):
+        dispatcher.run_once()
+    assert not down.sent and down.failures == 97
+    assert len(RetryQueue(str(tmp_path / "retry.db"))) == 0
+
+def test_retries_are_claimed_by_one_worker(tmp_path):
+    first, second = RetryQueue(str(tmp_path / "retry.db")), RetryQueue(str(tmp_path / "retry.db"))
+    for i in range(3):
+        first.add("file", {"address": f"r{i}"}, 1, 100.0)
+    claimed = first.due("file", 200.0, 2, claim=60)
+    assert [m["address"] for _, m, _ in claimed] == ["r0", "r1"]
+    assert [m["address"] for _, m, _ in second.due("file", 200.0, 10, claim=60)] == ["r2"]
+    assert second.due("file", 250.0, 10) == []
+    # A claim that was neither removed nor rescheduled expires
+    assert len(second.due("file", 300.0, 10)) == 3
+
+def test_stop_keeps_rate_limited_events_for_the_next_start(tmp_path):
+    sink = FileSink(str(tmp_path / "out.jsonl"))
+    dispatcher = make_dispatcher(tmp_path, [sink], rate_per_min=1, burst=1, interval_ms=10_000)
+    dispatcher.start()
+    for i in range(3):
+        dispatcher.notify({"address": f"k{i}"})
+    dispatcher._buckets[sink.name].tokens = 0
+    dispatcher.stop()
+    assert not (tmp_path / "out.jsonl").exists()
+
+    restarted = make_dispatcher(tmp_path, [sink])
+    restarted.run_once()
+    (digest,) = read_lines(tmp_path / "out.jsonl")
+    assert [e["address"] for e in digest["events"]] == ["k0", "k1", "k2"]
+
+def test_webhook_sink_posts_json():
+    received = []
+
+    def handler(request):
+        received.append(json.loads(request.content))
+        return httpx.Response(204 if len(received) == 1 else 500)
+
+    sink = WebhookSink("http://hooks.local/alerts", client=httpx.Client(transport=httpx.MockTransport(handler)))
+    sink.send({"address": "hook"})
+    assert received == [{"address": "hook"}]
+    with pytest.raises(httpx.HTTPStatusError):
+        sink.send({"address": "again"})
+    assert [s.name for s in parse_sinks("file:/tmp/x.jsonl, webhook:http://h/a")] == ["file:/tmp/x.jsonl", "webhook:http://h/a"]
+
+def test_new_entries_are_notified(tmp_path, monkeypatch):
+    sink = FlakySink(failures=0)
+    dispatcher = make_dispatcher(tmp_path, [sink])
+    monkeypatch.setattr(alert_handler, "dispatcher", dispatcher)
+    process_alert(make_alert(address="NOTIFYaddr", symbol="NTF"))
+    process_alert(make_alert(address="NOTIFYaddr", symbol="NTF", alert_count=2))
+    dispatcher.run_once()
+    assert [(m["type"], m["address"], m["symbol"]) for m in sink.sent][:1] == [("new_entry", "NOTIFYaddr", "NTF")]
+    assert all(m["type"] == "channels" and m["channels"] for m in sink.sent[1:])
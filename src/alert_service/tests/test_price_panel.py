@@ -0,0 +1,49 @@
+from src.alert_service.frontend import websocket_client as wsc
+from src.alert_service.frontend.price_panel import PriceFeed, PricePanel, PriceRing
+
+def test_ring_keeps_the_newest_ticks_in_order():
+    ring = PriceRing(capacity=4)
+    for t in range(1, 7):
+        assert ring.append(float(t), t * 10.0)
+    assert not ring.append(6.0, 99.0)  # the same delta from a second connection
+    ticks, prices = ring.series()
+    assert list(ticks) == [2, 3, 4, 5] and list(prices) == [30.0, 40.0, 50.0, 60.0]
+    assert list(ring.series(2)[1]) == [50.0, 60.0]
+
+def test_feed_buffers_only_watched_tokens():
+    feed = PriceFeed(capacity=8)
+    feed.watch(["A", "B"], prices={"A": 1.0})
+    added = feed.on_batch([{"address": "A", "current_price": 2.0, "last_update_time": 10},
+                           {"address": "C", "current_price": 5.0, "last_update_time": 10},
+                           {"address": "B", "current_price": None, "last_update_time": 10}])
+    assert added == 1
+    assert list(feed.rings["A"].series()[1]) == [1.0, 2.0] and feed.rings["B"].total == 0
+    feed.watch(["B"])
+    assert list(feed.rings) == ["B"]
+
+def test_frame_redraws_each_changed_tile_once():
+    feed = PriceFeed(capacity=8)
+    panel = PricePanel(feed)
+    panel.set_tokens([{"address": "A", "symbol": "AAA"}, {"address": "B", "symbol": "BBB"}])
+    tile = panel.tiles["A"]
+    for t in range(1, 4):
+        feed.on_batch([{"address": "A", "current_price": float(t), "last_update_time": t}])
+    assert panel.render_frame() == 1
+    assert list(tile.source.data["price"]) == [1.0, 2.0, 3.0]
+    assert tile.figure.title.text == "AAA  3  +200.0%"
+    assert panel.render_frame() == 0
+    feed.on_batch([{"address": "A", "current_price": 4.0, "last_update_time": 4}])
+    panel.render_frame()
+    assert list(tile.source.data["price"]) == [1.0, 2.0, 3.0, 4.0]
+    panel.set_tokens([{"address": "A", "symbol": "AAA"}])
+    assert panel.tiles["A"] is tile and len(panel.layout.objects) == 1
+
+def test_batch_listeners_see_every_batch():
+    seen = []
+    wsc.add_batch_listener(seen.append)
+    wsc.add_batch_listener(seen.append)
+    try:
+        wsc.handle_messages(['{"type": "alertsBatch", "payload": [{"address": "A"}, {"address": "B"}]}'])
+    finally:
+        wsc.remove_batch_listener(seen.append)
+    assert seen == [[{"address": "A"}, {"address": "B"}]]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import sqlite3
+import pandas as pd
+import pytest
+from src.alert_service.backend.cluster import route_url, shard_for
+from src.alert_service.backend.push.broadcaster import DeltaBroadcaster
+from src.alert_service.backend.push.pubsub import SQLitePubSub
+from src.alert_service.frontend.deltas import apply_deltas
+
+class FakeWebSocket:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def send_text(self, message):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.sent.append(message)
+
+def test_broadcaster_coalesces_per_address():
+    broadcaster = DeltaBroadcaster(window_ms=10)
+    broadcaster.publish({"address": "A", "current_price": 1.0, "alert_count": 1})
+    broadcaster.publish({"address": "B", "current_price": 5.0})
+    broadcaster.publish({"address": "A", "current_price": 1.5})
+    client, dead = FakeWebSocket(), FakeWebSocket(fail=True)
+    broadcaster.register(client)
+    broadcaster.register(dead)
+
+    sent = asyncio.run(broadcaster.flush())
+
+    assert sent == 2
+    frame = json.loads(client.sent[0])
+    assert frame["type"] == "alertsBatch"
+    assert frame["payload"] == [
+        {"address": "A", "current_price": 1.5, "alert_count": 1},
+        {"address": "B", "current_price": 5.0},
+    ]
+    assert broadcaster.client_count == 1
+    assert broadcaster.drain() == []
+
+def test_apply_deltas_updates_rows_in_one_pass():
+    df = pd.DataFrame({
+        "address": ["A", "B", "C"],
+        "alert_count": [1, 2, 3],
+        "current_price": [1.0, 2.0, 3.0],
+        "last_alert_time": pd.to_datetime([0, 0, 0], unit="s", utc=True),
+    })
+    updated, missing = apply_deltas(df, [
+        {"address": "A", "alert_count": 4, "last_alert_time": 60},
+        {"address": "C", "current_price": 3.0},
+        {"address": "A", "current_price": 1.25},
+        {"address": "Z", "alert_count": 1},
+    ])
+    assert updated == [0]
+    assert missing == ["Z"]
+    assert df.loc[0, "alert_count"] == 4
+    assert df.loc[0, "current_price"] == 1.25
+    assert df.loc[0, "last_alert_time"] == pd.Timestamp(60, unit="s", tz="UTC")
+    assert df["alert_count"].dtype == "int64"
+
+def test_apply_deltas_decodes_compact_fields():
+    df = pd.DataFrame({
+        "address": ["A"],
+        "twitter_sentiment": ["Neutral"],
+        "channel_HighConviction": [False],
+        "channel_EarlyAlpha": [True],
+    })
+    updated, _ = apply_deltas(df, [{"address": "A", "twitter_sentiment": 1, "channel_flags": 1}])
+    assert updated == [0]
+    assert df.loc[0, "twitter_sentiment"] == "Positive"
+    assert bool(df.loc[0, "channel_HighConviction"]) is True
+    assert bool(df.loc[0, "channel_EarlyAlpha"]) is False
+
+def test_sqlite_pubsub_fans_out_between_processes(tmp_path):
+    path = str(tmp_path / "bus.db")
+    worker_a, worker_b = SQLitePubSub(path), SQLitePubSub(path)
+    received_a, received_b = [], []
+    worker_a.subscribe(received_a.append)
+    worker_b.subscribe(received_b.append)
+    worker_a.publish([{"address": "A", "current_price": 1.0}])
+    # publish() only queues; the bus thread does the write
+    assert worker_b.poll_once() == 0
+    assert worker_a.poll_once() == 1 and worker_b.poll_once() == 1
+    assert received_a == received_b == [[{"address": "A", "current_price": 1.0}]]
+    assert worker_b.poll_once() == 0
+
+def test_failed_bus_write_keeps_the_batches(tmp_path):
+    path = str(tmp_path / "bus.db")
+    worker, reader = SQLitePubSub(path), SQLitePubSub(path)
+    received = []
+    reader.subscribe(received.append)
+    worker._conn().execute("PRAGMA busy_timeout = 0")
+    worker.publish([{"address": "A"}])
+    worker.publish([{"address": "B"}])
+    # Another worker holds the write lock: the insert fails with SQLITE_BUSY
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError):
+        worker.write_pending()
+    worker.publish([{"address": "C"}])
+    blocker.execute("COMMIT")
+    assert worker.write_pending() == 3
+    reader.poll_once()
+    assert received == [[{"address": "A"}], [{"address": "B"}], [{"address": "C"}]]
+
+def test_broadcaster_delivers_batches_from_other_workers(tmp_path):
+    path = str(tmp_path / "bus.db")
+    local, remote = DeltaBroadcaster(pubsub=SQLitePubSub(path)), DeltaBroadcaster(pubsub=SQLitePubSub(path))
+    client = FakeWebSocket()
+    local.register(client)
+    remote.publish({"address": "R", "alert_count": 2})
+    asyncio.run(remote.flush())
+    remote.pubsub.poll_once()
+    local.pubsub.poll_once()
+    assert asyncio.run(local.flush()) == 1
+    assert json.loads(client.sent[0])["payload"] == [{"address": "R", "alert_count": 2}]
+
+def test_shard_routing_is_stable():
+    urls = ["http://w0", "http://w1", "http://w2"]
+    assert shard_for("So1AbC123pump", 3) == shard_for("So1AbC123pump", 3)
+    assert route_url("So1AbC123pump", urls) == urls[shard_for("So1AbC123pump", 3)]
+    assert {shard_for(f"token{i}", 3) for i in range(100)} == {0, 1, 2}
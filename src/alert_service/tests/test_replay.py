@@ -0,0 +1,65 @@
+import os
+
+from src.alert_service.backend.alerts import refresh
+from src.alert_service.backend.alerts.recorder import AlertRecorder, read_recording, worker_path
+from src.alert_service.benchmarks.replay import replay_in_process, synthesize_recording, timetable
+from src.alert_service.tests.factories import alert_payload, make_alert
+
+def test_recorder_round_trips_payloads(tmp_path):
+    path = str(tmp_path / "alerts.jsonl.gz")
+    recorder = AlertRecorder(path)
+    recorder.record(make_alert(address="RECaddr2"), received=20.0)
+    recorder.record(make_alert(address="RECaddr1"), received=10.0)
+    recorder.close()
+    # A second session appends to the same file
+    recorder = AlertRecorder(path)
+    recorder.record(make_alert(address="RECaddr3"), received=30.0)
+    recorder.close()
+
+    records = read_recording(path)
+    assert [(t, payload["address"]) for t, payload in records] == [(10.0, "RECaddr1"), (20.0, "RECaddr2"), (30.0, "RECaddr3")]
+    # Only what the sender set is recorded; the server-side timestamp default is not
+    payload = records[0][1]
+    assert "timestamp" not in payload
+    assert payload["strategyAlertCount"] == alert_payload()["strategyAlertCount"]
+
+def test_truncated_recording_keeps_earlier_records(tmp_path):
+    path = str(tmp_path / "alerts.jsonl.gz")
+    recorder = AlertRecorder(path)
+    for i in range(50):
+        recorder.record(make_alert(address=f"RECaddr{i}"), received=float(i))
+    recorder.close()
+    complete = os.path.getsize(path)
+    recorder = AlertRecorder(path)
+    recorder.record(make_alert(address="RECcut"), received=99.0)
+    recorder.close()
+    # A process killed mid-write leaves a cut-off last member
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:complete + 20])
+    assert [payload["address"] for _, payload in read_recording(path)] == [f"RECaddr{i}" for i in range(50)]
+
+def test_workers_record_to_their_own_files():
+    assert worker_path("/data/alerts.jsonl.gz", 0, 1) == "/data/alerts.jsonl.gz"
+    assert worker_path("/data/alerts.jsonl.gz", 2, 4) == "/data/alerts.w2.jsonl.gz"
+
+def test_timetable_scales_recorded_gaps():
+    records = [(100.0, {}), (101.0, {}), (104.0, {})]
+    assert timetable(records, 1.0) == [0.0, 1.0, 4.0]
+    assert timetable(records, 4.0) == [0.0, 0.25, 1.0]
+    assert timetable(records, None) == [0.0, 0.0, 0.0]
+
+def test_seeded_providers_repeat():
+    refresh.seed_providers(42)
+    first = [refresh.fetch_twitter_sentiment("X"), refresh.fetch_trade_volume("X")]
+    refresh.seed_providers(42)
+    assert [refresh.fetch_twitter_sentiment("X"), refresh.fetch_trade_volume("X")] == first
+    refresh.seed_providers(None)
+
+def test_replay_in_process(tmp_path):
+    records = read_recording(synthesize_recording(str(tmp_path / "synthetic.jsonl.gz"), count=40, rate=1000, tokens=5, seed=3))
+    result = replay_in_process(records, speed=None, seed=1)
+    refresh.seed_providers(None)
+    assert (result["alerts"], result["ok"]) == (40, 40)
+    assert result["push_frames"] >= 1
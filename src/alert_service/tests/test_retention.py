@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+import logging
+import pandas as pd
+from sqlalchemy import create_engine
+from src.alert_service.backend.database.db import SessionLocal
+from src.alert_service.backend.database.operations import add_new_entry, get_entry_by_address
+from src.alert_service.backend.scheduler import retention
+
+def test_purge_archives_then_deletes_in_chunks(tmp_path):
+    db = SessionLocal()
+    try:
+        for i in range(5):
+            entry = add_new_entry(db, f"OLD{i}", 0.01, 1, f"RETENTIONold{i}")
+            entry.first_alert_time = datetime.utcnow() - timedelta(days=30)
+        add_new_entry(db, "NEW", 0.01, 1, "RETENTIONnew")
+        db.commit()
+    finally:
+        db.close()
+
+    report = retention.purge_expired_entries(older_than_days=7, chunk_size=2, archive_dir=str(tmp_path), pause=0)
+    assert report["rows_removed"] == 5
+    assert report["chunks"] == 3
+    archived = pd.concat(pd.read_parquet(path) for path in report["archived_files"])
+    assert sorted(archived["address"]) == [f"RETENTIONold{i}" for i in range(5)]
+
+    db = SessionLocal()
+    try:
+        assert get_entry_by_address(db, "RETENTIONold0") is None
+        assert get_entry_by_address(db, "RETENTIONnew") is not None
+    finally:
+        db.close()
+
+    compacted = retention.compact_database()
+    assert compacted["bytes_reclaimed"] >= 0
+    assert compacted["analyzed"]
+
+def test_idle_maintenance_waits_for_quiet_ingestion():
+    db = SessionLocal()
+    try:
+        add_new_entry(db, "IDLE", 0.01, 1, "RETENTIONidle")
+        db.commit()
+    finally:
+        db.close()
+    now = datetime.now(timezone.utc)
+    assert not retention.is_idle(60, now=now)
+    assert retention.is_idle(60, now=now + timedelta(minutes=5))
+
+def test_analyze_request_is_shared_through_the_database():
+    retention.request_analyze(now=100.0)
+    requested = retention.analyze_requested_at()
+    assert requested == 100.0
+    # Another purge while ANALYZE runs stays pending
+    retention.request_analyze(now=200.0)
+    retention.analyze_done(started=150.0)
+    assert retention.analyze_requested_at() == 200.0
+    retention.analyze_done(started=250.0)
+    assert retention.analyze_requested_at() is None
+
+def test_non_incremental_database_is_reported_once(tmp_path, monkeypatch, caplog):
+    # A file created before auto_vacuum=INCREMENTAL; the service's connect listener is not attached
+    monkeypatch.setattr(retention, "engine", create_engine(f"sqlite:///{tmp_path / 'old.db'}"))
+    monkeypatch.setattr(retention, "_vacuum_mode_warned", False)
+    with caplog.at_level(logging.WARNING, logger=retention.__name__):
+        for _ in range(3):
+            assert retention.compact_database(analyze=False)["bytes_reclaimed"] == 0
+    assert sum("incremental auto_vacuum" in record.getMessage() for record in caplog.records) == 1
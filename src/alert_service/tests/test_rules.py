@@ -0,0 +1,127 @@
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.alert_service.backend.alerts.rules import DEFAULT_RULES, RuleSet, load_columns, load_rule_config
+from src.alert_service.backend.database.enums import Channel
+from src.alert_service.backend.database.models import AlertEntry, Base
+
+def random_entry(i: int, rng: random.Random) -> AlertEntry:
+    maybe = lambda value: None if rng.random() < 0.2 else value
+    return AlertEntry(
+        address=f"RULEaddr{i}", symbol="R", first_alert_price=1.0,
+        current_price=rng.choice([0.01, 0.05, 0.2, 3.0]),
+        alert_count=rng.randint(1, 8),
+        token_age=maybe(rng.uniform(0, 7200)),
+        curr_multiplier=maybe(rng.uniform(0.5, 4)),
+        volume_1hr=maybe(rng.uniform(0, 20000)),
+        sm_buy_count=maybe(rng.randint(0, 10)),
+        rug_bundle_check=maybe(rng.choice(["Safe", "Warning", "Critical"])),
+        twitter_sentiment=maybe(rng.choice(["Positive", "Neutral", "Negative"])),
+        macd_line=maybe(rng.choice(["Above Signal", "Below Signal"])),
+        channel_flags=rng.randint(0, 31), active_watchlist=rng.random() < 0.5,
+    )
+
+def test_compiled_forms_agree(tmp_path):
+    """
+    Per-entry closures, NumPy masks and the SQL UPDATE give the same flags,
+    statuses and hit counts.
+    """
+    rules = RuleSet(DEFAULT_RULES)
+    engine = create_engine(f"sqlite:///{tmp_path / 'rules.db'}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(7)
+    db = sessionmaker(bind=engine)()
+    try:
+        db.add_all(random_entry(i, rng) for i in range(500))
+        db.commit()
+
+        columns = load_columns(engine, rules.fields)
+        arrays = rules.evaluate_arrays(columns)
+        report = rules.apply_bulk(engine)
+        assert report["rows"] == 500
+        assert report["hits"] == arrays["hits"]
+
+        db.expire_all()
+        entries = db.query(AlertEntry).all()
+        bulk = [(entry.channel_flags, entry.active_watchlist) for entry in entries]
+        per_entry = RuleSet(DEFAULT_RULES)
+        for entry in entries:
+            per_entry.apply(entry)
+        assert [(entry.channel_flags, entry.active_watchlist) for entry in entries] == bulk
+        assert dict(per_entry.hits) == {name: n for name, n in report["hits"].items() if n}
+    finally:
+        db.close()
+    assert sorted(zip(arrays["channel_flags"].tolist(), arrays["active_watchlist"].tolist())) == sorted(bulk)
+
+def test_missing_fields_never_match():
+    rules = RuleSet([
+        {"name": "not_safe", "target": "KimchiTest", "when": {"field": "rug_bundle_check", "op": "!=", "value": "Safe"}},
+        {"name": "not_listed", "target": "EarlyAlpha", "when": {"field": "sm_buy_count", "op": "not_in", "value": [1, 2]}},
+    ])
+    entry = AlertEntry(channel_flags=0, active_watchlist=True)
+    assert rules.apply(entry) == []
+    columns = {"rug_bundle_check_code": np.array([np.nan]), "sm_buy_count": np.array([np.nan]),
+               "channel_flags": np.array([0.0]), "active_watchlist": np.array([1.0])}
+    assert rules.evaluate_arrays(columns)["hits"] == {"not_safe": 0, "not_listed": 0}
+
+def test_negated_conditions_skip_missing_fields(tmp_path):
+    rules = RuleSet([
+        {"name": "not_big", "target": "KimchiTest", "when": {"not": {"field": "sm_buy_count", "op": ">=", "value": 5}}},
+        {"name": "not_both", "target": "EarlyAlpha", "when": {"not": {"all": [
+            {"field": "sm_buy_count", "op": ">=", "value": 5}, {"field": "alert_count", "op": ">", "value": 1}]}}},
+    ])
+    engine = create_engine(f"sqlite:///{tmp_path / 'rules.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        db.add_all([
+            AlertEntry(address="RULEmissing", symbol="R", first_alert_price=1.0, current_price=1.0, alert_count=1,
+                       sm_buy_count=None, channel_flags=0, active_watchlist=True),
+            AlertEntry(address="RULEsmall", symbol="R", first_alert_price=1.0, current_price=1.0, alert_count=3,
+                       sm_buy_count=2, channel_flags=0, active_watchlist=True),
+        ])
+        db.commit()
+        missing, small = db.get(AlertEntry, "RULEmissing"), db.get(AlertEntry, "RULEsmall")
+        # The missing field fails sm_buy_count >= 5 and its negation; alert_count == 1 still fails "> 1"
+        assert rules.apply(missing) == ["not_both"]
+        assert rules.apply(small) == ["not_big", "not_both"]
+        db.rollback()
+
+        assert rules.evaluate_arrays(load_columns(engine, rules.fields))["hits"] == {"not_big": 1, "not_both": 2}
+        assert rules.apply_bulk(engine)["hits"] == {"not_big": 1, "not_both": 2}
+        db.expire_all()
+        assert db.get(AlertEntry, "RULEmissing").channel_flags == Channel.EarlyAlpha
+    finally:
+        db.close()
+
+def test_untargeted_channels_and_status_are_kept():
+    rules = RuleSet([{"name": "big", "target": "channel_5xSMWallet", "when": {"field": "sm_buy_count", "op": ">=", "value": 5}}])
+    entry = AlertEntry(sm_buy_count=6, channel_flags=int(Channel.HighConviction), active_watchlist=False)
+    assert rules.apply(entry) == ["big"]
+    assert entry.channel_flags == Channel.HighConviction | Channel.FiveXSMWallet
+    assert entry.active_watchlist is False
+
+@pytest.mark.parametrize("rule", [
+    {"name": "bad_field", "target": "KimchiTest", "when": {"field": "symbol", "op": "==", "value": "X"}},
+    {"name": "bad_op", "target": "KimchiTest", "when": {"field": "alert_count", "op": "~", "value": 1}},
+    {"name": "bad_target", "target": "Nowhere", "when": {"field": "alert_count", "op": ">", "value": 1}},
+])
+def test_invalid_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        RuleSet([rule])
+
+def test_rules_load_from_yaml(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(
+        "rules:\n"
+        "  - name: listed\n"
+        "    target: active_watchlist\n"
+        "    when: {any: [{field: alert_count, op: '>=', value: 3}, {not: {field: current_price, op: '<', value: 1}}]}\n"
+    )
+    rules = RuleSet(load_rule_config(str(path)))
+    assert rules.apply(AlertEntry(alert_count=1, current_price=2.0, channel_flags=0)) == ["listed"]
+    assert rules.apply(AlertEntry(alert_count=1, current_price=0.5, channel_flags=0)) == []
@@ -0,0 +1,38 @@
+from src.alert_service.backend.scheduler import runner
+
+def test_claim_run_allows_one_worker_per_interval():
+    now = 1_000_000.0
+    assert runner.claim_run("lease_test", min_gap=590, lease_seconds=600, owner="w1", now=now)
+    # Another worker firing in the same interval skips
+    assert not runner.claim_run("lease_test", min_gap=590, lease_seconds=600, owner="w2", now=now + 5)
+    # Next interval, but the first run is still holding its lease
+    assert not runner.claim_run("lease_test", min_gap=590, lease_seconds=900, owner="w2", now=now + 600)
+    runner.release_run("lease_test", started=now, owner="w1")
+    assert runner.claim_run("lease_test", min_gap=590, lease_seconds=600, owner="w2", now=now + 601)
+
+def test_leased_job_records_runs_and_skips():
+    calls = []
+    job = runner.leased_job("leased_job_test", lambda: calls.append(1), interval=3600)
+    job()
+    job()  # second fire within the interval is skipped
+    stats = runner.job_stats()["leased_job_test"]
+    assert calls == [1]
+    assert (stats["runs"], stats["skipped_lease"]) == (1, 1)
+
+def test_scheduler_registers_jobs_from_config(tmp_path):
+    config = tmp_path / "jobs.yaml"
+    config.write_text(
+        "jobs:\n"
+        "  - name: watchlist\n"
+        "    func: src.alert_service.backend.scheduler.watchlist:filter_watchlist\n"
+        "    seconds: 120\n"
+        "    jitter: 5\n"
+    )
+    scheduler = runner.create_scheduler(runner.load_job_config(str(config)))
+    scheduler.start(paused=True)
+    try:
+        (job,) = scheduler.get_jobs()
+        assert job.id == "watchlist"
+        assert job.max_instances == 1 and job.coalesce
+    finally:
+        scheduler.shutdown(wait=False)
@@ -0,0 +1,35 @@
+import asyncio
+
+import pandas as pd
+
+from src.alert_service.benchmarks.micro import make_dashboard_frame
+from src.alert_service.frontend.http_client import HttpClient
+from src.alert_service.frontend.snapshot import fetch_snapshot, load_snapshot, prepare_snapshot
+
+def returning(df):
+    async def fetch():
+        return df
+    return fetch
+
+def test_first_page_arrives_before_the_rest():
+    raw = make_dashboard_frame(120)
+    chunks = []
+    rows = asyncio.run(load_snapshot(returning(raw), prepare_snapshot,
+                                     lambda df, first: chunks.append((len(df), first)), first_rows=30, chunk_rows=50))
+    assert rows == 120
+    assert chunks == [(30, True), (50, False), (40, False)]
+
+def test_prepared_chunks_match_a_whole_load():
+    raw = make_dashboard_frame(75)
+    parts = []
+    asyncio.run(load_snapshot(returning(raw), prepare_snapshot, lambda df, first: parts.append(df), 10, 20))
+    whole = prepare_snapshot(raw.copy())
+    pd.testing.assert_frame_equal(pd.concat(parts), whole)
+    assert list(whole.columns[:3]) == ["favorited", "symbol", "alert_count"]
+
+def test_unreachable_snapshot_is_empty():
+    df = asyncio.run(fetch_snapshot("http://127.0.0.1:9/alerts", client=HttpClient(retries=0)))
+    assert df.empty
+
+def test_unchanged_snapshot_is_not_reloaded():
+    assert asyncio.run(load_snapshot(returning(None), prepare_snapshot, None, 30)) is None
@@ -0,0 +1,86 @@
+import pandas as pd
+import panel as pn
+from bokeh.document import Document
+
+from src.alert_service.frontend.table_view import (
+    TIME_AGO_COLUMNS, TIME_AGO_FORMATTER, PagedTabulator, bind_symbol_filter, row_details, sync_rows, visible_frame,
+)
+
+def make_frame(rows=100):
+    return pd.DataFrame({
+        "symbol": [f"T{i}" for i in range(rows)],
+        "alert_count": range(rows),
+        "address": [f"addr{i}" for i in range(rows)],
+        "summary": [f"long summary {i}" for i in range(rows)],
+        "website": [f"https://t{i}.example" for i in range(rows)],
+    })
+
+def attach(table):
+    doc = Document()
+    root = table.get_root(doc)
+    doc.add_root(root)
+    events = []
+    doc.on_change(events.append)
+    return table._models[root.ref["id"]][0], events
+
+def test_only_visible_columns_are_sent():
+    df = make_frame()
+    assert list(visible_frame(df).columns) == ["symbol", "alert_count", "address"]
+    assert row_details(df, "addr7") == {"summary": "long summary 7", "website": "https://t7.example"}
+    assert row_details(df, "missing") is None
+
+def test_patches_land_on_the_current_page():
+    df = make_frame()
+    table = PagedTabulator(visible_frame(df), page_size=10)
+    model, _ = attach(table)
+    table.page = 3
+    assert list(model.source.data["alert_count"]) == list(range(20, 30))
+    # Panel's own remote patch fails past the first page; positions are shifted to the page
+    table.patch({"alert_count": [(25, -25), (95, -95)]})
+    assert model.source.data["alert_count"][5] == -25
+    assert table.value.loc[95, "alert_count"] == -95
+
+def test_sync_rows_sends_only_page_cells():
+    df = make_frame()
+    table = PagedTabulator(visible_frame(df), page_size=10)
+    model, _ = attach(table)
+    df.loc[[3, 50], "alert_count"] = [300, 5000]
+    df.loc[3, "summary"] = "not sent"
+    assert sync_rows(table, df, [3, 50]) == 1
+    assert model.source.data["alert_count"][3] == 300
+    assert len(model.source.data["alert_count"]) == 10
+    # Off-page rows are updated server-side and show up when their page is
+    assert table.value.loc[50, "alert_count"] == 5000
+    table.page = 6
+    assert model.source.data["alert_count"][0] == 5000
+
+def test_time_ago_is_formatted_in_the_browser():
+    df = make_frame(3)
+    df["last_update_time"] = pd.to_datetime([1.7e9, 1.7e9 + 60, None], unit="s", utc=True)
+    table = PagedTabulator(visible_frame(df), formatters={col: TIME_AGO_FORMATTER for col in TIME_AGO_COLUMNS})
+    model, _ = attach(table)
+    # Raw epoch milliseconds are sent once; the formatter renders and refreshes the text client-side
+    assert list(model.source.data["last_update_time"][:2]) == [1.7e12, 1.70000006e12]
+    column = next(col for col in model.configuration["columns"] if col["field"] == "last_update_time")
+    assert column["formatter"] is TIME_AGO_FORMATTER
+    assert "last_update_time_ago" not in table.value.columns
+
+def test_symbol_filter_is_registered_only_while_typed(monkeypatch):
+    table = PagedTabulator(visible_frame(make_frame()), page_size=10)
+    symbol_filter = pn.widgets.TextInput()
+    bind_symbol_filter(table, symbol_filter)
+    model, _ = attach(table)
+
+    symbol_filter.value_input = "T9"
+    assert list(model.source.data["symbol"][:2]) == ["T9", "T90"]
+    symbol_filter.value_input = "  "
+    assert table._filters == []
+    assert len(model.source.data["symbol"]) == 10
+
+    # Unfiltered, as the dashboard usually is, a patch never rebuilds the page
+    table.page = 3
+    rebuilds = []
+    monkeypatch.setattr(table, "_update_cds", lambda *args, **kwargs: rebuilds.append(args))
+    table.patch({"alert_count": [(25, -25)]})
+    assert rebuilds == []
+    assert model.source.data["alert_count"][5] == -25
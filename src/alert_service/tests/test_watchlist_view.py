@@ -0,0 +1,48 @@
+import os
+
+from src.alert_service.frontend import watchlist
+from src.alert_service.frontend.watchlist_view import KeyedButtons, WatchlistAccordion
+
+def entry(i, tags=("untagged",)):
+    return {"address": f"addr{i}", "symbol": f"T{i}", "notes": "", "tags": list(tags)}
+
+def test_keyed_buttons_keep_their_widgets():
+    clicked = []
+    buttons = KeyedButtons(clicked.append)
+    assert buttons.update([("a", "A"), ("b", "B"), ("c", "C")]) == {"added": 3, "removed": 0, "relabelled": 0}
+    kept = dict(buttons.buttons)
+    assert buttons.update([("c", "C"), ("a", "A2"), ("d", "D")]) == {"added": 1, "removed": 1, "relabelled": 1}
+    assert buttons.buttons["a"] is kept["a"] and buttons.buttons["c"] is kept["c"]
+    assert [b.name for b in buttons.column.objects] == ["C", "A2", "D"]
+    buttons.buttons["d"].clicks += 1
+    assert clicked == ["d"]
+
+def test_retag_moves_one_button():
+    accordion = WatchlistAccordion(print)
+    accordion.update([entry(i) for i in range(5)])
+    hawk_column = accordion.lists["hawk"].column
+    assert len(hawk_column.objects) == 1  # the "No coins" placeholder
+    untagged = dict(accordion.lists["untagged"].buttons)
+    totals = accordion.update([entry(i, ["hawk"] if i == 2 else ["untagged"]) for i in range(5)])
+    assert totals == {"added": 1, "removed": 1, "relabelled": 0}
+    assert list(accordion.lists["hawk"].buttons) == ["addr2"]
+    assert all(accordion.lists["untagged"].buttons[key] is untagged[key] for key in accordion.lists["untagged"].buttons)
+
+def test_watchlist_is_read_from_disk_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(watchlist, "WATCHLIST_PATH", str(tmp_path / "watchlist.json"))
+    watchlist.save_watchlist([entry(1)])
+    reads = []
+    read = watchlist._read_watchlist
+    monkeypatch.setattr(watchlist, "_read_watchlist", lambda: reads.append(1) or read())
+    watchlist.set_watchlist_tags("addr1", ["hawk"])
+    assert watchlist.get_watchlist_entry("addr1")["tags"] == ["hawk"]
+    watchlist.load_watchlist()[0]["tags"].append("slow")  # callers' edits don't leak into the cache
+    assert watchlist.load_watchlist()[0]["tags"] == ["hawk"]
+    assert reads == []
+    # An edit made outside the dashboard is picked up from the file's mtime
+    with open(watchlist.WATCHLIST_PATH, "w") as f:
+        f.write('[{"address": "addr9", "symbol": "T9"}]')
+    stat = os.stat(watchlist.WATCHLIST_PATH)
+    os.utime(watchlist.WATCHLIST_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert watchlist.load_watchlist() == [{"address": "addr9", "symbol": "T9", "tags": ["untagged"]}]
+    assert reads == [1]
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from src.alert_service.frontend import websocket_client as wsc
+
+@pytest.fixture(autouse=True)
+def reset_client_state():
+    for key in wsc.ws_stats:
+        wsc.ws_stats[key] = 0
+    yield
+    wsc.set_update_callback(None)
+    wsc.set_resync_callback(None)
+
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(20):
+        delay = wsc.backoff_delay(attempt, base=1.0, cap=30.0)
+        assert 0 <= delay <= min(30.0, 2 ** attempt)
+
+def test_queue_overflow_drops_and_resyncs():
+    async def run():
+        queue = asyncio.Queue(maxsize=3)
+        results = [wsc.enqueue_message(queue, f"m{i}") for i in range(4)]
+        return queue, results
+
+    queue, results = asyncio.run(run())
+    assert results == [True, True, True, False]
+    assert queue.qsize() == 1
+    assert queue.get_nowait() is wsc.RESYNC
+    assert wsc.get_ws_stats()["dropped"] == 4
+    assert wsc.get_ws_stats()["messages"] == 4
+
+def test_consumer_dispatches_deltas_and_resyncs():
+    deltas, resyncs = [], []
+    wsc.set_update_callback(deltas.append)
+    wsc.set_resync_callback(lambda: resyncs.append(True))
+
+    async def run():
+        queue = asyncio.Queue(maxsize=10)
+        wsc.enqueue_message(queue, wsc.RESYNC)
+        wsc.enqueue_message(queue, json.dumps({"type": "alertUpdated", "payload": {"address": "A"}}))
+        wsc.enqueue_message(queue, "not json")
+        consumer = asyncio.create_task(wsc.consume_messages(queue))
+        while not queue.empty():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        consumer.cancel()
+
+    asyncio.run(run())
+    assert deltas == [{"address": "A"}]
+    assert resyncs == [True]
+    stats = wsc.get_ws_stats()
+    assert stats["processed"] == 1
+    assert stats["resyncs"] == 1
+
+def test_queued_messages_are_applied_as_one_batch():
+    batches = []
+    wsc.set_batch_update_callback(batches.append)
+    messages = [
+        json.dumps({"type": "alertUpdated", "payload": {"address": "A", "alert_count": 1}}),
+        json.dumps({"type": "alertsBatch", "payload": [{"address": "B"}, {"address": "A", "alert_count": 2}]}),
+    ]
+    try:
+        wsc.handle_messages(messages)
+    finally:
+        wsc.set_batch_update_callback(None)
+    assert batches == [[{"address": "A", "alert_count": 1}, {"address": "B"}, {"address": "A", "alert_count": 2}]]
+    assert wsc.get_ws_stats()["batches"] == 1
+
+def test_resync_discards_earlier_deltas():
+    deltas, resyncs = [], []
+    wsc.set_update_callback(deltas.append)
+    wsc.set_resync_callback(lambda: resyncs.append(True))
+    wsc.handle_messages([
+        json.dumps({"type": "alertUpdated", "payload": {"address": "A"}}),
+        wsc.RESYNC,
+        json.dumps({"type": "alertUpdated", "payload": {"address": "B"}}),
+    ])
+    assert resyncs == [True]
+    assert deltas == [{"address": "B"}]
+
+def test_async_resync_callback_is_scheduled():
+    resyncs = []
+
+    async def refresh():
+        resyncs.append(True)
+
+    async def run():
+        wsc.set_resync_callback(refresh)
+        wsc.handle_messages([wsc.RESYNC])
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert resyncs == [True]